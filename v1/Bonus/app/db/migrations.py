@@ -0,0 +1,48 @@
+from sqlalchemy import Connection
+
+from app.db.migrate import Migration, ConcurrentIndex
+
+
+def _create_tables(conn: Connection) -> None:
+    import app.db.models  # noqa: F401
+
+    from app.db.base import Base
+
+    Base.metadata.create_all(conn)
+
+
+MIGRATIONS = (
+    Migration(1, "Исходная схема", upgrade=_create_tables),
+    Migration(
+        2,
+        "Ключ идемпотентности и индексы истории бонусов",
+        # create_all не добавляет колонки в уже существующие таблицы
+        statements=("ALTER TABLE privilege_history ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(80)",),
+        indexes=(
+            ConcurrentIndex(
+                "ix_privilege_history_idempotency_key", "privilege_history", "idempotency_key", unique=True
+            ),
+            ConcurrentIndex(
+                "ix_privilege_history_privilege_id_datetime", "privilege_history", "privilege_id, datetime DESC"
+            ),
+            ConcurrentIndex("ix_privilege_history_ticket_uid", "privilege_history", "ticket_uid"),
+        ),
+    ),
+    Migration(
+        3,
+        "Индекс истории бонусов под ключ страницы (datetime, id)",
+        indexes=(
+            ConcurrentIndex(
+                "ix_privilege_history_privilege_id_datetime_id",
+                "privilege_history",
+                "privilege_id, datetime DESC, id DESC",
+            ),
+        ),
+    ),
+    # Отдельным шагом: statements выполняются до indexes, а старый индекс нужен, пока строится новый
+    Migration(
+        4,
+        "Удаление индекса истории без id",
+        statements=("DROP INDEX IF EXISTS ix_privilege_history_privilege_id_datetime",),
+    ),
+)
@@ -1,6 +1,7 @@
 from sqlalchemy import (
     UUID,
     TIMESTAMP,
+    Index,
     Column,
     String,
     Integer,
@@ -20,9 +21,14 @@ class PrivilegeHistoryDB(Base):
     datetime = Column(TIMESTAMP, nullable=False)
     balance_diff = Column(Integer, nullable=False)
     operation_type = Column(String(20), nullable=False)
+    # Ключ операции баланса: повтор запроса с тем же ключом не применяется второй раз
+    idempotency_key = Column(String(80), nullable=True)
 
     privilege = relationship("PrivilegeDB", backref="history")
 
     __table_args__ = (
         CheckConstraint("operation_type IN ('FILL_IN_BALANCE', 'DEBIT_THE_ACCOUNT')", name="check_operation_type"),
+        Index("ix_privilege_history_idempotency_key", "idempotency_key", unique=True),
+        Index("ix_privilege_history_privilege_id_datetime_id", "privilege_id", datetime.desc(), id.desc()),
+        Index("ix_privilege_history_ticket_uid", "ticket_uid"),
     )
@@ -1,10 +1,13 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.services import PrivilegeService
 from app.db.engine import get_db
 from app.infrastructure.repositories import PrivilegeRepository
 
 
-async def get_privilege_service() -> PrivilegeService:  # type: ignore
-    async for session in get_db():
-        persons_repository = PrivilegeRepository(session)
+# Сессия — зависимость запроса: слот допуска к БД и сессия держатся до конца обработки
+async def get_privilege_service(session: AsyncSession = Depends(get_db)) -> PrivilegeService:
+    persons_repository = PrivilegeRepository(session)
 
-        return PrivilegeService(persons_repository)
+    return PrivilegeService(persons_repository)
@@ -3,8 +3,10 @@ import uuid
 from typing import cast
 from datetime import datetime
 
-from sqlalchemy import Column, delete, select
+from sqlalchemy import Column, true, delete, select, tuple_
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
 
 from app.db.models.privilege import PrivilegeDB
 from app.db.models.privilege_history import PrivilegeHistoryDB
@@ -41,6 +43,58 @@ class PrivilegeRepository:
         await self._db.commit()
         await self._db.refresh(user)
 
+    async def change_balance(self, username: str, balance_diff: int) -> tuple[int, str]:
+        """Атомарно прибавляет balance_diff одним INSERT ... ON CONFLICT DO UPDATE; неизвестный пользователь создаётся.
+
+        Возвращает новый баланс и статус.
+        """
+        _, balance, status = await self._upsert_balance(username, balance_diff)
+        await self._db.commit()
+        return balance, status
+
+    async def apply_operation(
+        self,
+        username: str,
+        ticket_uid: uuid.UUID,
+        balance_diff: int,
+        operation_type: str,
+        idempotency_key: str,
+    ) -> tuple[int, str] | None:
+        """Изменение баланса и запись истории одной транзакцией.
+
+        Возвращает новый баланс и статус; None, если операция с idempotency_key уже применена.
+        """
+        privilege_id, balance, status = await self._upsert_balance(username, balance_diff)
+        query = (
+            insert(PrivilegeHistoryDB)
+            .values(
+                privilege_id=privilege_id,
+                ticket_uid=ticket_uid,
+                datetime=datetime.now(),
+                balance_diff=balance_diff,
+                operation_type=operation_type,
+                idempotency_key=idempotency_key,
+            )
+            .on_conflict_do_nothing(index_elements=[PrivilegeHistoryDB.idempotency_key])
+            .returning(PrivilegeHistoryDB.id)
+        )
+        result = await self._db.execute(query)
+        if result.scalar_one_or_none() is None:
+            await self._db.rollback()
+            return None
+        await self._db.commit()
+        return balance, status
+
+    async def _upsert_balance(self, username: str, balance_diff: int) -> tuple[int, int, str]:
+        query = insert(PrivilegeDB).values(username=username, balance=balance_diff)
+        query = query.on_conflict_do_update(
+            index_elements=[PrivilegeDB.username],
+            set_={"balance": PrivilegeDB.balance + query.excluded.balance},
+        ).returning(PrivilegeDB.id, PrivilegeDB.balance, PrivilegeDB.status)
+        result = await self._db.execute(query)
+        privilege_id, balance, status = result.one()
+        return int(privilege_id), int(balance), str(status)
+
     async def create_history_record(
         self, username: str, ticket_uid: uuid.UUID, balance_diff: int, operation_type: str
     ) -> None:
@@ -57,11 +111,41 @@ class PrivilegeRepository:
         self._db.add(history_record)
         await self._db.commit()
 
-    async def get_user_history(self, username: str) -> list[PrivilegeHistoryDB]:
-        user = await self.get_user(username)
-        if user is None:
-            return []
-        query = select(PrivilegeHistoryDB).where(PrivilegeHistoryDB.privilege_id == user.id)
-        result = await self._db.execute(query)
-        history = result.scalars().all()
-        return list(history)
+    async def get_me(
+        self,
+        username: str,
+        limit: int | None = None,
+        before: tuple[datetime, int] | None = None,
+        ticket_uid: uuid.UUID | None = None,
+    ) -> tuple[int, str, list[PrivilegeHistoryDB]] | None:
+        """Баланс, статус и история от новых к старым одним запросом (LEFT JOIN LATERAL).
+
+        before — ключ (datetime, id): только операции строго до него в порядке выдачи, так что
+        операции с одинаковым временем не теряются на границе страниц. ticket_uid — только по одному билету.
+        None — пользователя нет.
+        """
+        history_query = (
+            select(PrivilegeHistoryDB)
+            .where(PrivilegeHistoryDB.privilege_id == PrivilegeDB.id)
+            .order_by(PrivilegeHistoryDB.datetime.desc(), PrivilegeHistoryDB.id.desc())
+        )
+        if before is not None:
+            history_query = history_query.where(
+                tuple_(PrivilegeHistoryDB.datetime, PrivilegeHistoryDB.id) < tuple_(*before)
+            )
+        if ticket_uid is not None:
+            history_query = history_query.where(PrivilegeHistoryDB.ticket_uid == ticket_uid)
+        if limit is not None:
+            history_query = history_query.limit(limit)
+        history = aliased(PrivilegeHistoryDB, history_query.lateral())
+        query = (
+            select(PrivilegeDB.balance, PrivilegeDB.status, history)
+            .outerjoin(history, true())
+            .where(PrivilegeDB.username == username)
+            .order_by(history.datetime.desc(), history.id.desc())
+        )
+        rows = (await self._db.execute(query)).all()
+        if not rows:
+            return None
+        balance, status, _ = rows[0]
+        return int(balance or 0), str(status), [record for _, _, record in rows if record is not None]
@@ -5,7 +5,12 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.logger import persons_logger
-from app.services.exceptions import UserNotFoundError, UsernameAlreadyExistError
+from app.services.exceptions import (
+    UserNotFoundError,
+    InvalidCursorError,
+    DatabaseOverloadedError,
+    UsernameAlreadyExistError,
+)
 
 
 async def person_not_found_error_handler(_: Request, exc: UserNotFoundError) -> JSONResponse:
@@ -16,6 +21,14 @@ async def person_already_exist_error_handler(_: Request, exc: UsernameAlreadyExi
     return JSONResponse(status_code=400, content={"message": exc.message})
 
 
+async def invalid_cursor_error_handler(_: Request, exc: InvalidCursorError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"message": exc.message})
+
+
+async def database_overloaded_error_handler(_: Request, exc: DatabaseOverloadedError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"message": exc.message})
+
+
 async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
     errors = {}
     for err in exc.errors():
@@ -42,5 +55,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
 def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(UserNotFoundError, person_not_found_error_handler)  # type: ignore
     app.add_exception_handler(UsernameAlreadyExistError, person_already_exist_error_handler)  # type: ignore
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_error_handler)  # type: ignore
+    app.add_exception_handler(DatabaseOverloadedError, database_overloaded_error_handler)  # type: ignore
     app.add_exception_handler(RequestValidationError, validation_error_handler)  # type: ignore
     app.add_exception_handler(Exception, general_exception_handler)
@@ -1,8 +1,16 @@
+from uuid import UUID
+
 from fastapi import Header, Depends, APIRouter
 
 from app.dependencies import get_privilege_service
 from app.services.privilege import PrivilegeService
-from app.presentation.api.schemas import SetBalanceRequest, CreateHistoryRequest
+from app.presentation.api.schemas import (
+    MeResponse,
+    SetBalanceRequest,
+    CreateHistoryRequest,
+    BalanceOperationRequest,
+    BalanceOperationResponse,
+)
 
 router = APIRouter(prefix="/v1/balance")
 
@@ -32,3 +40,25 @@ async def create_history_record(
     privilege_service: PrivilegeService = Depends(get_privilege_service),
 ) -> None:
     await privilege_service.create_history_record(username, str(body.ticketUid), body.balanceDiff, body.operationType)
+
+
+@router.post("/operations")
+async def apply_balance_operation(
+    body: BalanceOperationRequest,
+    username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
+    privilege_service: PrivilegeService = Depends(get_privilege_service),
+) -> BalanceOperationResponse:
+    """Изменение баланса и запись в историю одной транзакцией; повтор с тем же idempotencyKey ничего не меняет."""
+    return await privilege_service.apply_balance_operation(
+        username, str(body.ticketUid), body.balanceDiff, body.operationType, body.idempotencyKey
+    )
+
+
+@router.get("/history/{ticket_uid}")
+async def get_ticket_history(
+    ticket_uid: UUID,
+    username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
+    privilege_service: PrivilegeService = Depends(get_privilege_service),
+) -> MeResponse:
+    """Текущий баланс и операции пользователя только по указанному билету (от новых к старым)."""
+    return await privilege_service.get_ticket_history(username, str(ticket_uid))
@@ -1,4 +1,6 @@
-from fastapi import Header, Depends, APIRouter
+from datetime import datetime
+
+from fastapi import Query, Header, Depends, APIRouter
 
 from app.dependencies import get_privilege_service
 from app.services.privilege import PrivilegeService
@@ -10,6 +12,10 @@ router = APIRouter(prefix="/v1/me")
 @router.get("")
 async def get_me(
     username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Сколько последних операций вернуть"),
+    before: datetime | None = Query(None, description="Только операции раньше этого момента"),
+    cursor: str | None = Query(None, description="Токен nextCursor предыдущей страницы; before тогда не учитывается"),
     privilege_service: PrivilegeService = Depends(get_privilege_service),
 ) -> MeResponse:
-    return await privilege_service.get_me(username)
+    """История — от новых операций к старым; без limit возвращается целиком."""
+    return await privilege_service.get_me(username, limit, before, cursor)
@@ -23,6 +23,20 @@ class CreateHistoryRequest(BaseModel):
     operationType: constr(min_length=1, max_length=20)  # type: ignore
 
 
+class BalanceOperationRequest(BaseModel):
+    ticketUid: UUID
+    balanceDiff: int
+    operationType: constr(min_length=1, max_length=20)  # type: ignore
+    idempotencyKey: constr(min_length=1, max_length=80)  # type: ignore
+
+
+class BalanceOperationResponse(BaseModel):
+    balance: int
+    status: str
+    # False — операция с этим ключом уже была применена раньше
+    applied: bool
+
+
 class HistoryItem(BaseModel):
     date: datetime
     ticketUid: UUID
@@ -34,3 +48,47 @@ class MeResponse(BaseModel):
     balance: int
     status: str
     history: list[HistoryItem]
+    # Токен следующей страницы истории; None — страница последняя или limit не задан
+    nextCursor: str | None = None
+
+
+class StatementStats(BaseModel):
+    # SQL с литералами и параметрами, заменёнными на ?
+    statement: str
+    calls: int
+    slow_calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    # Квантили — верхние границы корзин гистограммы
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: dict[str, int]
+    # Последний EXPLAIN (ANALYZE, BUFFERS) медленного вызова, если он включён
+    plan: str | None
+
+
+class DbStatsResponse(BaseModel):
+    slow_query_ms: float
+    explain_enabled: bool
+    statements: list[StatementStats]
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    in_use: int
+    idle: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_mean_ms: float
+    checkout_wait_max_ms: float
+    admission_limit: int
+    admission_active: int
+    admission_waiting: int
+    admission_queue_size: int
+    admission_rejected: int
+    # Кэш подготовленных выражений asyncpg выключен для PgBouncer
+    pgbouncer: bool
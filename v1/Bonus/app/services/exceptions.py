@@ -12,3 +12,19 @@ class UsernameAlreadyExistError(Exception):
         super().__init__(message)
         self.username = username
         self.message = message
+
+
+class InvalidCursorError(Exception):
+    def __init__(self, cursor: str):
+        message = f"Invalid pagination cursor: {cursor}"
+        super().__init__(message)
+        self.cursor = cursor
+        self.message = message
+
+
+class DatabaseOverloadedError(Exception):
+    """Очередь допуска к БД переполнена или ожидание в ней истекло."""
+
+    def __init__(self) -> None:
+        super().__init__("Database is overloaded")
+        self.message = "Database is overloaded"
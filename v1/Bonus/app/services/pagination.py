@@ -0,0 +1,25 @@
+import json
+import base64
+import binascii
+
+from datetime import datetime
+
+from app.services.exceptions import InvalidCursorError
+
+
+def encode_history_cursor(last_datetime: datetime, last_id: int) -> str:
+    """Непрозрачный токен продолжения истории: ключ (datetime, id) последней отданной операции."""
+    payload = {"datetime": last_datetime.isoformat(), "id": last_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_datetime = datetime.fromisoformat(payload["datetime"])
+        last_id = payload["id"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError(cursor)
+    return last_datetime, last_id
@@ -4,8 +4,16 @@ from uuid import UUID
 from typing import cast
 from datetime import datetime
 
+from app.services.enums import PrivilegeStatus
 from app.services.exceptions import UserNotFoundError, UsernameAlreadyExistError
-from app.presentation.api.schemas import MeResponse, HistoryItem, PrivilegeResponse
+from app.services.pagination import decode_history_cursor, encode_history_cursor
+from app.presentation.api.schemas import (
+    MeResponse,
+    HistoryItem,
+    PrivilegeResponse,
+    BalanceOperationResponse,
+)
+from app.db.models.privilege_history import PrivilegeHistoryDB
 from app.infrastructure.repositories import PrivilegeRepository
 
 
@@ -48,15 +56,7 @@ class PrivilegeService:
         await self._privilege_repository.set_balance(username, balance)
 
     async def change_user_balance(self, username: str, balance: int) -> None:
-        user = await self._privilege_repository.get_user(username)
-
-        if user is None:
-            await self._privilege_repository.create_new_user(username)
-            user = await self._privilege_repository.get_user(username)
-            if user is None:
-                raise UserNotFoundError(username=username)
-
-        await self._privilege_repository.set_balance(username, int(user.balance or 0) + balance)
+        await self._privilege_repository.change_balance(username, balance)
 
     async def create_history_record(
         self, username: str, ticket_uid: str, balance_diff: int, operation_type: str
@@ -72,17 +72,70 @@ class PrivilegeService:
         ticket_uuid = uuid_lib.UUID(ticket_uid)
         await self._privilege_repository.create_history_record(username, ticket_uuid, balance_diff, operation_type)
 
-    async def get_me(self, username: str) -> MeResponse:
-        user = await self._privilege_repository.get_user(username)
+    async def apply_balance_operation(
+        self,
+        username: str,
+        ticket_uid: str,
+        balance_diff: int,
+        operation_type: str,
+        idempotency_key: str,
+    ) -> BalanceOperationResponse:
+        result = await self._privilege_repository.apply_operation(
+            username, uuid_lib.UUID(ticket_uid), balance_diff, operation_type, idempotency_key
+        )
+        if result is not None:
+            balance, status = result
+            return BalanceOperationResponse(balance=balance, status=status, applied=True)
 
+        user = await self._privilege_repository.get_user(username)
         if user is None:
+            raise UserNotFoundError(username=username)
+        return BalanceOperationResponse(balance=int(user.balance or 0), status=str(user.status), applied=False)
+
+    async def get_me(
+        self,
+        username: str,
+        limit: int | None = None,
+        before: datetime | None = None,
+        cursor: str | None = None,
+    ) -> MeResponse:
+        """Cursor — nextCursor предыдущей страницы; при нём before не учитывается."""
+        before_key = None
+        if cursor is not None:
+            before_key = decode_history_cursor(cursor)
+        elif before is not None:
+            if before.tzinfo is not None:
+                # privilege_history.datetime хранится без зоны, в локальном времени сервиса
+                before = before.astimezone().replace(tzinfo=None)
+            # id положительны: (before, 0) отсекает ровно операции раньше before
+            before_key = (before, 0)
+        me = await self._privilege_repository.get_me(username, limit, before_key)
+
+        if me is None:
             await self._privilege_repository.create_new_user(username)
-            user = await self._privilege_repository.get_user(username)
-            if user is None:
-                raise UserNotFoundError(username=username)
+            return MeResponse(balance=0, status=PrivilegeStatus.BRONZE.value, history=[])
+
+        balance, status, history_records = me
+        next_cursor = None
+        if limit is not None and len(history_records) == limit:
+            last = history_records[-1]
+            next_cursor = encode_history_cursor(cast(datetime, last.datetime), int(last.id))
+        return MeResponse(
+            balance=balance, status=status, history=self._to_history_items(history_records), nextCursor=next_cursor
+        )
 
-        history_records = await self._privilege_repository.get_user_history(username)
-        history = [
+    async def get_ticket_history(self, username: str, ticket_uid: str) -> MeResponse:
+        """Баланс и операции по одному билету; неизвестному пользователю — пустой ответ без создания записи."""
+        me = await self._privilege_repository.get_me(username, ticket_uid=uuid_lib.UUID(ticket_uid))
+        if me is None:
+            return MeResponse(balance=0, status=PrivilegeStatus.BRONZE.value, history=[])
+
+        balance, status, history_records = me
+        return MeResponse(balance=balance, status=status, history=self._to_history_items(history_records))
+
+    @staticmethod
+    def _to_history_items(history_records: list[PrivilegeHistoryDB]) -> list[HistoryItem]:
+        return [
             HistoryItem(
                 date=cast(datetime, record.datetime),
                 ticketUid=cast(UUID, record.ticket_uid),
@@ -91,9 +144,3 @@ class PrivilegeService:
             )
             for record in history_records
         ]
-
-        return MeResponse(
-            balance=int(user.balance) or 0,
-            status=str(user.status),
-            history=history,
-        )
@@ -0,0 +1,74 @@
+"""Пропускная способность конкурентных изменений баланса одного пользователя.
+
+Сравнивает прежнее чтение-изменение-запись (get_user + set_balance) с атомарным
+upsert change_balance. Нужна PostgreSQL из переменных DB_*; пользователь
+создаётся и удаляется бенчмарком.
+
+Запуск из каталога Bonus: ``python -m benchmarks.balance_updates [workers] [updates]``.
+"""
+
+import sys
+import time
+import asyncio
+
+from collections.abc import Callable, Awaitable
+
+from app.db.engine import init_db, get_engine, lazy_db_session
+from app.infrastructure.repositories import PrivilegeRepository
+
+USERNAME = "benchmark-balance-user"
+
+
+async def _read_modify_write(repository: PrivilegeRepository) -> None:
+    user = await repository.get_user(USERNAME)
+    if user is not None:
+        await repository.set_balance(USERNAME, int(user.balance) + 1)
+
+
+async def _atomic(repository: PrivilegeRepository) -> None:
+    await repository.change_balance(USERNAME, 1)
+
+
+async def _run(
+    label: str,
+    update: Callable[[PrivilegeRepository], Awaitable[None]],
+    workers: int,
+    updates: int,
+) -> None:
+    async with lazy_db_session() as session:
+        repository = PrivilegeRepository(session)
+        await repository.delete_user(USERNAME)
+        await repository.create_new_user(USERNAME)
+
+    async def worker() -> None:
+        async with lazy_db_session() as session:
+            repository = PrivilegeRepository(session)
+            for _ in range(updates):
+                await update(repository)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    async with lazy_db_session() as session:
+        repository = PrivilegeRepository(session)
+        user = await repository.get_user(USERNAME)
+        balance = int(user.balance) if user is not None else 0
+        await repository.delete_user(USERNAME)
+
+    expected = workers * updates
+    print(f"{label:<20} {expected / elapsed:8.0f} updates/s  balance={balance}/{expected} lost={expected - balance}")
+
+
+async def main(workers: int = 32, updates: int = 100) -> None:
+    await init_db()
+    try:
+        await _run("read-modify-write", _read_modify_write, workers, updates)
+        await _run("atomic upsert", _atomic, workers, updates)
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*args))
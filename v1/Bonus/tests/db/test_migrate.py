@@ -0,0 +1,110 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from app.db.migrate import Migration, ConcurrentIndex, migrate
+from app.db.migrations import MIGRATIONS
+
+
+class FakeConnection:
+    def __init__(self, log: list[str], current_version: int, invalid_indexes: set[str]):
+        self._log = log
+        self._current_version = current_version
+        self._invalid_indexes = invalid_indexes
+
+    async def execution_options(self, **_):
+        return self
+
+    async def execute(self, statement, params=None):
+        self._log.append(" ".join(str(statement).split()))
+        result = MagicMock()
+        result.scalar.return_value = self._current_version
+        result.scalar_one_or_none.return_value = False if (params or {}).get("name") in self._invalid_indexes else None
+        return result
+
+    async def run_sync(self, fn):
+        self._log.append(f"run_sync {fn.__name__}")
+
+
+def make_engine(log: list[str], current_version: int = 0, invalid_indexes: set[str] | None = None):
+    conn = FakeConnection(log, current_version, invalid_indexes or set())
+
+    @asynccontextmanager
+    async def connect():
+        yield conn
+
+    engine = MagicMock()
+    engine.connect = connect
+    engine.begin = connect
+    return engine
+
+
+def create_tables(_):
+    pass
+
+
+TEST_MIGRATIONS = (
+    Migration(1, "tables", upgrade=create_tables),
+    Migration(2, "index", indexes=(ConcurrentIndex("ix_t_a", "t", "a"),)),
+)
+
+
+class TestMigrate:
+    def test_fresh_database_applies_all_versions(self):
+        log: list[str] = []
+
+        version = asyncio.run(migrate(make_engine(log), TEST_MIGRATIONS))
+
+        assert version == 2
+        assert log[0].startswith("SELECT pg_advisory_lock")
+        assert log[-1].startswith("SELECT pg_advisory_unlock")
+        assert "run_sync create_tables" in log
+        assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_t_a ON t (a)" in log
+        assert len([sql for sql in log if sql.startswith("INSERT INTO schema_version")]) == 2
+
+    def test_up_to_date_database_runs_nothing(self):
+        log: list[str] = []
+
+        version = asyncio.run(migrate(make_engine(log, current_version=2), TEST_MIGRATIONS))
+
+        assert version == 2
+        assert "run_sync create_tables" not in log
+        assert not [sql for sql in log if "CREATE INDEX" in sql or sql.startswith("INSERT")]
+
+    def test_invalid_index_is_rebuilt(self):
+        log: list[str] = []
+
+        asyncio.run(migrate(make_engine(log, current_version=1, invalid_indexes={"ix_t_a"}), TEST_MIGRATIONS))
+
+        drop = log.index("DROP INDEX CONCURRENTLY IF EXISTS ix_t_a")
+        assert log[drop + 1] == "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_t_a ON t (a)"
+
+    def test_versions_are_unique_and_increasing(self):
+        versions = [migration.version for migration in MIGRATIONS]
+
+        assert versions == sorted(set(versions))
+        assert versions[0] == 1
+
+    def test_hot_path_indexes_are_migrated(self):
+        names = {index.name for migration in MIGRATIONS for index in migration.indexes}
+
+        assert {
+            "ix_privilege_history_idempotency_key",
+            "ix_privilege_history_privilege_id_datetime_id",
+            "ix_privilege_history_ticket_uid",
+        } <= names
+
+    def test_history_index_without_id_is_dropped_after_replacement_is_built(self):
+        built = next(
+            migration.version
+            for migration in MIGRATIONS
+            if any(index.name == "ix_privilege_history_privilege_id_datetime_id" for index in migration.indexes)
+        )
+        dropped = next(
+            migration.version
+            for migration in MIGRATIONS
+            if "DROP INDEX IF EXISTS ix_privilege_history_privilege_id_datetime" in migration.statements
+        )
+
+        assert built < dropped
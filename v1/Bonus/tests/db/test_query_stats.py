@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from sqlalchemy import text, create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.db.query_stats import OVERFLOW_KEY, QueryTimings, normalize_sql
+
+
+class TestNormalizeSql:
+    def test_placeholders_and_literals_are_replaced(self):
+        statement = "SELECT * FROM privilege WHERE username = $1::VARCHAR AND price > 100 AND status = 'PAID'"
+
+        normalized = normalize_sql(statement)
+
+        assert normalized == "SELECT * FROM privilege WHERE username = ?::VARCHAR AND price > ? AND status = ?"
+
+    def test_in_lists_of_any_length_share_a_key(self):
+        short = "SELECT id FROM privilege WHERE id IN ($1::INTEGER, $2::INTEGER)"
+        long = "SELECT id FROM privilege WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER)"
+
+        assert normalize_sql(short) == normalize_sql(long) == "SELECT id FROM privilege WHERE id IN (?, ...)"
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert normalize_sql("SELECT anon_1.id FROM anon_1") == "SELECT anon_1.id FROM anon_1"
+
+
+class TestQueryTimings:
+    def test_histogram_and_percentiles(self):
+        timings = QueryTimings(slow_query_ms=100)
+        for elapsed_ms in (0.5, 3, 3, 3, 150):
+            timings.record("SELECT 1", elapsed_ms)
+
+        stats = timings.stats().statements[0]
+
+        assert stats.statement == "SELECT ?"
+        assert stats.calls == 5
+        assert stats.slow_calls == 1
+        assert stats.max_ms == 150
+        assert stats.p50_ms == 5.0
+        assert stats.p99_ms == 250.0
+        assert stats.buckets["le_1ms"] == 1
+        assert stats.buckets["le_5ms"] == 3
+
+    def test_statements_sorted_by_total_time(self):
+        timings = QueryTimings()
+        timings.record("SELECT * FROM privilege", 5)
+        timings.record("SELECT * FROM privilege_history", 50)
+
+        stats = timings.stats(limit=1)
+
+        assert [s.statement for s in stats.statements] == ["SELECT * FROM privilege_history"]
+
+    def test_distinct_statements_are_capped(self):
+        timings = QueryTimings(max_statements=1)
+        timings.record("SELECT * FROM privilege", 1)
+        timings.record("SELECT * FROM privilege_history", 1)
+
+        assert {s.statement for s in timings.stats().statements} == {"SELECT * FROM privilege", OVERFLOW_KEY}
+
+    def test_hooks_time_real_statements(self):
+        engine = create_engine("sqlite://")
+        timings = QueryTimings(slow_query_ms=10_000)
+        timings.install(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 2"))
+            assert not conn.info["query_started_at"]
+
+        stats = timings.stats().statements
+        assert [s.calls for s in stats if s.statement == "SELECT ?"] == [2]
+
+    def test_slow_query_is_logged_with_plan(self, monkeypatch):
+        logger = MagicMock()
+        monkeypatch.setattr("app.db.query_stats.persons_logger", logger)
+        timings = QueryTimings(slow_query_ms=0, explain=True)
+        conn = MagicMock()
+        conn.info = {"query_started_at": [0.0]}
+        explain_cursor = conn.connection.cursor.return_value
+        explain_cursor.fetchall.return_value = [("Seq Scan on privilege",), ("Buffers: shared hit=1",)]
+
+        timings._after_cursor_execute(conn, None, "SELECT * FROM privilege WHERE id = $1", (1,), None, False)
+
+        explain_cursor.execute.assert_any_call("EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM privilege WHERE id = $1", (1,))
+        assert timings.stats().statements[0].plan == "Seq Scan on privilege\nBuffers: shared hit=1"
+        assert "параметры=(1,)" in logger.warning.call_args_list[0][0][0]
+
+    def test_writes_are_not_explained(self):
+        timings = QueryTimings(slow_query_ms=0, explain=True)
+        conn = MagicMock()
+        conn.info = {"query_started_at": [0.0]}
+
+        timings._after_cursor_execute(conn, None, "UPDATE privilege SET status = $1", ("CANCELED",), None, False)
+
+        conn.connection.cursor.assert_not_called()
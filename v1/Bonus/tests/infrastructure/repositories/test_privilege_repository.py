@@ -4,6 +4,8 @@ import asyncio
 from datetime import datetime
 from unittest.mock import MagicMock
 
+from sqlalchemy.dialects import postgresql
+
 from app.db.models.privilege_history import PrivilegeHistoryDB
 
 
@@ -71,6 +73,52 @@ class TestPrivilegeRepository:
         mock_db_session.commit.assert_awaited_once()
         mock_db_session.refresh.assert_awaited_once_with(sample_user)
 
+    def test_change_balance_is_single_upsert(self, privilege_repository, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.one.return_value = (1, 150, "BRONZE")
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(privilege_repository.change_balance("testuser", 50))
+
+        assert result == (150, "BRONZE")
+        mock_db_session.execute.assert_awaited_once()
+        mock_db_session.commit.assert_awaited_once()
+        sql = str(mock_db_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (username) DO UPDATE SET balance = (privilege.balance + excluded.balance)" in sql
+        assert "RETURNING privilege.id, privilege.balance, privilege.status" in sql
+
+    def test_apply_operation_commits_balance_and_history_together(self, privilege_repository, mock_db_session):
+        upsert_result = MagicMock()
+        upsert_result.one.return_value = (1, 150, "BRONZE")
+        history_result = MagicMock()
+        history_result.scalar_one_or_none.return_value = 10
+        mock_db_session.execute.side_effect = [upsert_result, history_result]
+
+        result = asyncio.run(
+            privilege_repository.apply_operation("testuser", uuid.uuid4(), 50, "FILL_IN_BALANCE", "uid:purchase")
+        )
+
+        assert result == (150, "BRONZE")
+        assert mock_db_session.execute.await_count == 2
+        mock_db_session.commit.assert_awaited_once()
+        sql = str(mock_db_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (idempotency_key) DO NOTHING" in sql
+
+    def test_apply_operation_duplicate_key_rolls_back(self, privilege_repository, mock_db_session):
+        upsert_result = MagicMock()
+        upsert_result.one.return_value = (1, 150, "BRONZE")
+        history_result = MagicMock()
+        history_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.side_effect = [upsert_result, history_result]
+
+        result = asyncio.run(
+            privilege_repository.apply_operation("testuser", uuid.uuid4(), 50, "FILL_IN_BALANCE", "uid:purchase")
+        )
+
+        assert result is None
+        mock_db_session.rollback.assert_awaited_once()
+        mock_db_session.commit.assert_not_awaited()
+
     def test_create_history_record(self, privilege_repository, mock_db_session, sample_user):
         username = "testuser"
         ticket_uid = uuid.uuid4()
@@ -92,25 +140,49 @@ class TestPrivilegeRepository:
         assert added_obj.balance_diff == balance_diff
         assert added_obj.operation_type == operation_type
 
-    def test_get_user_history(self, privilege_repository, mock_db_session, sample_user):
-        username = "testuser"
-        history_record = PrivilegeHistoryDB(
+    def test_get_me_is_single_lateral_query(self, privilege_repository, mock_db_session, sample_user):
+        record = PrivilegeHistoryDB(
             privilege_id=sample_user.id,
             ticket_uid=uuid.uuid4(),
             datetime=datetime.now(),
             balance_diff=150,
             operation_type="FILL_IN_BALANCE",
         )
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(100, "BRONZE", record)]
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(privilege_repository.get_me("testuser", limit=20, before=(datetime(2025, 1, 1), 5)))
+
+        assert result == (100, "BRONZE", [record])
+        mock_db_session.execute.assert_awaited_once()
+        sql = str(mock_db_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "LEFT OUTER JOIN LATERAL" in sql
+        assert "(privilege_history.datetime, privilege_history.id) < " in sql
+        assert "ORDER BY privilege_history.datetime DESC, privilege_history.id DESC" in sql
+        assert "LIMIT" in sql
+
+    def test_get_me_filters_by_ticket_uid(self, privilege_repository, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(0, "BRONZE", None)]
+        mock_db_session.execute.return_value = mock_result
 
-        mock_result_user = MagicMock()
-        mock_result_user.scalar_one_or_none.return_value = sample_user
+        asyncio.run(privilege_repository.get_me("testuser", ticket_uid=uuid.uuid4()))
 
-        mock_result_history = MagicMock()
-        mock_result_history.scalars.return_value.all.return_value = [history_record]
+        sql = str(mock_db_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "privilege_history.ticket_uid = " in sql
+        assert "LIMIT" not in sql
 
-        mock_db_session.execute.side_effect = [mock_result_user, mock_result_history]
+    def test_get_me_without_history(self, privilege_repository, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.all.return_value = [(0, "BRONZE", None)]
+        mock_db_session.execute.return_value = mock_result
 
-        result = asyncio.run(privilege_repository.get_user_history(username))
+        assert asyncio.run(privilege_repository.get_me("testuser")) == (0, "BRONZE", [])
+
+    def test_get_me_user_not_found(self, privilege_repository, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db_session.execute.return_value = mock_result
 
-        assert len(result) == 1
-        assert result[0] == history_record
+        assert asyncio.run(privilege_repository.get_me("nonexistent")) is None
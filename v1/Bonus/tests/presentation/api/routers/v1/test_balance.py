@@ -8,6 +8,7 @@ from fastapi.testclient import TestClient
 from app.dependencies import get_privilege_service
 from app.services.exceptions import UserNotFoundError
 from app.presentation.api.main import app
+from app.presentation.api.schemas import MeResponse, BalanceOperationResponse
 
 
 @pytest.fixture
@@ -163,3 +164,53 @@ class TestBalanceEndpoints:
         )
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_apply_balance_operation_success(self, client, mock_privilege_service):
+        mock_privilege_service.apply_balance_operation.return_value = BalanceOperationResponse(
+            balance=250, status="BRONZE", applied=True
+        )
+
+        response = client.post(
+            "/v1/balance/operations",
+            json={
+                "ticketUid": "049161bb-badd-4fa8-9d90-87c9a82b0668",
+                "balanceDiff": 150,
+                "operationType": "FILL_IN_BALANCE",
+                "idempotencyKey": "049161bb-badd-4fa8-9d90-87c9a82b0668:purchase",
+            },
+            headers={"X-User-Name": "testuser"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"balance": 250, "status": "BRONZE", "applied": True}
+        mock_privilege_service.apply_balance_operation.assert_awaited_once_with(
+            "testuser",
+            "049161bb-badd-4fa8-9d90-87c9a82b0668",
+            150,
+            "FILL_IN_BALANCE",
+            "049161bb-badd-4fa8-9d90-87c9a82b0668:purchase",
+        )
+
+    def test_apply_balance_operation_requires_idempotency_key(self, client, mock_privilege_service):
+        response = client.post(
+            "/v1/balance/operations",
+            json={"ticketUid": "049161bb-badd-4fa8-9d90-87c9a82b0668", "balanceDiff": 150, "operationType": "X"},
+            headers={"X-User-Name": "testuser"},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_ticket_history(self, client, mock_privilege_service):
+        ticket_uid = "049161bb-badd-4fa8-9d90-87c9a82b0668"
+        mock_privilege_service.get_ticket_history.return_value = MeResponse(balance=0, status="BRONZE", history=[])
+
+        response = client.get(f"/v1/balance/history/{ticket_uid}", headers={"X-User-Name": "testuser"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"balance": 0, "status": "BRONZE", "history": [], "nextCursor": None}
+        mock_privilege_service.get_ticket_history.assert_awaited_once_with("testuser", ticket_uid)
+
+    def test_get_ticket_history_invalid_uid(self, client, mock_privilege_service):
+        response = client.get("/v1/balance/history/not-a-uuid", headers={"X-User-Name": "testuser"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -8,6 +8,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from app.dependencies import get_privilege_service
+from app.services.exceptions import InvalidCursorError
 from app.presentation.api.main import app
 from app.presentation.api.schemas import MeResponse, HistoryItem
 
@@ -74,3 +75,25 @@ class TestMeEndpoints:
         response = client.get("/v1/me")
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_me_passes_history_cursor(self, client, mock_privilege_service):
+        mock_privilege_service.get_me.return_value = MeResponse(balance=0, status="BRONZE", history=[])
+
+        response = client.get(
+            "/v1/me", params={"limit": 20, "before": "2025-01-01T12:00:00"}, headers={"X-User-Name": "testuser"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_privilege_service.get_me.assert_awaited_once_with("testuser", 20, datetime(2025, 1, 1, 12), None)
+
+    def test_get_me_rejects_invalid_cursor(self, client, mock_privilege_service):
+        mock_privilege_service.get_me.side_effect = InvalidCursorError("garbage")
+
+        response = client.get("/v1/me", params={"limit": 20, "cursor": "garbage"}, headers={"X-User-Name": "testuser"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_me_rejects_invalid_limit(self, client, mock_privilege_service):
+        response = client.get("/v1/me", params={"limit": 0}, headers={"X-User-Name": "testuser"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
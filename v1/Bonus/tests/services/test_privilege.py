@@ -1,9 +1,13 @@
+import uuid
 import asyncio
 
+from datetime import UTC, datetime
+
 import pytest
 
-from app.services.exceptions import UserNotFoundError, UsernameAlreadyExistError
+from app.services.exceptions import UserNotFoundError, InvalidCursorError, UsernameAlreadyExistError
 from app.presentation.api.schemas import MeResponse, PrivilegeResponse
+from app.db.models.privilege_history import PrivilegeHistoryDB
 
 
 class TestPrivilegeService:
@@ -93,42 +97,46 @@ class TestPrivilegeService:
         mock_privilege_repository.get_user.assert_awaited_once_with(username)
         mock_privilege_repository.set_balance.assert_not_awaited()
 
-    def test_change_user_balance_success(self, privilege_service, mock_privilege_repository, sample_user):
-        username = "testuser"
-        balance_diff = 50
-        initial_balance = sample_user.balance
-        expected_balance = initial_balance + balance_diff
-        mock_privilege_repository.get_user.return_value = sample_user
+    def test_change_user_balance_applies_delta_atomically(self, privilege_service, mock_privilege_repository):
+        mock_privilege_repository.change_balance.return_value = (150, "BRONZE")
 
-        asyncio.run(privilege_service.change_user_balance(username, balance_diff))
+        asyncio.run(privilege_service.change_user_balance("testuser", 50))
 
-        mock_privilege_repository.get_user.assert_awaited_once_with(username)
-        mock_privilege_repository.set_balance.assert_awaited_once_with(username, expected_balance)
+        mock_privilege_repository.change_balance.assert_awaited_once_with("testuser", 50)
+        mock_privilege_repository.get_user.assert_not_awaited()
+        mock_privilege_repository.set_balance.assert_not_awaited()
 
-    def test_change_user_balance_negative(self, privilege_service, mock_privilege_repository, sample_user):
-        username = "testuser"
-        balance_diff = -30
-        initial_balance = sample_user.balance
-        expected_balance = initial_balance + balance_diff
-        mock_privilege_repository.get_user.return_value = sample_user
+    def test_change_user_balance_negative(self, privilege_service, mock_privilege_repository):
+        mock_privilege_repository.change_balance.return_value = (70, "BRONZE")
 
-        asyncio.run(privilege_service.change_user_balance(username, balance_diff))
+        asyncio.run(privilege_service.change_user_balance("testuser", -30))
 
-        mock_privilege_repository.get_user.assert_awaited_once_with(username)
-        mock_privilege_repository.set_balance.assert_awaited_once_with(username, expected_balance)
+        mock_privilege_repository.change_balance.assert_awaited_once_with("testuser", -30)
 
-    def test_change_user_balance_user_not_found(self, privilege_service, mock_privilege_repository, sample_user):
-        username = "nonexistent"
-        balance_diff = 50
-        new_user = type(sample_user)(username=username, status="BRONZE", balance=0)
-        new_user.id = 2
-        mock_privilege_repository.get_user.side_effect = [None, new_user]
-        mock_privilege_repository.create_new_user.return_value = 2
+    def test_apply_balance_operation(self, privilege_service, mock_privilege_repository):
+        ticket_uid = "049161bb-badd-4fa8-9d90-87c9a82b0668"
+        mock_privilege_repository.apply_operation.return_value = (250, "BRONZE")
 
-        asyncio.run(privilege_service.change_user_balance(username, balance_diff))
+        result = asyncio.run(
+            privilege_service.apply_balance_operation("testuser", ticket_uid, 150, "FILL_IN_BALANCE", "key")
+        )
 
-        mock_privilege_repository.create_new_user.assert_awaited_once_with(username)
-        mock_privilege_repository.set_balance.assert_awaited_once_with(username, balance_diff)
+        assert (result.balance, result.status, result.applied) == (250, "BRONZE", True)
+        mock_privilege_repository.apply_operation.assert_awaited_once_with(
+            "testuser", uuid.UUID(ticket_uid), 150, "FILL_IN_BALANCE", "key"
+        )
+
+    def test_apply_balance_operation_duplicate(self, privilege_service, mock_privilege_repository, sample_user):
+        mock_privilege_repository.apply_operation.return_value = None
+        mock_privilege_repository.get_user.return_value = sample_user
+
+        result = asyncio.run(
+            privilege_service.apply_balance_operation(
+                "testuser", "049161bb-badd-4fa8-9d90-87c9a82b0668", 150, "FILL_IN_BALANCE", "key"
+            )
+        )
+
+        assert (result.balance, result.applied) == (100, False)
 
     def test_create_history_record_success(self, privilege_service, mock_privilege_repository, sample_user):
         username = "testuser"
@@ -161,27 +169,94 @@ class TestPrivilegeService:
         from app.presentation.api.schemas import MeResponse
 
         username = "testuser"
-        mock_privilege_repository.get_user.return_value = sample_user
-        mock_privilege_repository.get_user_history.return_value = []
+        record = PrivilegeHistoryDB(
+            ticket_uid=uuid.uuid4(), datetime=datetime(2025, 1, 1), balance_diff=150, operation_type="FILL_IN_BALANCE"
+        )
+        mock_privilege_repository.get_me.return_value = (100, "BRONZE", [record])
 
-        result = asyncio.run(privilege_service.get_me(username))
+        result = asyncio.run(privilege_service.get_me(username, limit=10))
 
-        mock_privilege_repository.get_user.assert_awaited_once_with(username)
-        mock_privilege_repository.get_user_history.assert_awaited_once_with(username)
+        mock_privilege_repository.get_me.assert_awaited_once_with(username, 10, None)
+        mock_privilege_repository.get_user.assert_not_awaited()
         assert isinstance(result, MeResponse)
-        assert result.balance == sample_user.balance
-        assert result.status == sample_user.status
-        assert result.history == []
+        assert (result.balance, result.status) == (100, "BRONZE")
+        assert result.history[0].ticketUid == record.ticket_uid
+
+    def test_get_me_converts_aware_cursor_to_local_time(self, privilege_service, mock_privilege_repository):
+        mock_privilege_repository.get_me.return_value = (0, "BRONZE", [])
+        before = datetime(2025, 1, 1, 12, tzinfo=UTC)
 
-    def test_get_me_user_not_found(self, privilege_service, mock_privilege_repository, sample_user):
+        asyncio.run(privilege_service.get_me("testuser", before=before))
+
+        passed, passed_id = mock_privilege_repository.get_me.await_args.args[2]
+        assert passed.tzinfo is None
+        assert passed == before.astimezone().replace(tzinfo=None)
+        assert passed_id == 0
+
+    def test_get_me_returns_keyset_cursor_of_last_operation(self, privilege_service, mock_privilege_repository):
+        stamp = datetime(2025, 1, 1, 12)
+        records = [
+            PrivilegeHistoryDB(
+                id=record_id, ticket_uid=uuid.uuid4(), datetime=stamp, balance_diff=10, operation_type="FILL_IN_BALANCE"
+            )
+            for record_id in (8, 7)
+        ]
+        mock_privilege_repository.get_me.return_value = (20, "BRONZE", records)
+
+        first = asyncio.run(privilege_service.get_me("testuser", limit=2))
+        asyncio.run(privilege_service.get_me("testuser", limit=2, cursor=first.nextCursor))
+
+        # операции с тем же datetime не теряются на границе страницы: ключ включает id
+        assert mock_privilege_repository.get_me.await_args.args[2] == (stamp, 7)
+
+    def test_get_me_has_no_cursor_on_last_page(self, privilege_service, mock_privilege_repository):
+        record = PrivilegeHistoryDB(
+            id=1,
+            ticket_uid=uuid.uuid4(),
+            datetime=datetime(2025, 1, 1),
+            balance_diff=10,
+            operation_type="FILL_IN_BALANCE",
+        )
+        mock_privilege_repository.get_me.return_value = (10, "BRONZE", [record])
+
+        result = asyncio.run(privilege_service.get_me("testuser", limit=2))
+
+        assert result.nextCursor is None
+
+    def test_get_me_rejects_invalid_cursor(self, privilege_service, mock_privilege_repository):
+        with pytest.raises(InvalidCursorError):
+            asyncio.run(privilege_service.get_me("testuser", limit=2, cursor="not-a-cursor"))
+
+        mock_privilege_repository.get_me.assert_not_awaited()
+
+    def test_get_ticket_history_filters_by_ticket(self, privilege_service, mock_privilege_repository):
+        ticket_uid = uuid.uuid4()
+        record = PrivilegeHistoryDB(
+            ticket_uid=ticket_uid, datetime=datetime(2025, 1, 1), balance_diff=-1500, operation_type="DEBIT_THE_ACCOUNT"
+        )
+        mock_privilege_repository.get_me.return_value = (500, "BRONZE", [record])
+
+        result = asyncio.run(privilege_service.get_ticket_history("testuser", str(ticket_uid)))
+
+        mock_privilege_repository.get_me.assert_awaited_once_with("testuser", ticket_uid=ticket_uid)
+        assert result.balance == 500
+        assert [item.balanceDiff for item in result.history] == [-1500]
+
+    def test_get_ticket_history_unknown_user_is_not_created(self, privilege_service, mock_privilege_repository):
+        mock_privilege_repository.get_me.return_value = None
+
+        result = asyncio.run(privilege_service.get_ticket_history("nobody", str(uuid.uuid4())))
+
+        assert (result.balance, result.history) == (0, [])
+        mock_privilege_repository.create_new_user.assert_not_awaited()
+
+    def test_get_me_user_not_found(self, privilege_service, mock_privilege_repository):
         username = "nonexistent"
-        mock_privilege_repository.get_user.side_effect = [None, sample_user]
+        mock_privilege_repository.get_me.return_value = None
         mock_privilege_repository.create_new_user.return_value = 1
-        mock_privilege_repository.get_user_history.return_value = []
 
         result = asyncio.run(privilege_service.get_me(username))
 
         mock_privilege_repository.create_new_user.assert_awaited_once_with(username)
         assert isinstance(result, MeResponse)
-        assert result.balance == sample_user.balance
-        assert result.status == sample_user.status
+        assert (result.balance, result.status, result.history) == (0, "BRONZE", [])
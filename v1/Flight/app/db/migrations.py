@@ -0,0 +1,21 @@
+from sqlalchemy import Connection
+
+from app.db.migrate import Migration, ConcurrentIndex
+
+
+def _create_tables(conn: Connection) -> None:
+    import app.db.models  # noqa: F401
+
+    from app.db.base import Base
+
+    Base.metadata.create_all(conn)
+
+
+MIGRATIONS = (
+    Migration(1, "Исходная схема", upgrade=_create_tables),
+    Migration(
+        2,
+        "Уникальный индекс номера рейса",
+        indexes=(ConcurrentIndex("ix_flight_flight_number", "flight", "flight_number", unique=True),),
+    ),
+)
@@ -9,7 +9,7 @@ class FlightDB(Base):
     __tablename__ = "flight"
 
     id = Column(Integer, primary_key=True)
-    flight_number = Column(String(20), nullable=False)
+    flight_number = Column(String(20), nullable=False, unique=True, index=True)
     datetime = Column(TIMESTAMP(timezone=True), nullable=False)
     from_airport_id = Column(Integer, ForeignKey("airport.id"))
     to_airport_id = Column(Integer, ForeignKey("airport.id"))
@@ -0,0 +1,196 @@
+import os
+import re
+import time
+import bisect
+
+from typing import Any
+from dataclasses import field, dataclass
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, Connection, ExecutionContext
+
+from app.logger import persons_logger
+from app.presentation.api.schemas import StatementStats, DbStatsResponse
+
+load_dotenv(override=True)
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# EXPLAIN (ANALYZE, BUFFERS) повторно выполняет запрос, поэтому только по явному включению и только для SELECT
+EXPLAIN_SLOW_QUERIES = os.getenv("DB_EXPLAIN_SLOW_QUERIES", "false").lower() == "true"
+EXPLAIN_INTERVAL_SEC = float(os.getenv("DB_EXPLAIN_INTERVAL_SEC", "60"))
+QUERY_STATS_MAX_STATEMENTS = int(os.getenv("DB_QUERY_STATS_MAX_STATEMENTS", "500"))
+SLOW_QUERY_PARAMS_MAX_LEN = 1000
+
+# Верхние границы корзин гистограммы, мс; последняя корзина — всё, что дольше
+LATENCY_BUCKETS_MS = (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0)
+OVERFLOW_KEY = "<other statements>"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = re.compile(r"^\s*SELECT\b(?!.*\bpg_advisory)", re.IGNORECASE | re.DOTALL)
+
+
+def normalize_sql(statement: str) -> str:
+    """Ключ гистограммы: литералы и параметры заменены на ?, списки значений IN/VALUES свёрнуты."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(?, ...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class _Timing:
+    calls: int = 0
+    slow_calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    plan: str | None = None
+    plan_captured_at: float | None = None
+
+    def percentile_ms(self, q: float) -> float:
+        """Оценка по гистограмме: верхняя граница корзины, в которую попал q-квантиль."""
+        threshold = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold and count:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class QueryTimings:
+    """Гистограммы времени запросов по нормализованному SQL и лог медленных запросов."""
+
+    def __init__(
+        self,
+        slow_query_ms: float = SLOW_QUERY_MS,
+        explain: bool = EXPLAIN_SLOW_QUERIES,
+        max_statements: int = QUERY_STATS_MAX_STATEMENTS,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.max_statements = max_statements
+        self._timings: dict[str, _Timing] = {}
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def record(self, statement: str, elapsed_ms: float) -> _Timing:
+        key = normalize_sql(statement)
+        timing = self._timings.get(key)
+        if timing is None:
+            if len(self._timings) >= self.max_statements:
+                key = OVERFLOW_KEY
+            timing = self._timings.setdefault(key, _Timing())
+        timing.calls += 1
+        timing.total_ms += elapsed_ms
+        timing.max_ms = max(timing.max_ms, elapsed_ms)
+        timing.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        if elapsed_ms >= self.slow_query_ms:
+            timing.slow_calls += 1
+        return timing
+
+    def stats(self, limit: int = 50) -> DbStatsResponse:
+        """Самые дорогие по суммарному времени запросы."""
+        timings = sorted(self._timings.items(), key=lambda item: item[1].total_ms, reverse=True)[:limit]
+        return DbStatsResponse(
+            slow_query_ms=self.slow_query_ms,
+            explain_enabled=self.explain,
+            statements=[
+                StatementStats(
+                    statement=statement,
+                    calls=timing.calls,
+                    slow_calls=timing.slow_calls,
+                    total_ms=round(timing.total_ms, 3),
+                    mean_ms=round(timing.total_ms / timing.calls, 3),
+                    max_ms=round(timing.max_ms, 3),
+                    p50_ms=timing.percentile_ms(0.5),
+                    p95_ms=timing.percentile_ms(0.95),
+                    p99_ms=timing.percentile_ms(0.99),
+                    buckets={
+                        f"le_{bound:g}ms": count
+                        for bound, count in zip(LATENCY_BUCKETS_MS, timing.buckets, strict=False)
+                    }
+                    | {"inf": timing.buckets[-1]},
+                    plan=timing.plan,
+                )
+                for statement, timing in timings
+            ],
+        )
+
+    def reset(self) -> None:
+        self._timings.clear()
+
+    @staticmethod
+    def _before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        timing = self.record(statement, elapsed_ms)
+        if elapsed_ms < self.slow_query_ms:
+            return
+        persons_logger.warning(
+            f"Медленный запрос {elapsed_ms:.1f} мс: {statement} "
+            f"параметры={repr(parameters)[:SLOW_QUERY_PARAMS_MAX_LEN]}"
+        )
+        if self.explain and not executemany and self._plan_is_stale(timing) and _EXPLAINABLE.match(statement):
+            timing.plan = self._explain(conn, statement, parameters)
+            timing.plan_captured_at = time.monotonic()
+            if timing.plan is not None:
+                persons_logger.warning(f"План медленного запроса:\n{timing.plan}")
+
+    @staticmethod
+    def _handle_error(exception_context: Any) -> None:
+        started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+        if started:
+            started.pop()
+
+    @staticmethod
+    def _plan_is_stale(timing: _Timing) -> bool:
+        return timing.plan_captured_at is None or time.monotonic() - timing.plan_captured_at >= EXPLAIN_INTERVAL_SEC
+
+    @staticmethod
+    def _explain(conn: Connection, statement: str, parameters: Any) -> str | None:
+        """План в savepoint: ошибка EXPLAIN не должна прерывать транзакцию запроса."""
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute("SAVEPOINT explain_slow_query")
+            explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            explain_cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+            return plan
+        except Exception as e:
+            persons_logger.warning(f"Не удалось получить план запроса: {e}")
+            try:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+            except Exception as rollback_error:
+                persons_logger.warning(f"Не удалось откатить savepoint EXPLAIN: {rollback_error}")
+            return None
+        finally:
+            explain_cursor.close()
+
+
+query_timings = QueryTimings()
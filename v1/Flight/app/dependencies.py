@@ -1,17 +1,19 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.services import FlightService, AirportService
 from app.db.engine import get_db
 from app.infrastructure.repositories import FlightRepository, AirportRepository
 
 
-async def get_airport_service() -> AirportService:  # type: ignore
-    async for session in get_db():
-        airport_repository = AirportRepository(session)
+# Сессия — зависимость запроса: слот допуска к БД и сессия держатся до конца обработки
+async def get_airport_service(session: AsyncSession = Depends(get_db)) -> AirportService:
+    airport_repository = AirportRepository(session)
 
-        return AirportService(airport_repository)
+    return AirportService(airport_repository)
 
 
-async def get_flight_service() -> FlightService:  # type: ignore
-    async for session in get_db():
-        flight_repository = FlightRepository(session)
+async def get_flight_service(session: AsyncSession = Depends(get_db)) -> FlightService:
+    flight_repository = FlightRepository(session)
 
-        return FlightService(flight_repository)
+    return FlightService(flight_repository)
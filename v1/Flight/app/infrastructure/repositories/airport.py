@@ -1,4 +1,4 @@
-from sqlalchemy import delete, select
+from sqlalchemy import ARRAY, Integer, any_, delete, select, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.airport import AirportDB
@@ -22,6 +22,12 @@ class AirportRepository:
 
         return airport
 
+    async def get_by_ids(self, ids: list[int]) -> list[AirportDB]:
+        query = select(AirportDB).where(AirportDB.id == any_(literal(ids, ARRAY(Integer))))
+        result = await self._db.execute(query)
+        airports = result.scalars().all()
+        return list(airports)
+
     async def save_new_airport(self, airport: AirportDB) -> int:
         self._db.add(airport)
         await self._db.flush()
@@ -1,21 +1,40 @@
+from typing import NoReturn
+
 from sqlalchemy import func, delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.flight import FlightDB
+from app.services.exceptions import FlightAlreadyExistsError
 from app.presentation.api.schemas import FlightMeta
 
+UNIQUE_VIOLATION = "23505"
+
 
 class FlightRepository:
     def __init__(self, db: AsyncSession):
         self._db = db
 
-    async def get_all(self, page: int = 1, size: int = 10) -> tuple[list[FlightDB], int]:
-        count_query = select(func.count()).select_from(FlightDB)
-        count_result = await self._db.execute(count_query)
-        total_elements = count_result.scalar() or 0
+    async def get_all(
+        self,
+        page: int = 1,
+        size: int = 10,
+        expand_airports: bool = False,
+        after_id: int | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[FlightDB], int | None]:
+        """after_id — keyset-страница после этого id без OFFSET; иначе страница page по смещению."""
+        total_elements = None
+        if with_total:
+            count_query = select(func.count()).select_from(FlightDB)
+            count_result = await self._db.execute(count_query)
+            total_elements = count_result.scalar() or 0
 
-        offset = (page - 1) * size
-        query = select(FlightDB).offset(offset).limit(size)
+        query = select(FlightDB).order_by(FlightDB.id).limit(size)
+        query = query.where(FlightDB.id > after_id) if after_id is not None else query.offset((page - 1) * size)
+        if expand_airports:
+            query = query.options(joinedload(FlightDB.from_airport), joinedload(FlightDB.to_airport))
         result = await self._db.execute(query)
         flights = result.scalars().all()
         return list(flights), total_elements
@@ -27,11 +46,25 @@ class FlightRepository:
 
         return flight
 
+    async def get_by_flight_number(self, flight_number: str) -> FlightDB | None:
+        query = (
+            select(FlightDB)
+            .options(joinedload(FlightDB.from_airport), joinedload(FlightDB.to_airport))
+            .where(FlightDB.flight_number == flight_number)
+        )
+        result = await self._db.execute(query)
+        flight = result.scalar_one_or_none()
+
+        return flight
+
     async def save_new_flight(self, flight: FlightDB) -> int:
         self._db.add(flight)
-        await self._db.flush()
-        person_id = flight.id
-        await self._db.commit()
+        try:
+            await self._db.flush()
+            person_id = flight.id
+            await self._db.commit()
+        except IntegrityError as e:
+            await self._raise_if_duplicate(e, str(flight.flight_number))
         return int(person_id)
 
     async def delete_flight(self, flight_id: int) -> None:
@@ -43,5 +76,15 @@ class FlightRepository:
         flight_db = await self.get_by_id(flight_id)
         for key, value in flight.model_dump(exclude_unset=True).items():
             setattr(flight_db, key, value)
-        await self._db.commit()
+        try:
+            await self._db.commit()
+        except IntegrityError as e:
+            await self._raise_if_duplicate(e, flight.flight_number)
         await self._db.refresh(flight_db)
+
+    async def _raise_if_duplicate(self, error: IntegrityError, flight_number: str) -> NoReturn:
+        """Нарушение уникальности номера рейса — доменная ошибка; остальные ошибки целостности как есть."""
+        await self._db.rollback()
+        if getattr(error.orig, "sqlstate", None) == UNIQUE_VIOLATION:
+            raise FlightAlreadyExistsError(flight_number) from error
+        raise error
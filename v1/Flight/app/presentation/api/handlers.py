@@ -2,7 +2,15 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
-from app.services.exceptions import FlightNotFoundError, AirportNotFoundError
+from app.services.exceptions import (
+    InvalidCursorError,
+    FlightNotFoundError,
+    AirportNotFoundError,
+    TooManyAirportIdsError,
+    DatabaseOverloadedError,
+    FlightAlreadyExistsError,
+    FlightNumberNotFoundError,
+)
 
 
 async def airport_not_found_error_handler(_: Request, exc: AirportNotFoundError) -> JSONResponse:
@@ -13,6 +21,26 @@ async def flight_not_found_error_handler(_: Request, exc: FlightNotFoundError) -
     return JSONResponse(status_code=404, content={"message": exc.message})
 
 
+async def flight_number_not_found_error_handler(_: Request, exc: FlightNumberNotFoundError) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"message": exc.message})
+
+
+async def flight_already_exists_error_handler(_: Request, exc: FlightAlreadyExistsError) -> JSONResponse:
+    return JSONResponse(status_code=409, content={"message": exc.message})
+
+
+async def too_many_airport_ids_error_handler(_: Request, exc: TooManyAirportIdsError) -> JSONResponse:
+    return JSONResponse(status_code=422, content={"message": exc.message})
+
+
+async def invalid_cursor_error_handler(_: Request, exc: InvalidCursorError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"message": exc.message})
+
+
+async def database_overloaded_error_handler(_: Request, exc: DatabaseOverloadedError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"message": exc.message})
+
+
 async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
     errors = {}
     for err in exc.errors():
@@ -31,4 +59,9 @@ async def validation_error_handler(request: Request, exc: RequestValidationError
 def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(AirportNotFoundError, airport_not_found_error_handler)  # type: ignore
     app.add_exception_handler(FlightNotFoundError, flight_not_found_error_handler)  # type: ignore
+    app.add_exception_handler(FlightNumberNotFoundError, flight_number_not_found_error_handler)  # type: ignore
+    app.add_exception_handler(FlightAlreadyExistsError, flight_already_exists_error_handler)  # type: ignore
+    app.add_exception_handler(TooManyAirportIdsError, too_many_airport_ids_error_handler)  # type: ignore
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_error_handler)  # type: ignore
+    app.add_exception_handler(DatabaseOverloadedError, database_overloaded_error_handler)  # type: ignore
     app.add_exception_handler(RequestValidationError, validation_error_handler)  # type: ignore
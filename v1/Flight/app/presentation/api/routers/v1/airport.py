@@ -1,7 +1,8 @@
-from fastapi import Depends, Response, APIRouter
+from fastapi import Query, Depends, Response, APIRouter
 
 from app.dependencies import get_airport_service
 from app.services.airport import AirportService
+from app.services.exceptions import TooManyAirportIdsError
 from app.presentation.api.schemas import (
     AirportMeta,
     AirportResponse,
@@ -10,12 +11,22 @@ from app.presentation.api.schemas import (
 
 router = APIRouter(prefix="/v1/airports")
 
+# Верхняя граница пакетного запроса: список ids уходит в один SELECT ... WHERE id IN (...)
+AIRPORT_IDS_MAX_COUNT = 100
+
 
 @router.get("")
 async def get_all_airports(
+    ids: str | None = Query(None, pattern=r"^\d+(,\d+)*$", description="Идентификаторы аэропортов через запятую"),
     airport_service: AirportService = Depends(get_airport_service),
 ) -> AllAirportsResponse:
-    airports = await airport_service.get_all()
+    if ids is not None:
+        airport_ids = [int(airport_id) for airport_id in ids.split(",")]
+        if len(airport_ids) > AIRPORT_IDS_MAX_COUNT:
+            raise TooManyAirportIdsError(len(airport_ids), AIRPORT_IDS_MAX_COUNT)
+        airports = await airport_service.get_by_ids(airport_ids)
+    else:
+        airports = await airport_service.get_all()
     return AllAirportsResponse(airports=airports)
 
 
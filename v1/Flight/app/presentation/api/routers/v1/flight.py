@@ -1,4 +1,4 @@
-from fastapi import Depends, Response, APIRouter
+from fastapi import Query, Depends, Response, APIRouter
 
 from app.dependencies import get_flight_service
 from app.services.flight import FlightService
@@ -6,6 +6,7 @@ from app.presentation.api.schemas import (
     FlightMeta,
     FlightResponse,
     AllFlightsResponse,
+    FlightDetailsResponse,
 )
 
 router = APIRouter(prefix="/v1/flights")
@@ -15,10 +16,18 @@ router = APIRouter(prefix="/v1/flights")
 async def get_all_flights(
     page: int = 1,
     size: int = 10,
+    expand: str | None = Query(None, pattern="^airports$", description="airports — вложить аэропорты в ответ"),
+    cursor: str | None = Query(None, description="Токен nextCursor предыдущей страницы; page тогда не учитывается"),
+    count: bool | None = Query(None, description="Считать totalElements; по умолчанию — только без cursor"),
     flight_service: FlightService = Depends(get_flight_service),
 ) -> AllFlightsResponse:
-    flights, total_elements = await flight_service.get_all(page, size)
-    return AllFlightsResponse(page=page, pageSize=size, totalElements=total_elements, items=flights)
+    with_total = count if count is not None else cursor is None
+    flights, total_elements, next_cursor = await flight_service.get_all(
+        page, size, expand_airports=expand == "airports", cursor=cursor, with_total=with_total
+    )
+    return AllFlightsResponse(
+        page=page, pageSize=size, totalElements=total_elements, items=flights, nextCursor=next_cursor
+    )
 
 
 @router.post("", status_code=201)
@@ -32,6 +41,14 @@ async def save_new_flight(
     return None
 
 
+@router.get("/by-number/{flight_number}")
+async def get_flight_by_number(
+    flight_number: str,
+    flight_service: FlightService = Depends(get_flight_service),
+) -> FlightDetailsResponse:
+    return await flight_service.get_by_flight_number(flight_number)
+
+
 @router.get("/{flight_id}")
 async def get_flight_by_id(
     flight_id: int,
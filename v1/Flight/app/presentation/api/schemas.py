@@ -36,6 +36,11 @@ class FlightResponse(FlightMeta):
     datetime: datetime
 
 
+class FlightDetailsResponse(FlightResponse):
+    from_airport: AirportResponse
+    to_airport: AirportResponse
+
+
 class PaginationInfo(BaseModel):
     page: int
     pageSize: int
@@ -45,5 +50,48 @@ class PaginationInfo(BaseModel):
 class AllFlightsResponse(BaseModel):
     page: int
     pageSize: int
-    totalElements: int
-    items: list[FlightResponse]
+    totalElements: int | None
+    items: list[FlightDetailsResponse | FlightResponse]
+    nextCursor: str | None = None
+
+
+class StatementStats(BaseModel):
+    # SQL с литералами и параметрами, заменёнными на ?
+    statement: str
+    calls: int
+    slow_calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    # Квантили — верхние границы корзин гистограммы
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: dict[str, int]
+    # Последний EXPLAIN (ANALYZE, BUFFERS) медленного вызова, если он включён
+    plan: str | None
+
+
+class DbStatsResponse(BaseModel):
+    slow_query_ms: float
+    explain_enabled: bool
+    statements: list[StatementStats]
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    in_use: int
+    idle: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_mean_ms: float
+    checkout_wait_max_ms: float
+    admission_limit: int
+    admission_active: int
+    admission_waiting: int
+    admission_queue_size: int
+    admission_rejected: int
+    # Кэш подготовленных выражений asyncpg выключен для PgBouncer
+    pgbouncer: bool
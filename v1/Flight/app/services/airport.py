@@ -20,6 +20,10 @@ class AirportService:
         airports = [AirportResponse.model_validate(person) for person in airports_db]
         return airports
 
+    async def get_by_ids(self, ids: list[int]) -> list[AirportResponse]:
+        airports_db = await self._airport_repository.get_by_ids(ids)
+        return [AirportResponse.model_validate(airport) for airport in airports_db]
+
     async def save_new_airport(self, airport: AirportMeta) -> int:
         airport_db = AirportDB(**airport.model_dump())
         return await self._airport_repository.save_new_airport(airport_db)
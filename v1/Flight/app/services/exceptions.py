@@ -12,3 +12,44 @@ class FlightNotFoundError(Exception):
         super().__init__(message)
         self.id = id
         self.message = message
+
+
+class FlightNumberNotFoundError(Exception):
+    def __init__(self, flight_number: str):
+        message = f"Flight with flight_number={flight_number} not found"
+        super().__init__(message)
+        self.flight_number = flight_number
+        self.message = message
+
+
+class FlightAlreadyExistsError(Exception):
+    def __init__(self, flight_number: str):
+        message = f"Flight with flight_number={flight_number} already exists"
+        super().__init__(message)
+        self.flight_number = flight_number
+        self.message = message
+
+
+class TooManyAirportIdsError(Exception):
+    def __init__(self, count: int, max_count: int):
+        message = f"Too many airport ids: {count}, at most {max_count} allowed"
+        super().__init__(message)
+        self.count = count
+        self.max_count = max_count
+        self.message = message
+
+
+class InvalidCursorError(Exception):
+    def __init__(self, cursor: str):
+        message = f"Invalid pagination cursor: {cursor}"
+        super().__init__(message)
+        self.cursor = cursor
+        self.message = message
+
+
+class DatabaseOverloadedError(Exception):
+    """Очередь допуска к БД переполнена или ожидание в ней истекло."""
+
+    def __init__(self) -> None:
+        super().__init__("Database is overloaded")
+        self.message = "Database is overloaded"
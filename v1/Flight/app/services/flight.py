@@ -1,8 +1,9 @@
 from datetime import UTC, datetime
 
 from app.db.models.flight import FlightDB
-from app.services.exceptions import FlightNotFoundError
-from app.presentation.api.schemas import FlightMeta, FlightResponse
+from app.services.exceptions import FlightNotFoundError, FlightNumberNotFoundError
+from app.services.pagination import decode_cursor, encode_cursor
+from app.presentation.api.schemas import FlightMeta, FlightResponse, FlightDetailsResponse
 from app.infrastructure.repositories.flight import FlightRepository
 
 
@@ -17,10 +18,29 @@ class FlightService:
         flight = FlightResponse.model_validate(flight_db)
         return flight
 
-    async def get_all(self, page: int = 1, size: int = 10) -> tuple[list[FlightResponse], int]:
-        flights_db, total_elements = await self._flight_repository.get_all(page, size)
-        flights = [FlightResponse.model_validate(flight) for flight in flights_db]
-        return flights, total_elements
+    async def get_by_flight_number(self, flight_number: str) -> FlightDetailsResponse:
+        flight_db = await self._flight_repository.get_by_flight_number(flight_number)
+        if flight_db is None:
+            raise FlightNumberNotFoundError(flight_number)
+        return FlightDetailsResponse.model_validate(flight_db)
+
+    async def get_all(
+        self,
+        page: int = 1,
+        size: int = 10,
+        expand_airports: bool = False,
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[FlightResponse], int | None, str | None]:
+        """Неполная страница — последняя, курсора продолжения у неё нет."""
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        flights_db, total_elements = await self._flight_repository.get_all(
+            page, size, expand_airports, after_id, with_total
+        )
+        response_model = FlightDetailsResponse if expand_airports else FlightResponse
+        flights = [response_model.model_validate(flight) for flight in flights_db]
+        next_cursor = encode_cursor(int(flights_db[-1].id)) if flights_db and len(flights_db) == size else None
+        return flights, total_elements, next_cursor
 
     async def save_new_flight(self, flight: FlightMeta) -> int:
         flight_data = flight.model_dump()
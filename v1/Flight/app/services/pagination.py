@@ -0,0 +1,21 @@
+import json
+import base64
+import binascii
+
+from app.services.exceptions import InvalidCursorError
+
+
+def encode_cursor(last_id: int) -> str:
+    """Непрозрачный токен продолжения: id последней отданной записи."""
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError(cursor)
+    return last_id
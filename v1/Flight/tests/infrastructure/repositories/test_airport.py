@@ -69,6 +69,23 @@ class TestAirportRepository:
         assert result[0] == sample_airport
         assert result[1] == sample_airport_2
 
+    def test_get_by_ids(
+        self,
+        airport_repository,
+        mock_db_session,
+        sample_airport,
+        sample_airport_2,
+    ):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [sample_airport, sample_airport_2]
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(airport_repository.get_by_ids([1, 2]))
+
+        mock_db_session.execute.assert_awaited_once()
+        assert "= ANY" in str(mock_db_session.execute.call_args[0][0])
+        assert result == [sample_airport, sample_airport_2]
+
     def test_delete_airport(self, airport_repository, mock_db_session):
         airport_id = 1
         mock_result = MagicMock()
@@ -2,6 +2,20 @@ import asyncio
 
 from unittest.mock import MagicMock
 
+import pytest
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
+
+from app.services.exceptions import FlightAlreadyExistsError
+from app.infrastructure.repositories.flight import UNIQUE_VIOLATION
+
+
+def integrity_error(sqlstate: str) -> IntegrityError:
+    orig = Exception("integrity violation")
+    orig.sqlstate = sqlstate
+    return IntegrityError("INSERT INTO flight ...", {}, orig)
+
 
 class TestFlightRepository:
     def test_save_new_flight(self, flight_repository, mock_db_session):
@@ -35,6 +49,29 @@ class TestFlightRepository:
         assert isinstance(result, int)
         assert result == 1
 
+    def test_save_duplicate_flight_number(self, flight_repository, mock_db_session):
+        from app.db.models.flight import FlightDB
+
+        mock_db_session.flush.side_effect = integrity_error(UNIQUE_VIOLATION)
+
+        with pytest.raises(FlightAlreadyExistsError) as exc_info:
+            asyncio.run(flight_repository.save_new_flight(FlightDB(flight_number="AFL031", price=1500)))
+
+        assert exc_info.value.flight_number == "AFL031"
+        mock_db_session.rollback.assert_awaited_once()
+        mock_db_session.commit.assert_not_awaited()
+
+    def test_save_flight_other_integrity_error_is_raised(self, flight_repository, mock_db_session):
+        from app.db.models.flight import FlightDB
+
+        # 23503 — нарушение внешнего ключа (несуществующий аэропорт)
+        mock_db_session.flush.side_effect = integrity_error("23503")
+
+        with pytest.raises(IntegrityError):
+            asyncio.run(flight_repository.save_new_flight(FlightDB(flight_number="AFL031", from_airport_id=99)))
+
+        mock_db_session.rollback.assert_awaited_once()
+
     def test_get_by_id_found(self, flight_repository, mock_db_session, sample_flight):
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = sample_flight
@@ -56,6 +93,25 @@ class TestFlightRepository:
         mock_db_session.execute.assert_awaited_once()
         assert result is None
 
+    def test_get_by_flight_number_found(self, flight_repository, mock_db_session, sample_flight):
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = sample_flight
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(flight_repository.get_by_flight_number("AFL031"))
+
+        mock_db_session.execute.assert_awaited_once()
+        assert result == sample_flight
+
+    def test_get_by_flight_number_not_found(self, flight_repository, mock_db_session):
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(flight_repository.get_by_flight_number("UNKNOWN"))
+
+        assert result is None
+
     def test_get_all(self, flight_repository, mock_db_session, sample_flight):
         mock_count_result = MagicMock()
         mock_count_result.scalar.return_value = 1
@@ -75,6 +131,24 @@ class TestFlightRepository:
         assert result[0] == sample_flight
         assert total == 1
 
+    def test_get_all_expand_airports(self, flight_repository, mock_db_session, sample_flight):
+        mock_count_result = MagicMock()
+        mock_count_result.scalar.return_value = 1
+
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [sample_flight]
+
+        mock_db_session.execute.side_effect = [
+            mock_count_result,
+            mock_result,
+        ]
+
+        result, total = asyncio.run(flight_repository.get_all(page=1, size=10, expand_airports=True))
+
+        query = str(mock_db_session.execute.call_args_list[1][0][0])
+        assert "JOIN airport" in query
+        assert result == [sample_flight]
+
     def test_get_all_with_pagination(self, flight_repository, mock_db_session, sample_flight):
         mock_count_result = MagicMock()
         mock_count_result.scalar.return_value = 10
@@ -93,6 +167,22 @@ class TestFlightRepository:
         assert len(result) == 1
         assert total == 10
 
+    def test_get_all_keyset_without_total(self, flight_repository, mock_db_session, sample_flight):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [sample_flight]
+        mock_db_session.execute.return_value = mock_result
+
+        result, total = asyncio.run(flight_repository.get_all(size=5, after_id=40, with_total=False))
+
+        query = mock_db_session.execute.call_args[0][0]
+        sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        assert mock_db_session.execute.await_count == 1
+        assert "flight.id > 40" in sql
+        assert "ORDER BY flight.id" in sql
+        assert "OFFSET" not in sql
+        assert result == [sample_flight]
+        assert total is None
+
     def test_delete_flight(self, flight_repository, mock_db_session):
         flight_id = 1
         mock_result = MagicMock()
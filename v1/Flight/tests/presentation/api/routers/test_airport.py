@@ -0,0 +1,49 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_airport_service
+from app.presentation.api.main import app
+from app.presentation.api.routers.v1.airport import AIRPORT_IDS_MAX_COUNT
+
+
+@pytest.fixture
+def mock_airport_service():
+    service = AsyncMock()
+    service.get_by_ids.return_value = []
+    return service
+
+
+@pytest.fixture
+def client(mock_airport_service):
+    async def override_get_airport_service():
+        return mock_airport_service
+
+    app.dependency_overrides[get_airport_service] = override_get_airport_service
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+def airport_ids(count: int) -> str:
+    return ",".join(str(airport_id) for airport_id in range(1, count + 1))
+
+
+class TestAirportEndpoints:
+    def test_get_by_ids_at_limit(self, client, mock_airport_service):
+        response = client.get("/v1/airports", params={"ids": airport_ids(AIRPORT_IDS_MAX_COUNT)})
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_airport_service.get_by_ids.assert_awaited_once_with(list(range(1, AIRPORT_IDS_MAX_COUNT + 1)))
+
+    def test_get_by_ids_over_limit_returns_422(self, client, mock_airport_service):
+        response = client.get("/v1/airports", params={"ids": airport_ids(AIRPORT_IDS_MAX_COUNT + 1)})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json() == {
+            "message": f"Too many airport ids: {AIRPORT_IDS_MAX_COUNT + 1}, at most {AIRPORT_IDS_MAX_COUNT} allowed"
+        }
+        mock_airport_service.get_by_ids.assert_not_awaited()
@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_flight_service
+from app.services.exceptions import FlightAlreadyExistsError
+from app.presentation.api.main import app
+
+
+@pytest.fixture
+def mock_flight_service():
+    return AsyncMock()
+
+
+@pytest.fixture
+def client(mock_flight_service):
+    async def override_get_flight_service():
+        return mock_flight_service
+
+    app.dependency_overrides[get_flight_service] = override_get_flight_service
+    client = TestClient(app)
+    yield client
+    app.dependency_overrides.clear()
+
+
+class TestFlightEndpoints:
+    def test_save_duplicate_flight_number_returns_409(self, client, mock_flight_service):
+        mock_flight_service.save_new_flight.side_effect = FlightAlreadyExistsError("AFL031")
+
+        response = client.post(
+            "/v1/flights", json={"flight_number": "AFL031", "from_airport_id": 1, "to_airport_id": 2, "price": 1500}
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json() == {"message": "Flight with flight_number=AFL031 already exists"}
@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.db.query_stats import QueryTimings
+from app.presentation.api.main import app
+
+
+class TestManageEndpoints:
+    def test_health(self):
+        response = TestClient(app).get("/manage/health")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_db_stats(self, monkeypatch):
+        timings = QueryTimings(slow_query_ms=100)
+        timings.record("SELECT * FROM flight WHERE id = $1", 120)
+        timings.record("SELECT 1", 1)
+        monkeypatch.setattr("app.presentation.api.routers.manage.query_timings", timings)
+
+        response = TestClient(app).get("/manage/db", params={"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["slow_query_ms"] == 100
+        assert len(data["statements"]) == 1
+        assert data["statements"][0]["statement"] == "SELECT * FROM flight WHERE id = ?"
+        assert data["statements"][0]["slow_calls"] == 1
+
+    def test_db_pool_stats(self, monkeypatch):
+        engine = MagicMock()
+        engine.pool.size.return_value = 20
+        engine.pool.checkedout.return_value = 5
+        engine.pool.checkedin.return_value = 15
+        engine.pool.overflow.return_value = 0
+        monkeypatch.setattr("app.presentation.api.routers.manage.get_engine", lambda: engine)
+
+        response = TestClient(app).get("/manage/db/pool")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["in_use"] == 5
+        assert response.json()["admission_limit"] > 0
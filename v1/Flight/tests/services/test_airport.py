@@ -60,6 +60,20 @@ class TestAirportService:
         assert isinstance(result, list)
         assert len(result) == 0
 
+    def test_get_by_ids_success(
+        self,
+        airport_service,
+        mock_airport_repository,
+        sample_airport,
+        sample_airport_2,
+    ):
+        mock_airport_repository.get_by_ids.return_value = [sample_airport, sample_airport_2]
+
+        result = asyncio.run(airport_service.get_by_ids([1, 2]))
+
+        mock_airport_repository.get_by_ids.assert_awaited_once_with([1, 2])
+        assert [airport.id for airport in result] == [1, 2]
+
     def test_save_new_airport_success(self, airport_service, mock_airport_repository):
         airport_meta = AirportMeta(name="Домодедово", city="Москва", country="Россия")
         expected_id = 3
@@ -2,8 +2,9 @@ import asyncio
 
 import pytest
 
-from app.services.exceptions import FlightNotFoundError
-from app.presentation.api.schemas import FlightMeta, FlightResponse
+from app.services.exceptions import InvalidCursorError, FlightNotFoundError, FlightNumberNotFoundError
+from app.services.pagination import decode_cursor, encode_cursor
+from app.presentation.api.schemas import FlightMeta, FlightResponse, FlightDetailsResponse
 
 
 class TestFlightService:
@@ -31,37 +32,106 @@ class TestFlightService:
         assert exc_info.value.id == flight_id
         mock_flight_repository.get_by_id.assert_awaited_once_with(flight_id)
 
+    def test_get_by_flight_number_success(
+        self,
+        flight_service,
+        mock_flight_repository,
+        sample_flight,
+        sample_airport,
+        sample_airport_2,
+    ):
+        sample_flight.from_airport = sample_airport_2
+        sample_flight.to_airport = sample_airport
+        mock_flight_repository.get_by_flight_number.return_value = sample_flight
+
+        result = asyncio.run(flight_service.get_by_flight_number("AFL031"))
+
+        mock_flight_repository.get_by_flight_number.assert_awaited_once_with("AFL031")
+        assert isinstance(result, FlightDetailsResponse)
+        assert result.flight_number == "AFL031"
+        assert result.from_airport.name == sample_airport_2.name
+        assert result.to_airport.name == sample_airport.name
+
+    def test_get_by_flight_number_not_found(self, flight_service, mock_flight_repository):
+        mock_flight_repository.get_by_flight_number.return_value = None
+
+        with pytest.raises(FlightNumberNotFoundError) as exc_info:
+            asyncio.run(flight_service.get_by_flight_number("UNKNOWN"))
+
+        assert exc_info.value.flight_number == "UNKNOWN"
+
     def test_get_all_success(self, flight_service, mock_flight_repository, sample_flight):
         mock_flight_repository.get_all.return_value = ([sample_flight], 1)
 
-        result, total = asyncio.run(flight_service.get_all(page=1, size=10))
+        result, total, next_cursor = asyncio.run(flight_service.get_all(page=1, size=10))
 
-        mock_flight_repository.get_all.assert_awaited_once_with(1, 10)
+        mock_flight_repository.get_all.assert_awaited_once_with(1, 10, False, None, True)
         assert isinstance(result, list)
         assert len(result) == 1
         assert all(isinstance(flight, FlightResponse) for flight in result)
         assert result[0].id == sample_flight.id
         assert total == 1
 
+    def test_get_all_expand_airports(
+        self,
+        flight_service,
+        mock_flight_repository,
+        sample_flight,
+        sample_airport,
+        sample_airport_2,
+    ):
+        sample_flight.from_airport = sample_airport_2
+        sample_flight.to_airport = sample_airport
+        mock_flight_repository.get_all.return_value = ([sample_flight], 1)
+
+        result, total, _ = asyncio.run(flight_service.get_all(page=1, size=10, expand_airports=True))
+
+        mock_flight_repository.get_all.assert_awaited_once_with(1, 10, True, None, True)
+        assert isinstance(result[0], FlightDetailsResponse)
+        assert result[0].from_airport.name == sample_airport_2.name
+
     def test_get_all_empty(self, flight_service, mock_flight_repository):
         mock_flight_repository.get_all.return_value = ([], 0)
 
-        result, total = asyncio.run(flight_service.get_all(page=1, size=10))
+        result, total, next_cursor = asyncio.run(flight_service.get_all(page=1, size=10))
 
-        mock_flight_repository.get_all.assert_awaited_once_with(1, 10)
+        mock_flight_repository.get_all.assert_awaited_once_with(1, 10, False, None, True)
         assert isinstance(result, list)
         assert len(result) == 0
         assert total == 0
+        assert next_cursor is None
+
+    def test_get_all_full_page_returns_cursor(self, flight_service, mock_flight_repository, sample_flight):
+        mock_flight_repository.get_all.return_value = ([sample_flight], None)
+
+        _, total, next_cursor = asyncio.run(flight_service.get_all(size=1, with_total=False))
+
+        assert total is None
+        assert decode_cursor(next_cursor) == sample_flight.id
+
+    def test_get_all_by_cursor(self, flight_service, mock_flight_repository, sample_flight):
+        mock_flight_repository.get_all.return_value = ([sample_flight], None)
+
+        asyncio.run(flight_service.get_all(size=10, cursor=encode_cursor(41), with_total=False))
+
+        mock_flight_repository.get_all.assert_awaited_once_with(1, 10, False, 41, False)
+
+    def test_get_all_invalid_cursor(self, flight_service, mock_flight_repository):
+        with pytest.raises(InvalidCursorError):
+            asyncio.run(flight_service.get_all(cursor="not-a-cursor"))
+
+        mock_flight_repository.get_all.assert_not_awaited()
 
     def test_get_all_with_pagination(self, flight_service, mock_flight_repository, sample_flight):
         mock_flight_repository.get_all.return_value = ([sample_flight], 10)
 
-        result, total = asyncio.run(flight_service.get_all(page=2, size=5))
+        result, total, next_cursor = asyncio.run(flight_service.get_all(page=2, size=5))
 
-        mock_flight_repository.get_all.assert_awaited_once_with(2, 5)
+        mock_flight_repository.get_all.assert_awaited_once_with(2, 5, False, None, True)
         assert isinstance(result, list)
         assert len(result) == 1
         assert total == 10
+        assert next_cursor is None
 
     def test_save_new_flight_success(self, flight_service, mock_flight_repository):
         flight_meta = FlightMeta(flight_number="AFL032", from_airport_id=1, to_airport_id=2, price=2000)
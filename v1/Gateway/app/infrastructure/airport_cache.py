@@ -0,0 +1,69 @@
+import os
+import time
+import threading
+
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from dotenv import load_dotenv
+
+from app.presentation.api.schemas import AirportResponse
+
+load_dotenv(override=True)
+
+AIRPORT_CACHE_TTL_SEC = float(os.getenv("AIRPORT_CACHE_TTL", "300"))
+AIRPORT_CACHE_MAX_SIZE = int(os.getenv("AIRPORT_CACHE_MAX_SIZE", "1024"))
+
+
+class AirportCache:
+    """LRU-кэш аэропортов с TTL, общий для всех коннекторов процесса."""
+
+    def __init__(
+        self,
+        ttl_sec: float = AIRPORT_CACHE_TTL_SEC,
+        max_size: int = AIRPORT_CACHE_MAX_SIZE,
+    ) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[int, tuple[float, AirportResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, airport_id: int) -> AirportResponse | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(airport_id)
+            if item is None or item[0] <= now:
+                if item is not None:
+                    del self._items[airport_id]
+                self.misses += 1
+                return None
+            self._items.move_to_end(airport_id)
+            self.hits += 1
+            return item[1]
+
+    def put(self, airport: AirportResponse) -> None:
+        self.put_many([airport])
+
+    def put_many(self, airports: Iterable[AirportResponse]) -> None:
+        expires_at = time.monotonic() + self.ttl_sec
+        with self._lock:
+            for airport in airports:
+                self._items[airport.id] = (expires_at, airport)
+                self._items.move_to_end(airport.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+airport_cache = AirportCache()
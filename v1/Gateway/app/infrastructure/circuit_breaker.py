@@ -1,19 +1,42 @@
 import os
 import time
+import bisect
+import threading
 
 from typing import TypeVar
+from datetime import UTC, datetime
+from collections import deque
 from collections.abc import Callable
 
 from dotenv import load_dotenv
 
+from app.presentation.api.schemas import BreakerStats, BreakerTransition
+
 load_dotenv(override=True)
 
 T = TypeVar("T")
 
+# Столько ошибок подряд открывают цепь сразу, каким бы ни было окно
 FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "3"))
+# Минимум вызовов в окне, после которого оцениваются доли ошибок и медленных вызовов
+MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
 RECOVERY_TIMEOUT_SEC = float(
     os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", "5"),
 )
+WINDOW_TYPE = os.getenv("CIRCUIT_BREAKER_WINDOW_TYPE", "count")
+WINDOW_SIZE = int(os.getenv("CIRCUIT_BREAKER_WINDOW_SIZE", "20"))
+FAILURE_RATE_THRESHOLD = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD", "50"))
+SLOW_CALL_RATE_THRESHOLD = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE_THRESHOLD", "100"))
+SLOW_CALL_DURATION_SEC = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_DURATION", "3"))
+HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+TRANSITION_HISTORY_SIZE = int(os.getenv("CIRCUIT_BREAKER_TRANSITION_HISTORY_SIZE", "50"))
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Предохранители downstream-сервисов Gateway; создаются при старте, а не при первом вызове
+DOWNSTREAM_SERVICES = ("ticket", "flight", "bonus")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
 
 
 class CircuitOpenError(Exception):
@@ -22,48 +45,254 @@ class CircuitOpenError(Exception):
         super().__init__(f"Circuit open for service: {service_name}")
 
 
+class CountWindow:
+    """Последние size вызовов; агрегаты обновляются за O(1)."""
+
+    def __init__(self, size: int) -> None:
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=size)
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        if len(self._outcomes) == self._outcomes.maxlen:
+            old_failed, old_slow = self._outcomes[0]
+            self.calls -= 1
+            self.failures -= old_failed
+            self.slow_calls -= old_slow
+        self._outcomes.append((failed, slow))
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+    def totals(self, now: float) -> tuple[int, int, int]:
+        return self.calls, self.failures, self.slow_calls
+
+
+class TimeWindow:
+    """Вызовы за последние size секунд в посекундных корзинах."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._buckets = [[0, 0, 0, 0] for _ in range(size)]  # секунда, вызовы, ошибки, медленные
+        self._head = 0
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    def _advance(self, now: float) -> list[int]:
+        second = int(now)
+        if second - self._head >= self._size:
+            for bucket in self._buckets:
+                bucket[:] = [0, 0, 0, 0]
+            self.calls = self.failures = self.slow_calls = 0
+            self._head = second - self._size
+        for expired in range(self._head + 1, second + 1):
+            bucket = self._buckets[expired % self._size]
+            self.calls -= bucket[1]
+            self.failures -= bucket[2]
+            self.slow_calls -= bucket[3]
+            bucket[:] = [expired, 0, 0, 0]
+        self._head = max(self._head, second)
+        return self._buckets[second % self._size]
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        bucket = self._advance(now)
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+    def totals(self, now: float) -> tuple[int, int, int]:
+        self._advance(now)
+        return self.calls, self.failures, self.slow_calls
+
+
 class CircuitBreaker:
+    """Предохранитель: failure_threshold ошибок подряд или доля ошибок и медленных вызовов в скользящем окне.
+
+    Всё состояние меняется под блокировкой; сам вызов выполняется вне её.
+    В half-open пропускается не больше half_open_max_calls пробных вызовов,
+    по их итогам цепь закрывается или снова открывается.
+    """
+
     _instances: dict[str, "CircuitBreaker"] = {}
+    _instances_lock = threading.Lock()
 
     def __init__(
         self,
         name: str,
         failure_threshold: int = FAILURE_THRESHOLD,
         recovery_timeout_sec: float = RECOVERY_TIMEOUT_SEC,
+        window_type: str = WINDOW_TYPE,
+        window_size: int = WINDOW_SIZE,
+        minimum_calls: int = MIN_CALLS,
+        failure_rate_threshold: float = FAILURE_RATE_THRESHOLD,
+        slow_call_rate_threshold: float = SLOW_CALL_RATE_THRESHOLD,
+        slow_call_duration_sec: float = SLOW_CALL_DURATION_SEC,
+        half_open_max_calls: int = HALF_OPEN_MAX_CALLS,
     ) -> None:
+        if window_type not in ("count", "time"):
+            raise ValueError(f"Unknown circuit breaker window type: {window_type}")
         self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout_sec = recovery_timeout_sec
-        self._failure_count = 0
-        self._last_failure_time: float = 0.0
-        self._state: str = "closed"
+        self.window_type = window_type
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration_sec = slow_call_duration_sec
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._generation = 0
+        self._opened_at = 0.0
+        self._window = self._new_window()
+        self._consecutive_failures = 0
+        self._probes_started = 0
+        self._probe_window = CountWindow(half_open_max_calls)
+        self._transitions: deque[BreakerTransition] = deque(maxlen=TRANSITION_HISTORY_SIZE)
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._total_calls = 0
+        self._rejected_calls = 0
 
     @classmethod
     def get(cls, name: str) -> "CircuitBreaker":
-        if name not in cls._instances:
-            cls._instances[name] = cls(name)
-        return cls._instances[name]
+        with cls._instances_lock:
+            if name not in cls._instances:
+                cls._instances[name] = cls(name)
+            return cls._instances[name]
+
+    @classmethod
+    def register_downstream(cls) -> None:
+        """Заводит предохранители всех downstream-сервисов, чтобы /manage/breakers видел их сразу после рестарта."""
+        for name in DOWNSTREAM_SERVICES:
+            cls.get(name)
+
+    @classmethod
+    def all(cls) -> list["CircuitBreaker"]:
+        with cls._instances_lock:
+            return list(cls._instances.values())
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def is_call_permitted(self) -> bool:
+        """Пропустит ли call() вызов прямо сейчас; состояние не меняет."""
+        with self._lock:
+            if self._state == OPEN:
+                return time.monotonic() - self._opened_at >= self.recovery_timeout_sec
+            if self._state == HALF_OPEN:
+                return self._probes_started < self.half_open_max_calls
+            return True
 
     def call(self, func: Callable[[], T]) -> T:
-        now = time.monotonic()
-        if self._state == "open":
-            if now - self._last_failure_time < self.recovery_timeout_sec:
-                raise CircuitOpenError(self.name)
-            self._state = "half_open"
+        started = time.monotonic()
+        generation = self._acquire(started)
         try:
             result = func()
-            self._on_success()
-            return result
-        except Exception:
-            self._on_failure(now)
+        except BaseException:
+            self._record(generation, True, started, time.monotonic())
             raise
+        self._record(generation, False, started, time.monotonic())
+        return result
+
+    def _new_window(self) -> CountWindow | TimeWindow:
+        if self.window_type == "time":
+            return TimeWindow(self.window_size)
+        return CountWindow(self.window_size)
+
+    def _acquire(self, now: float) -> int:
+        with self._lock:
+            if self._state == OPEN:
+                if now - self._opened_at < self.recovery_timeout_sec:
+                    self._rejected_calls += 1
+                    raise CircuitOpenError(self.name)
+                self._transition(HALF_OPEN, now)
+            if self._state == HALF_OPEN:
+                if self._probes_started >= self.half_open_max_calls:
+                    self._rejected_calls += 1
+                    raise CircuitOpenError(self.name)
+                self._probes_started += 1
+            return self._generation
 
-    def _on_success(self) -> None:
-        self._failure_count = 0
-        self._state = "closed"
+    def _record(self, generation: int, failed: bool, started: float, now: float) -> None:
+        duration_sec = now - started
+        slow = duration_sec >= self.slow_call_duration_sec
+        latency_bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_sec * 1000)
+        with self._lock:
+            self._total_calls += 1
+            self._latency_counts[latency_bucket] += 1
+            # Вызов, начатый до смены состояния, не влияет на новое окно
+            if generation != self._generation:
+                return
+            if self._state == HALF_OPEN:
+                self._probe_window.record(failed, slow, now)
+                if self._probe_window.calls >= self.half_open_max_calls:
+                    self._transition(OPEN if self._exceeds_thresholds(self._probe_window, now) else CLOSED, now)
+                return
+            self._window.record(failed, slow, now)
+            self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+            if self._consecutive_failures >= self.failure_threshold:
+                self._transition(OPEN, now)
+                return
+            # Быстрый успешный вызов не повышает доли, пока окно уже набрало минимум вызовов
+            if not (failed or slow or self._window.calls == self.minimum_calls):
+                return
+            if self._window.calls >= self.minimum_calls and self._exceeds_thresholds(self._window, now):
+                self._transition(OPEN, now)
+
+    def _exceeds_thresholds(self, window: CountWindow | TimeWindow, now: float) -> bool:
+        calls, failures, slow_calls = window.totals(now)
+        if calls == 0:
+            return False
+        return (
+            failures * 100 / calls >= self.failure_rate_threshold
+            or slow_calls * 100 / calls >= self.slow_call_rate_threshold
+        )
+
+    def stats(self) -> BreakerStats:
+        now = time.monotonic()
+        with self._lock:
+            calls, failures, slow_calls = self._window.totals(now)
+            seconds_until_probe = None
+            if self._state == OPEN:
+                seconds_until_probe = max(0.0, self._opened_at + self.recovery_timeout_sec - now)
+            bucket_labels = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+            return BreakerStats(
+                name=self.name,
+                state=self._state,
+                window_type=self.window_type,
+                window_size=self.window_size,
+                window_calls=calls,
+                failure_rate=failures * 100 / calls if calls else 0.0,
+                slow_call_rate=slow_calls * 100 / calls if calls else 0.0,
+                failure_rate_threshold=self.failure_rate_threshold,
+                slow_call_rate_threshold=self.slow_call_rate_threshold,
+                minimum_calls=self.minimum_calls,
+                failure_threshold=self.failure_threshold,
+                consecutive_failures=self._consecutive_failures,
+                seconds_until_probe=seconds_until_probe,
+                total_calls=self._total_calls,
+                rejected_calls=self._rejected_calls,
+                latency_histogram_ms=dict(zip(bucket_labels, self._latency_counts, strict=True)),
+                transitions=list(self._transitions),
+            )
 
-    def _on_failure(self, now: float) -> None:
-        self._last_failure_time = now
-        self._failure_count += 1
-        if self._failure_count >= self.failure_threshold:
-            self._state = "open"
+    def _transition(self, state: str, now: float) -> None:
+        self._transitions.append(BreakerTransition(from_state=self._state, to_state=state, at=datetime.now(UTC)))
+        self._state = state
+        self._generation += 1
+        self._consecutive_failures = 0
+        if state == OPEN:
+            self._opened_at = now
+        elif state == HALF_OPEN:
+            self._probes_started = 0
+            self._probe_window = CountWindow(self.half_open_max_calls)
+        else:
+            self._window = self._new_window()
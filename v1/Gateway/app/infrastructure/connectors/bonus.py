@@ -2,11 +2,11 @@ import os
 
 from urllib.parse import urljoin
 
-import httpx
-
 from dotenv import load_dotenv
 
-from app.presentation.api.schemas import MeResponse
+from app.presentation.api.schemas import MeResponse, BalanceOperationRequest, BalanceOperationResponse
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.fallback_cache import fallback_cache
 from app.infrastructure.circuit_breaker import CircuitBreaker
 
 load_dotenv(override=True)
@@ -14,32 +14,46 @@ bonus_service_url = os.getenv("BONUS_SERVICE_URL", "")
 
 
 class BonusConnector:
-    def get_me(self, username: str) -> MeResponse:
+    def get_me(self, username: str, allow_stale: bool = True) -> MeResponse:
+        """allow_stale=False — для решений по балансу, где старые данные недопустимы."""
         breaker = CircuitBreaker.get("bonus")
-        return breaker.call(lambda: self._get_me_impl(username))
+        if not allow_stale:
+            return breaker.call(lambda: self._get_me_impl(username))
+        return fallback_cache.read(breaker, ("me", username), lambda: self._get_me_impl(username))
 
     def _get_me_impl(self, username: str) -> MeResponse:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.get(
-                urljoin(bonus_service_url, "/api/v1/me"),
-                headers={"X-User-Name": username},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-            return MeResponse.model_validate(response_json)
+        response = get_client("bonus").get(
+            urljoin(bonus_service_url, "/api/v1/me"),
+            headers={"X-User-Name": username},
+        )
+        response.raise_for_status()
+        response_json = response.json()
+        return MeResponse.model_validate(response_json)
+
+    def get_ticket_history(self, username: str, ticket_uid: str) -> MeResponse:
+        """Баланс и операции только по одному билету; для отмены, поэтому без stale-кэша."""
+        return CircuitBreaker.get("bonus").call(lambda: self._get_ticket_history_impl(username, ticket_uid))
+
+    def _get_ticket_history_impl(self, username: str, ticket_uid: str) -> MeResponse:
+        response = get_client("bonus").get(
+            urljoin(bonus_service_url, f"/api/v1/balance/history/{ticket_uid}"),
+            headers={"X-User-Name": username},
+        )
+        response.raise_for_status()
+        return MeResponse.model_validate(response.json())
 
     def get_user_balance(self, username: str) -> int:
-        me_response = self.get_me(username)
+        me_response = self.get_me(username, allow_stale=False)
         return me_response.balance
 
     def change_user_balance(self, username: str, balance_diff: int) -> None:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.put(
-                urljoin(bonus_service_url, "/api/v1/balance"),
-                headers={"X-User-Name": username},
-                json={"balance": balance_diff},
-            )
-            response.raise_for_status()
+        response = get_client("bonus").put(
+            urljoin(bonus_service_url, "/api/v1/balance"),
+            headers={"X-User-Name": username},
+            json={"balance": balance_diff},
+        )
+        fallback_cache.invalidate(("me", username))
+        response.raise_for_status()
 
     def create_history_record(
         self,
@@ -48,14 +62,24 @@ class BonusConnector:
         balance_diff: int,
         operation_type: str,
     ) -> None:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.post(
-                urljoin(bonus_service_url, "/api/v1/balance/history"),
-                headers={"X-User-Name": username},
-                json={
-                    "ticketUid": ticket_uid,
-                    "balanceDiff": balance_diff,
-                    "operationType": operation_type,
-                },
-            )
-            response.raise_for_status()
+        response = get_client("bonus").post(
+            urljoin(bonus_service_url, "/api/v1/balance/history"),
+            headers={"X-User-Name": username},
+            json={
+                "ticketUid": ticket_uid,
+                "balanceDiff": balance_diff,
+                "operationType": operation_type,
+            },
+        )
+        fallback_cache.invalidate(("me", username))
+        response.raise_for_status()
+
+    def apply_balance_operation(self, username: str, operation: BalanceOperationRequest) -> BalanceOperationResponse:
+        response = get_client("bonus").post(
+            urljoin(bonus_service_url, "/api/v1/balance/operations"),
+            headers={"X-User-Name": username},
+            json=operation.model_dump(),
+        )
+        fallback_cache.invalidate(("me", username))
+        response.raise_for_status()
+        return BalanceOperationResponse.model_validate(response.json())
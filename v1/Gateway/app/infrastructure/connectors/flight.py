@@ -2,62 +2,143 @@ import os
 
 from datetime import datetime
 from urllib.parse import urljoin
-
-import httpx
+from collections.abc import Iterable
 
 from dotenv import load_dotenv
 
-from app.presentation.api.schemas import FlightResponse, AirportResponse, AllFlightsResponse
+from app.presentation.api.schemas import FlightDetails, FlightResponse, AirportResponse, AllFlightsResponse
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.airport_cache import airport_cache
+from app.infrastructure.fallback_cache import FALLBACK_CACHE_STALE_AFTER_SEC, fallback_cache
 from app.infrastructure.circuit_breaker import CircuitBreaker
 
 load_dotenv(override=True)
 flight_service_url = os.getenv("FLIGHT_SERVICE_URL", "")
 
+# Столько ids Flight принимает в одном GET /v1/airports?ids=...
+AIRPORT_IDS_MAX_COUNT = 100
+
 
 class FlightConnector:
-    def _get_airport(self, airport_id: int) -> AirportResponse:
-        with httpx.Client(verify=False) as client:
-            response = client.get(urljoin(flight_service_url, f"/v1/airports/{airport_id}"))
+    def get_airport(self, airport_id: int) -> AirportResponse:
+        airport = airport_cache.get(airport_id)
+        if airport is not None:
+            return airport
+        response = get_client("flight").get(urljoin(flight_service_url, f"/v1/airports/{airport_id}"))
+        response.raise_for_status()
+        airport = AirportResponse.model_validate(response.json())
+        airport_cache.put(airport)
+        return airport
+
+    def get_airports(self, airport_ids: Iterable[int]) -> dict[int, AirportResponse]:
+        airports: dict[int, AirportResponse] = {}
+        missing_ids = []
+        for airport_id in dict.fromkeys(airport_ids):
+            airport = airport_cache.get(airport_id)
+            if airport is None:
+                missing_ids.append(airport_id)
+            else:
+                airports[airport_id] = airport
+
+        for start in range(0, len(missing_ids), AIRPORT_IDS_MAX_COUNT):
+            chunk = missing_ids[start : start + AIRPORT_IDS_MAX_COUNT]
+            response = get_client("flight").get(
+                urljoin(flight_service_url, "/v1/airports"),
+                params={"ids": ",".join(str(airport_id) for airport_id in chunk)},
+            )
             response.raise_for_status()
-            response_json = response.json()
-            return AirportResponse.model_validate(response_json)
+            fetched = [AirportResponse.model_validate(item) for item in response.json().get("airports", [])]
+            airport_cache.put_many(fetched)
+            airports.update((airport.id, airport) for airport in fetched)
+
+        for airport_id in missing_ids:
+            if airport_id not in airports:
+                airports[airport_id] = self.get_airport(airport_id)
+        return airports
+
+    def warm_up_airports(self) -> int:
+        response = get_client("flight").get(urljoin(flight_service_url, "/v1/airports"))
+        response.raise_for_status()
+        airports = [AirportResponse.model_validate(item) for item in response.json().get("airports", [])]
+        airport_cache.put_many(airports)
+        return len(airports)
+
+    def get_flight_by_number(self, flight_number: str) -> FlightDetails | None:
+        response = get_client("flight").get(urljoin(flight_service_url, f"/v1/flights/by-number/{flight_number}"))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        flight = FlightDetails.model_validate(response.json())
+        airport_cache.put_many([flight.from_airport, flight.to_airport])
+        return flight
 
     def _format_airport_name(self, airport: AirportResponse) -> str:
         return f"{airport.city} {airport.name}"
 
+    def get_flight(self, flight_number: str) -> FlightResponse | None:
+        breaker = CircuitBreaker.get("flight")
+        flight = breaker.call(lambda: self.get_flight_by_number(flight_number))
+        if flight is None:
+            return None
+        return FlightResponse(
+            flightNumber=flight.flight_number,
+            fromAirport=self._format_airport_name(flight.from_airport),
+            toAirport=self._format_airport_name(flight.to_airport),
+            date=flight.datetime.strftime("%Y-%m-%d %H:%M"),
+            price=flight.price,
+        )
+
     def get_flights(self, page: int, size: int) -> AllFlightsResponse:
         breaker = CircuitBreaker.get("flight")
-        return breaker.call(lambda: self._get_flights_impl(page, size))
+        # Список рейсов общий для всех и меняется редко: короткое окно свежести снимает нагрузку с Flight
+        return fallback_cache.read(
+            breaker,
+            ("flights", page, size),
+            lambda: self._get_flights_impl(page, size),
+            stale_after_sec=FALLBACK_CACHE_STALE_AFTER_SEC,
+        )
 
     def _get_flights_impl(self, page: int, size: int) -> AllFlightsResponse:
-        with httpx.Client(verify=False) as client:
-            response = client.get(
-                urljoin(flight_service_url, "/v1/flights"),
-                params={"page": page, "size": size},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-
-            flights = []
-            for flight_item in response_json.get("items", []):
-                from_airport = self._get_airport(flight_item["from_airport_id"])
-                to_airport = self._get_airport(flight_item["to_airport_id"])
-
-                flight_datetime = datetime.fromisoformat(flight_item["datetime"].replace("Z", "+00:00"))
-
-                flights.append(
-                    FlightResponse(
-                        flightNumber=flight_item["flight_number"],
-                        fromAirport=self._format_airport_name(from_airport),
-                        toAirport=self._format_airport_name(to_airport),
-                        date=flight_datetime.strftime("%Y-%m-%d %H:%M"),
-                        price=flight_item["price"],
-                    )
-                )
+        response = get_client("flight").get(
+            urljoin(flight_service_url, "/v1/flights"),
+            params={"page": page, "size": size, "expand": "airports"},
+        )
+        response.raise_for_status()
+        response_json = response.json()
+
+        flight_items = response_json.get("items", [])
+        # Старый Flight без expand не вкладывает аэропорты — добираем их одним батчем
+        airports = self.get_airports(
+            airport_id
+            for item in flight_items
+            if "from_airport" not in item
+            for airport_id in (item["from_airport_id"], item["to_airport_id"])
+        )
 
-            return AllFlightsResponse(
-                page=response_json.get("page", page),
-                pageSize=response_json.get("pageSize", size),
-                totalElements=response_json.get("totalElements", 0),
-                items=flights,
+        flights = []
+        for flight_item in flight_items:
+            if "from_airport" in flight_item:
+                from_airport = AirportResponse.model_validate(flight_item["from_airport"])
+                to_airport = AirportResponse.model_validate(flight_item["to_airport"])
+            else:
+                from_airport = airports[flight_item["from_airport_id"]]
+                to_airport = airports[flight_item["to_airport_id"]]
+
+            flight_datetime = datetime.fromisoformat(flight_item["datetime"].replace("Z", "+00:00"))
+
+            flights.append(
+                FlightResponse(
+                    flightNumber=flight_item["flight_number"],
+                    fromAirport=self._format_airport_name(from_airport),
+                    toAirport=self._format_airport_name(to_airport),
+                    date=flight_datetime.strftime("%Y-%m-%d %H:%M"),
+                    price=flight_item["price"],
+                )
             )
+
+        return AllFlightsResponse(
+            page=response_json.get("page", page),
+            pageSize=response_json.get("pageSize", size),
+            totalElements=response_json.get("totalElements", 0),
+            items=flights,
+        )
@@ -1,12 +1,11 @@
 import os
 
-from datetime import datetime
+from functools import partial
 from urllib.parse import urljoin
 
-import httpx
-
 from dotenv import load_dotenv
 
+from app.infrastructure.fan_out import FanOut
 from app.presentation.api.schemas import (
     TicketResponse,
     AirportResponse,
@@ -14,142 +13,162 @@ from app.presentation.api.schemas import (
     TicketCreateRequest,
     TicketPurchaseResponse,
 )
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.fallback_cache import fallback_cache
 from app.infrastructure.circuit_breaker import CircuitBreaker
 from app.infrastructure.connectors.bonus import BonusConnector
+from app.infrastructure.connectors.flight import FlightConnector
 
 load_dotenv(override=True)
 ticket_service_url = os.getenv("TICKET_SERVICE_URL", "")
-flight_service_url = os.getenv("FLIGHT_SERVICE_URL", "")
 
 
 class TicketConnector:
     def __init__(self) -> None:
         self._bonus_connector = BonusConnector()
-
-    def _get_airport(self, airport_id: int) -> AirportResponse:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.get(urljoin(flight_service_url, f"/v1/airports/{airport_id}"))
-            response.raise_for_status()
-            response_json = response.json()
-            return AirportResponse.model_validate(response_json)
+        self._flight_connector = FlightConnector()
 
     def _format_airport_name(self, airport: AirportResponse) -> str:
         return f"{airport.city} {airport.name}"
 
     def _get_flight_info(self, flight_number: str) -> tuple[str, str, str]:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.get(
-                urljoin(flight_service_url, "/v1/flights"),
-                params={"page": 1, "size": 1000},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-
-            for flight_item in response_json.get("items", []):
-                if flight_item["flight_number"] == flight_number:
-                    from_airport = self._get_airport(flight_item["from_airport_id"])
-                    to_airport = self._get_airport(flight_item["to_airport_id"])
-                    flight_datetime = datetime.fromisoformat(flight_item["datetime"].replace("Z", "+00:00"))
-                    return (
-                        self._format_airport_name(from_airport),
-                        self._format_airport_name(to_airport),
-                        flight_datetime.strftime("%Y-%m-%d %H:%M"),
-                    )
-        return ("", "", "")
+        flight = self._flight_connector.get_flight_by_number(flight_number)
+        if flight is None:
+            return ("", "", "")
+        return (
+            self._format_airport_name(flight.from_airport),
+            self._format_airport_name(flight.to_airport),
+            flight.datetime.strftime("%Y-%m-%d %H:%M"),
+        )
+
+    def _get_flight_infos(self, flight_numbers: list[str]) -> dict[str, tuple[str, str, str]]:
+        """Параллельно обогащает рейсы; недоступный Flight даёт fallback из пустых строк."""
+        unique_numbers = list(dict.fromkeys(flight_numbers))
+        results = FanOut.get("flight_info").gather([
+            partial(self._get_flight_info, number) for number in unique_numbers
+        ])
+        return {
+            number: ("", "", "") if isinstance(result, Exception) else result
+            for number, result in zip(unique_numbers, results, strict=True)
+        }
 
     def purchase_ticket(self, ticket: TicketCreateRequest, username: str) -> TicketPurchaseResponse:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.post(
-                urljoin(ticket_service_url, "/api/v1/tickets"),
-                headers={"X-User-Name": username},
-                json=ticket.model_dump(),
-            )
-            if response.status_code == 402:
-                from fastapi import HTTPException
-
-                error_data = response.json()
-                raise HTTPException(
-                    status_code=402,
-                    detail=error_data.get("message", "Insufficient balance"),
-                )
-            response.raise_for_status()
-            response_json = response.json()
-
-            from_airport, to_airport, flight_date = self._get_flight_info(ticket.flightNumber)
-
-            me_response = self._bonus_connector.get_me(username)
-
-            return TicketPurchaseResponse(
-                ticketUid=str(response_json["ticketUid"]),
-                flightNumber=response_json["flightNumber"],
-                fromAirport=from_airport,
-                toAirport=to_airport,
-                date=flight_date if flight_date else response_json.get("date", ""),
-                price=response_json["price"],
-                paidByMoney=response_json["paidByMoney"],
-                paidByBonuses=response_json["paidByBonuses"],
-                status=response_json["status"],
-                privilege=PrivilegeShortInfo(balance=me_response.balance, status=me_response.status),
+        response = get_client("ticket").post(
+            urljoin(ticket_service_url, "/api/v1/tickets"),
+            headers={"X-User-Name": username},
+            json=ticket.model_dump(),
+        )
+        fallback_cache.invalidate(("user_tickets", username), ("me", username))
+        if response.status_code == 402:
+            from fastapi import HTTPException
+
+            error_data = response.json()
+            raise HTTPException(
+                status_code=402,
+                detail=error_data.get("message", "Insufficient balance"),
             )
+        response.raise_for_status()
+        response_json = response.json()
+
+        from_airport, to_airport, flight_date = self._get_flight_info(ticket.flightNumber)
+
+        me_response = self._bonus_connector.get_me(username, allow_stale=False)
+
+        return TicketPurchaseResponse(
+            ticketUid=str(response_json["ticketUid"]),
+            flightNumber=response_json["flightNumber"],
+            fromAirport=from_airport,
+            toAirport=to_airport,
+            date=flight_date if flight_date else response_json.get("date", ""),
+            price=response_json["price"],
+            paidByMoney=response_json["paidByMoney"],
+            paidByBonuses=response_json["paidByBonuses"],
+            status=response_json["status"],
+            privilege=PrivilegeShortInfo(balance=me_response.balance, status=me_response.status),
+        )
 
     def get_user_tickets(self, username: str) -> list[TicketResponse]:
         breaker = CircuitBreaker.get("ticket")
-        return breaker.call(lambda: self._get_user_tickets_impl(username))
+        return fallback_cache.read(breaker, ("user_tickets", username), lambda: self._get_user_tickets_impl(username))
 
     def _get_user_tickets_impl(self, username: str) -> list[TicketResponse]:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.get(
-                urljoin(ticket_service_url, f"/api/v1/tickets/user/{username}"),
-                params={"page": 1, "size": 1000},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-
-            tickets = []
-            for ticket_item in response_json.get("items", []):
-                from_airport, to_airport, flight_date = self._get_flight_info(ticket_item["flight_number"])
-
-                tickets.append(
-                    TicketResponse(
-                        ticketUid=str(ticket_item["ticket_uid"]),
-                        flightNumber=ticket_item["flight_number"],
-                        fromAirport=from_airport,
-                        toAirport=to_airport,
-                        date=flight_date,
-                        price=ticket_item["price"],
-                        status=ticket_item["status"],
-                    )
+        response = get_client("ticket").get(
+            urljoin(ticket_service_url, f"/api/v1/tickets/user/{username}"),
+            params={"page": 1, "size": 1000, "count": "false"},
+        )
+        response.raise_for_status()
+        response_json = response.json()
+
+        ticket_items = response_json.get("items", [])
+        flight_infos = self._get_flight_infos([item["flight_number"] for item in ticket_items])
+
+        tickets = []
+        for ticket_item in ticket_items:
+            from_airport, to_airport, flight_date = flight_infos[ticket_item["flight_number"]]
+
+            tickets.append(
+                TicketResponse(
+                    ticketUid=str(ticket_item["ticket_uid"]),
+                    flightNumber=ticket_item["flight_number"],
+                    fromAirport=from_airport,
+                    toAirport=to_airport,
+                    date=flight_date,
+                    price=ticket_item["price"],
+                    status=ticket_item["status"],
                 )
-            return tickets
+            )
+        return tickets
 
     def get_ticket_by_uid(self, ticket_uid: str) -> TicketResponse:
         breaker = CircuitBreaker.get("ticket")
-        return breaker.call(lambda: self._get_ticket_by_uid_impl(ticket_uid))
+        return fallback_cache.read(breaker, ("ticket", ticket_uid), lambda: self._get_ticket_by_uid_impl(ticket_uid))
 
     def _get_ticket_by_uid_impl(self, ticket_uid: str) -> TicketResponse:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.get(
-                urljoin(ticket_service_url, f"/api/v1/tickets/{ticket_uid}"),
-            )
-            response.raise_for_status()
-            response_json = response.json()
-
-            from_airport, to_airport, flight_date = self._get_flight_info(response_json["flight_number"])
-
-            return TicketResponse(
-                ticketUid=str(response_json["ticket_uid"]),
-                flightNumber=response_json["flight_number"],
-                fromAirport=from_airport,
-                toAirport=to_airport,
-                date=flight_date,
-                price=response_json["price"],
-                status=response_json["status"],
-            )
+        response = get_client("ticket").get(
+            urljoin(ticket_service_url, f"/api/v1/tickets/{ticket_uid}"),
+        )
+        response.raise_for_status()
+        response_json = response.json()
+
+        from_airport, to_airport, flight_date = self._get_flight_info(response_json["flight_number"])
+
+        return TicketResponse(
+            ticketUid=str(response_json["ticket_uid"]),
+            flightNumber=response_json["flight_number"],
+            fromAirport=from_airport,
+            toAirport=to_airport,
+            date=flight_date,
+            price=response_json["price"],
+            status=response_json["status"],
+        )
 
     def cancel_ticket(self, ticket_uid: str, username: str) -> None:
-        with httpx.Client(verify=False, timeout=10.0) as client:
-            response = client.delete(
-                urljoin(ticket_service_url, f"/api/v1/tickets/{ticket_uid}"),
-                headers={"X-User-Name": username},
-            )
-            response.raise_for_status()
+        breaker = CircuitBreaker.get("ticket")
+        try:
+            breaker.call(lambda: self._cancel_ticket_impl(ticket_uid, username))
+        finally:
+            fallback_cache.invalidate(("ticket", ticket_uid), ("user_tickets", username), ("me", username))
+
+    def cancel_tickets(self, items: list[tuple[str, str]]) -> dict[str, str]:
+        """Отмена пачки (ticket_uid, username) одним запросом; статус отмены по каждому билету."""
+        breaker = CircuitBreaker.get("ticket")
+        try:
+            return breaker.call(lambda: self._cancel_tickets_impl(items))
+        finally:
+            for ticket_uid, username in items:
+                fallback_cache.invalidate(("ticket", ticket_uid), ("user_tickets", username), ("me", username))
+
+    def _cancel_tickets_impl(self, items: list[tuple[str, str]]) -> dict[str, str]:
+        response = get_client("ticket").post(
+            urljoin(ticket_service_url, "/api/v1/tickets/cancel-batch"),
+            json={"items": [{"ticketUid": ticket_uid, "username": username} for ticket_uid, username in items]},
+        )
+        response.raise_for_status()
+        return {item["ticketUid"]: item["status"] for item in response.json()["items"]}
+
+    def _cancel_ticket_impl(self, ticket_uid: str, username: str) -> None:
+        response = get_client("ticket").delete(
+            urljoin(ticket_service_url, f"/api/v1/tickets/{ticket_uid}"),
+            headers={"X-User-Name": username},
+        )
+        response.raise_for_status()
@@ -0,0 +1,181 @@
+import os
+import time
+import threading
+
+from typing import Any, TypeVar, cast
+from collections import OrderedDict
+from contextvars import ContextVar
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+import httpx
+
+from dotenv import load_dotenv
+
+from app.logger import persons_logger
+from app.infrastructure.fan_out import FanOut
+from app.infrastructure.circuit_breaker import CLOSED, CircuitBreaker, CircuitOpenError
+
+load_dotenv(override=True)
+
+T = TypeVar("T")
+
+FALLBACK_CACHE_MAX_SIZE = int(os.getenv("FALLBACK_CACHE_MAX_SIZE", "10000"))
+FALLBACK_CACHE_MAX_STALENESS_SEC = float(os.getenv("FALLBACK_CACHE_MAX_STALENESS", "3600"))
+# Возраст, до которого ответ отдаётся без обращения к downstream — только там, где read передаёт
+# stale_after_sec (общие данные вроде списка рейсов); данные пользователя всегда читаются вживую
+FALLBACK_CACHE_STALE_AFTER_SEC = float(os.getenv("FALLBACK_CACHE_STALE_AFTER", "5"))
+# Сколько ждать обновления устаревшего ответа, прежде чем отдать его как stale
+FALLBACK_CACHE_REVALIDATE_WAIT_SEC = float(os.getenv("FALLBACK_CACHE_REVALIDATE_WAIT", "1"))
+FALLBACK_CACHE_REVALIDATE_WORKERS = int(os.getenv("FALLBACK_CACHE_REVALIDATE_WORKERS", "32"))
+# Обновления сверх лимита не ставятся в очередь: читатель получает stale-ответ
+FALLBACK_CACHE_MAX_REVALIDATIONS = int(os.getenv("FALLBACK_CACHE_MAX_REVALIDATIONS", "64"))
+
+STALE_HEADER = "X-Cache"
+
+_stale_reads: ContextVar[list[float] | None] = ContextVar("stale_reads", default=None)
+
+
+def track_stale_reads() -> list[float]:
+    """Начинает учёт stale-ответов текущего запроса; в список попадает возраст каждого."""
+    stale_reads: list[float] = []
+    _stale_reads.set(stale_reads)
+    return stale_reads
+
+
+def _is_downstream_unavailable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (CircuitOpenError, httpx.TransportError, TimeoutError))
+
+
+class FallbackCache:
+    """Последний успешный ответ downstream по ключу (stale-while-revalidate).
+
+    По умолчанию каждое чтение идёт в downstream — не больше одного запроса на ключ
+    одновременно; сохранённый ответ отдаётся, только если downstream недоступен или не ответил
+    за revalidate_wait_sec. Ответ моложе stale_after_sec, переданного в read, отдаётся без запроса.
+    4xx и ответы старше max_staleness_sec не маскируются.
+    """
+
+    def __init__(
+        self,
+        max_size: int = FALLBACK_CACHE_MAX_SIZE,
+        max_staleness_sec: float = FALLBACK_CACHE_MAX_STALENESS_SEC,
+        revalidate_wait_sec: float = FALLBACK_CACHE_REVALIDATE_WAIT_SEC,
+        max_revalidations: int = FALLBACK_CACHE_MAX_REVALIDATIONS,
+    ) -> None:
+        self.max_size = max_size
+        self.max_staleness_sec = max_staleness_sec
+        self.revalidate_wait_sec = revalidate_wait_sec
+        self.stale_hits = 0
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._revalidating: dict[Hashable, Future[Any]] = {}
+        # Поколение ключа растёт при invalidate: ответ запроса, начатого раньше, не сохраняется
+        self._generations: OrderedDict[Hashable, int] = OrderedDict()
+        self._pool = FanOut("revalidate", FALLBACK_CACHE_REVALIDATE_WORKERS, max_pending=max_revalidations)
+        self._lock = threading.Lock()
+
+    def read(self, breaker: CircuitBreaker, key: Hashable, fetch: Callable[[], T], stale_after_sec: float = 0.0) -> T:
+        cached = self._get(key)
+        if cached is None:
+            return self._fetch(breaker, key, fetch)
+
+        stored_at, value = cached
+        if time.monotonic() - stored_at < stale_after_sec:
+            return cast(T, value)
+        if breaker.state != CLOSED:
+            if breaker.is_call_permitted():
+                self._revalidate(breaker, key, fetch)
+            return self._serve_stale(stored_at, value)
+
+        future = self._revalidate(breaker, key, fetch)
+        if future is None:
+            return self._serve_stale(stored_at, value)
+        try:
+            return FanOut.wait(future, time.monotonic() + self.revalidate_wait_sec)
+        except Exception as e:
+            # По таймауту обновление продолжается и запишет кэш, когда завершится
+            if not _is_downstream_unavailable(e):
+                raise
+            return self._serve_stale(stored_at, value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """После записи через Gateway: следующий read не отдаст старый ответ как свежий."""
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+                # Начатое до записи обновление не подхватывается новыми чтениями и не пишет в кэш
+                self._revalidating.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._generations.move_to_end(key)
+                while len(self._generations) > self.max_size:
+                    self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._revalidating.clear()
+            self._generations.clear()
+            self.stale_hits = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._items), "stale_hits": self.stale_hits}
+
+    def _get(self, key: Hashable) -> tuple[float, Any] | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or time.monotonic() - item[0] > self.max_staleness_sec:
+                return None
+            self._items.move_to_end(key)
+            return item
+
+    def _put(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def _fetch(self, breaker: CircuitBreaker, key: Hashable, fetch: Callable[[], T]) -> T:
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        value = breaker.call(fetch)
+        self._put(key, value, generation)
+        return value
+
+    def _serve_stale(self, stored_at: float, value: T) -> T:
+        with self._lock:
+            self.stale_hits += 1
+        stale_reads = _stale_reads.get()
+        if stale_reads is not None:
+            stale_reads.append(time.monotonic() - stored_at)
+        return value
+
+    def _revalidate(self, breaker: CircuitBreaker, key: Hashable, fetch: Callable[[], T]) -> Future[T] | None:
+        """Обновление ключа, уже идущее или новое; None — очередь обновлений заполнена."""
+        with self._lock:
+            future = self._revalidating.get(key)
+            if future is not None:
+                return future
+            future = self._pool.try_submit(lambda: self._fetch(breaker, key, fetch))
+            if future is None:
+                persons_logger.info(f"Обновление {key} пропущено: очередь обновлений заполнена")
+                return None
+            self._revalidating[key] = future
+
+        def forget(done: Future[T]) -> None:
+            with self._lock:
+                if self._revalidating.get(key) is done:
+                    del self._revalidating[key]
+            if not done.cancelled() and done.exception() is not None:
+                persons_logger.info(f"Фоновое обновление {key} не удалось: {done.exception()}")
+
+        future.add_done_callback(forget)
+        return future
+
+
+fallback_cache = FallbackCache()
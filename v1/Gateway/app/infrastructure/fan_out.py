@@ -0,0 +1,79 @@
+import os
+import time
+import threading
+import contextvars
+
+from typing import TypeVar
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+T = TypeVar("T")
+
+FAN_OUT_MAX_WORKERS = int(os.getenv("FAN_OUT_MAX_WORKERS", "32"))
+FAN_OUT_BRANCH_TIMEOUT_SEC = float(os.getenv("FAN_OUT_BRANCH_TIMEOUT", "10"))
+
+
+class FanOut:
+    """Именованный пул потоков для параллельных вызовов downstream-сервисов.
+
+    Вложенные fan-out (ветка, которая сама распараллеливает вызовы) должны
+    использовать разные пулы, иначе ожидающие родители могут занять все потоки.
+    """
+
+    _instances: dict[str, "FanOut"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name: str, max_workers: int = FAN_OUT_MAX_WORKERS, max_pending: int | None = None) -> None:
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"fan-out-{name}")
+        # Лимит невыполненных задач (в работе и в очереди) для try_submit; у submit очередь не ограничена
+        self._pending = threading.BoundedSemaphore(max_pending) if max_pending is not None else None
+
+    @classmethod
+    def get(cls, name: str) -> "FanOut":
+        with cls._lock:
+            if name not in cls._instances:
+                cls._instances[name] = cls(name)
+            return cls._instances[name]
+
+    def submit(self, func: Callable[[], T]) -> Future[T]:
+        # Ветка видит contextvars запроса, например учёт stale-ответов
+        return self._executor.submit(contextvars.copy_context().run, func)
+
+    def try_submit(self, func: Callable[[], T]) -> Future[T] | None:
+        """Как submit, но None вместо постановки в очередь, если пул уже набрал max_pending задач."""
+        pending = self._pending
+        if pending is None:
+            return self.submit(func)
+        if not pending.acquire(blocking=False):
+            return None
+        future = self.submit(func)
+        future.add_done_callback(lambda _: pending.release())
+        return future
+
+    def gather(
+        self,
+        funcs: Sequence[Callable[[], T]],
+        timeout_sec: float = FAN_OUT_BRANCH_TIMEOUT_SEC,
+    ) -> list[T | Exception]:
+        """Запускает все вызовы сразу; ошибка или таймаут ветки возвращается вместо её результата."""
+        futures = [self.submit(func) for func in funcs]
+        deadline = time.monotonic() + timeout_sec
+        return [self.settle(future, deadline) for future in futures]
+
+    @staticmethod
+    def wait(future: Future[T], deadline: float) -> T:
+        """Результат ветки; TimeoutError, если она не успела к дедлайну."""
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+    @staticmethod
+    def settle(future: Future[T], deadline: float) -> T | Exception:
+        try:
+            return FanOut.wait(future, deadline)
+        except Exception as e:
+            future.cancel()
+            return e
@@ -0,0 +1,52 @@
+import os
+import threading
+
+import httpx
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+HTTP_TIMEOUT_SEC = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SEC = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
+
+SERVICES = ("bonus", "flight", "ticket")
+
+_clients: dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def _build_client() -> httpx.Client:
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SEC,
+    )
+    return httpx.Client(verify=False, timeout=HTTP_TIMEOUT_SEC, limits=limits)
+
+
+def get_client(name: str) -> httpx.Client:
+    """Пул соединений к downstream-сервису; один клиент на сервис на процесс."""
+    client = _clients.get(name)
+    if client is not None and not client.is_closed:
+        return client
+    with _lock:
+        client = _clients.get(name)
+        if client is None or client.is_closed:
+            client = _build_client()
+            _clients[name] = client
+        return client
+
+
+def init_clients() -> None:
+    for name in SERVICES:
+        get_client(name)
+
+
+def close_clients() -> None:
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
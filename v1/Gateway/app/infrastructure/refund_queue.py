@@ -1,68 +1,418 @@
 import os
 import json
 import time
+import uuid
+import random
+import socket
+import asyncio
 
+from typing import Any
 from collections.abc import Callable
 
+import httpx
 import redis
+import redis.asyncio as aioredis
 
 from dotenv import load_dotenv
 
+from app.logger import persons_logger
+from app.presentation.api.schemas import DeadLetter, QueueStats
+from app.infrastructure.refund_spool import refund_spool
+from app.infrastructure.circuit_breaker import CircuitBreaker, CircuitOpenError
+
 load_dotenv(override=True)
 
 QUEUE_KEY = "gateway:ticket_refund_queue"
-POLL_INTERVAL = 5
+# Задание, взятое воркером, лежит в его processing-списке до подтверждения
+PROCESSING_KEY_PREFIX = "gateway:ticket_refund_processing:"
+HEARTBEAT_KEY_PREFIX = "gateway:ticket_refund_worker_alive:"
+WORKERS_KEY = "gateway:ticket_refund_workers"
+# Отложенные повторы: sorted set, score — unix-время следующей попытки
+DELAYED_KEY = "gateway:ticket_refund_delayed"
+# Задания, которые не будут выполнены повторами: новые в голове списка
+DEAD_LETTER_KEY = "gateway:ticket_refund_dead_letter"
+REDIS_RETRY_INTERVAL = 5
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+WORKER_COUNT = int(os.getenv("REFUND_QUEUE_WORKERS", "4"))
+BLOCK_TIMEOUT_SEC = int(os.getenv("REFUND_QUEUE_BLOCK_TIMEOUT", "5"))
+BATCH_SIZE = int(os.getenv("REFUND_QUEUE_BATCH_SIZE", "20"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+HEARTBEAT_TTL_SEC = int(os.getenv("REFUND_QUEUE_HEARTBEAT_TTL", "30"))
+RECOVERY_INTERVAL_SEC = float(os.getenv("REFUND_QUEUE_RECOVERY_INTERVAL", "30"))
+MAX_ATTEMPTS = int(os.getenv("REFUND_QUEUE_MAX_ATTEMPTS", "10"))
+RETRY_BASE_DELAY_SEC = float(os.getenv("REFUND_QUEUE_RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY_SEC = float(os.getenv("REFUND_QUEUE_RETRY_MAX_DELAY", "300"))
+SPOOL_REPLAY_INTERVAL_SEC = float(os.getenv("REFUND_SPOOL_REPLAY_INTERVAL", "5"))
+SPOOL_REPLAY_CHUNK_SIZE = 500
+PROMOTE_BATCH_SIZE = 100
+DEAD_LETTER_REPLAY_LIMIT = 1000
+BREAKER_PAUSE_SEC = 1.0
+# Как в схеме /cancel-batch Ticket service: одно неподходящее задание даёт 422 на всю пачку
+USERNAME_MAX_LENGTH = 80
+
+# Атомарно переносит наступившие повторы в голову очереди и возвращает score ближайшего оставшегося
+_PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, job in ipairs(due) do
+    redis.call('ZREM', KEYS[1], job)
+    redis.call('RPUSH', KEYS[2], job)
+end
+local next_due = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {#due, next_due[2]}
+"""
+
+# Атомарно переносит самые старые записи DLQ в хвост очереди со сброшенным счётчиком попыток
+_REPLAY_DEAD_LETTERS_SCRIPT = """
+local entries = redis.call('LRANGE', KEYS[1], -tonumber(ARGV[1]), -1)
+for _, raw in ipairs(entries) do
+    local payload = cjson.decode(raw).payload
+    local ok, job = pcall(cjson.decode, payload)
+    if ok and type(job) == 'table' then
+        job.attempts = nil
+        job.enqueued_at = tonumber(ARGV[2])
+        payload = cjson.encode(job)
+    end
+    redis.call('RPUSH', KEYS[2], payload)
+end
+redis.call('LTRIM', KEYS[1], 0, -#entries - 1)
+return #entries
+"""
+
+
+_pool: aioredis.ConnectionPool | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Клиент поверх общего пула соединений процесса; блокирующие воркеры держат по соединению."""
+    global _pool
+    if _pool is None:
+        _pool = aioredis.ConnectionPool.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            max_connections=REDIS_MAX_CONNECTIONS,
+        )
+    return aioredis.Redis(connection_pool=_pool)
 
 
-def _get_redis() -> redis.Redis:
-    return redis.from_url(REDIS_URL, decode_responses=True)
+async def close_redis() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.disconnect()
+        _pool = None
 
 
-def enqueue_refund(ticket_uid: str, username: str) -> None:
+def canonical_refund_job(ticket_uid: Any, username: Any) -> tuple[str, str]:
+    """Задание в виде, который примет /cancel-batch; ValueError — не примет никогда.
+
+    ticket_uid приводится к str(UUID): в этом виде Ticket service возвращает статусы.
+    """
     try:
-        r = _get_redis()
-        payload = json.dumps({"ticket_uid": ticket_uid, "username": username})
-        r.lpush(QUEUE_KEY, payload)
-    except redis.RedisError:  # noqa: S110
-        pass
+        canonical_uid = str(uuid.UUID(ticket_uid))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"invalid ticket_uid: {ticket_uid!r}") from e
+    if not isinstance(username, str) or not 1 <= len(username) <= USERNAME_MAX_LENGTH:
+        raise ValueError(f"invalid username: expected 1..{USERNAME_MAX_LENGTH} characters")
+    return canonical_uid, username
 
 
-def process_one(cancel_fn: Callable[[str, str], None]) -> bool:
+async def enqueue_refunds(jobs: list[tuple[str, str]]) -> None:
+    """Кладёт задания одним LPUSH — один round trip на пачку; ValueError — задание некорректно."""
+    if not jobs:
+        return
+    now = time.time()
+    payloads = []
+    for ticket_uid, username in jobs:
+        ticket_uid, username = canonical_refund_job(ticket_uid, username)
+        payloads.append(json.dumps({"ticket_uid": ticket_uid, "username": username, "enqueued_at": now}))
+    try:
+        await get_redis().lpush(QUEUE_KEY, *payloads)
+    except redis.RedisError as e:
+        # Redis недоступен: задания ждут на локальном диске и вернутся в очередь через replay_spool
+        persons_logger.warning(f"Очередь возвратов недоступна, {len(payloads)} заданий записаны в spool: {e}")
+        await asyncio.to_thread(refund_spool.append, payloads)
+
+
+async def enqueue_refund(ticket_uid: str, username: str) -> None:
+    await enqueue_refunds([(ticket_uid, username)])
+
+
+async def replay_spool(r: aioredis.Redis, chunk_size: int = SPOOL_REPLAY_CHUNK_SIZE) -> int:
+    """Переносит задания из локального spool в очередь пачками LPUSH; файл удаляется после успешной отправки."""
+    if not await asyncio.to_thread(refund_spool.has_pending):
+        return 0
+    await asyncio.to_thread(refund_spool.rotate)
+    replayed = 0
+    for path in refund_spool.replay_files():
+        payloads = await asyncio.to_thread(refund_spool.read, path)
+        pipe = r.pipeline(transaction=False)
+        for start in range(0, len(payloads), chunk_size):
+            pipe.lpush(QUEUE_KEY, *payloads[start : start + chunk_size])
+        if payloads:
+            # При сбое на середине файл остаётся и будет отправлен снова: отмена билета идемпотентна
+            await pipe.execute()
+        path.unlink()
+        replayed += len(payloads)
+    return replayed
+
+
+async def run_spool_replayer(interval: float = SPOOL_REPLAY_INTERVAL_SEC) -> None:
+    r = get_redis()
+    while True:
+        try:
+            replayed = await replay_spool(r)
+            if replayed:
+                persons_logger.info(f"Из spool в очередь возвратов перенесено {replayed} заданий")
+        except redis.RedisError as e:
+            persons_logger.info(f"Redis ещё недоступен, spool возвратов ждёт: {e}")
+        except Exception as e:
+            persons_logger.warning(f"Ошибка переноса spool возвратов: {e}")
+        await asyncio.sleep(interval)
+
+
+def retry_delay(attempts: int) -> float:
+    """Экспоненциальная задержка с jitter: случайное значение в [delay/2, delay]."""
+    delay = min(RETRY_MAX_DELAY_SEC, RETRY_BASE_DELAY_SEC * 2 ** (attempts - 1))
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+
+def _is_permanent_failure(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return 400 <= error.response.status_code < 500
+    return False
+
+
+def _dead_letter(pipe: aioredis.client.Pipeline, payload: str, reason: str, attempts: int = 0) -> None:
+    persons_logger.error(f"Возврат перенесён в DLQ после {attempts} попыток: {reason}")
+    job = _parse_job(payload)
+    entry = {
+        "payload": payload,
+        "reason": reason,
+        "attempts": attempts,
+        "enqueued_at": job.get("enqueued_at"),
+        "failed_at": time.time(),
+    }
+    pipe.lpush(DEAD_LETTER_KEY, json.dumps(entry))
+
+
+def _schedule_retry(pipe: aioredis.client.Pipeline, job: dict, error: Exception) -> None:
+    # Открытый предохранитель — не попытка: до Ticket service запрос не дошёл
+    attempts = job.get("attempts", 0) + (0 if isinstance(error, CircuitOpenError) else 1)
+    if attempts >= MAX_ATTEMPTS or _is_permanent_failure(error):
+        _dead_letter(pipe, json.dumps({**job, "attempts": attempts}), str(error), attempts)
+        return
+    pipe.zadd(DELAYED_KEY, {json.dumps({**job, "attempts": attempts}): time.time() + retry_delay(max(attempts, 1))})
+
+
+async def promote_due_retries(r: aioredis.Redis) -> float | None:
+    """Переносит в очередь повторы, время которых наступило; секунды до следующего или None."""
+    now = time.time()
+    # Пустой sorted set: Lua обрезает nil в конце массива, ответ из одного элемента
+    result = await r.eval(_PROMOTE_DUE_SCRIPT, 2, DELAYED_KEY, QUEUE_KEY, now, PROMOTE_BATCH_SIZE)  # type: ignore[misc]
+    if len(result) < 2:
+        return None
+    return max(0.0, float(result[1]) - now)
+
+
+async def take_batch(
+    r: aioredis.Redis,
+    worker_id: str,
+    batch_size: int = BATCH_SIZE,
+    timeout: float = BLOCK_TIMEOUT_SEC,
+) -> list[str]:
+    """До batch_size заданий за один round trip; на пустой очереди ждёт одно до timeout секунд."""
+    processing_key = PROCESSING_KEY_PREFIX + worker_id
+    pipe = r.pipeline(transaction=False)
+    for _ in range(batch_size):
+        pipe.lmove(QUEUE_KEY, processing_key, "RIGHT", "LEFT")
+    jobs = [raw for raw in await pipe.execute() if raw]
+    if jobs:
+        return jobs
+    raw = await r.blmove(QUEUE_KEY, processing_key, timeout, "RIGHT", "LEFT")
+    return [raw] if raw else []
+
+
+def _parse_job(raw: str) -> dict:
     try:
-        r = _get_redis()
-        raw = r.rpop(QUEUE_KEY)
-        if not raw or not isinstance(raw, str):
-            return False
         data = json.loads(raw)
-        ticket_uid = data.get("ticket_uid")
-        username = data.get("username")
-        if not ticket_uid or not username:
-            return True
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+async def process_batch(
+    r: aioredis.Redis,
+    worker_id: str,
+    cancel_fn: Callable[[list[tuple[str, str]]], dict[str, str]],
+    batch_size: int = BATCH_SIZE,
+    timeout: float = BLOCK_TIMEOUT_SEC,
+) -> int:
+    """Отменяет пачку заданий одним вызовом cancel_fn; подтверждения и повторы уходят одним MULTI."""
+    processing_key = PROCESSING_KEY_PREFIX + worker_id
+    jobs = await take_batch(r, worker_id, batch_size, timeout)
+    if not jobs:
+        return 0
+    pipe = r.pipeline()
+    valid_jobs = []
+    for raw in jobs:
+        data = _parse_job(raw)
+        # Проверка по одному: некорректное задание уходит в DLQ само, не роняя пачку в 422
         try:
-            cancel_fn(ticket_uid, username)
-        except Exception:
-            r.lpush(QUEUE_KEY, raw)
-        return True
-    except (redis.RedisError, json.JSONDecodeError):
-        return False
+            data["ticket_uid"], data["username"] = canonical_refund_job(data.get("ticket_uid"), data.get("username"))
+        except ValueError as e:
+            _dead_letter(pipe, raw, f"invalid job: {e}")
+        else:
+            valid_jobs.append(data)
+        pipe.lrem(processing_key, 1, raw)
+
+    if valid_jobs:
+        items = [(job["ticket_uid"], job["username"]) for job in valid_jobs]
+        try:
+            statuses = _canonical_statuses(await asyncio.to_thread(cancel_fn, items))
+        except Exception as e:
+            for job in valid_jobs:
+                _schedule_retry(pipe, job, e)
+        else:
+            for job in valid_jobs:
+                status = statuses.get(job["ticket_uid"], "FAILED")
+                if status == "NOT_FOUND":
+                    _dead_letter(pipe, json.dumps(job), "ticket not found", job.get("attempts", 0))
+                elif status not in ("CANCELED", "ALREADY_CANCELED"):
+                    _schedule_retry(pipe, job, RuntimeError(f"Ticket cancel status: {status}"))
+    await pipe.execute()
+    return len(jobs)
+
+
+def _canonical_statuses(statuses: dict[str, str]) -> dict[str, str]:
+    canonical = {}
+    for ticket_uid, status in statuses.items():
+        try:
+            canonical[str(uuid.UUID(ticket_uid))] = status
+        except ValueError:
+            persons_logger.warning(f"Ticket service вернул статус для некорректного ticket_uid: {ticket_uid!r}")
+    return canonical
+
+
+async def heartbeat(r: aioredis.Redis, worker_id: str) -> None:
+    pipe = r.pipeline()
+    pipe.set(HEARTBEAT_KEY_PREFIX + worker_id, "1", ex=HEARTBEAT_TTL_SEC)
+    pipe.sadd(WORKERS_KEY, worker_id)
+    await pipe.execute()
 
 
-def _default_cancel(ticket_uid: str, username: str) -> None:
+async def recover_orphans(r: aioredis.Redis) -> int:
+    """Возвращает в начало очереди задания воркеров, переставших присылать heartbeat."""
+    recovered = 0
+    for worker_id in await r.smembers(WORKERS_KEY):  # type: ignore[misc]
+        if await r.exists(HEARTBEAT_KEY_PREFIX + worker_id):
+            continue
+        processing_key = PROCESSING_KEY_PREFIX + worker_id
+        while await r.lmove(processing_key, QUEUE_KEY, "RIGHT", "RIGHT") is not None:
+            recovered += 1
+        await r.srem(WORKERS_KEY, worker_id)  # type: ignore[misc]
+    return recovered
+
+
+async def queue_stats(r: aioredis.Redis) -> QueueStats:
+    pipe = r.pipeline(transaction=False)
+    pipe.llen(QUEUE_KEY)
+    pipe.lindex(QUEUE_KEY, -1)
+    pipe.zcard(DELAYED_KEY)
+    pipe.llen(DEAD_LETTER_KEY)
+    pipe.smembers(WORKERS_KEY)
+    depth, oldest, delayed, dead_letters, workers = await pipe.execute()
+
+    pipe = r.pipeline(transaction=False)
+    for worker_id in workers:
+        pipe.llen(PROCESSING_KEY_PREFIX + worker_id)
+    processing = sum(await pipe.execute()) if workers else 0
+
+    # Голова очереди — самое новое задание, хвост (следующее к выдаче) — самое старое
+    enqueued_at = _parse_job(oldest).get("enqueued_at") if oldest else None
+    return QueueStats(
+        depth=depth,
+        processing=processing,
+        delayed=delayed,
+        dead_letters=dead_letters,
+        workers=len(workers),
+        oldest_job_age_sec=max(0.0, time.time() - enqueued_at) if enqueued_at else None,
+        spool_pending=await asyncio.to_thread(refund_spool.has_pending),
+    )
+
+
+async def get_dead_letters(r: aioredis.Redis, offset: int = 0, limit: int = 100) -> tuple[int, list[DeadLetter]]:
+    """Записи DLQ от новых к старым и их общее число."""
+    pipe = r.pipeline(transaction=False)
+    pipe.llen(DEAD_LETTER_KEY)
+    pipe.lrange(DEAD_LETTER_KEY, offset, offset + limit - 1)
+    total, entries = await pipe.execute()
+    items = []
+    for raw in entries:
+        entry = json.loads(raw)
+        items.append(
+            DeadLetter(
+                ticket_uid=_parse_job(entry["payload"]).get("ticket_uid"),
+                payload=entry["payload"],
+                reason=entry["reason"],
+                attempts=entry["attempts"],
+                enqueued_at=entry["enqueued_at"],
+                failed_at=entry["failed_at"],
+            )
+        )
+    return total, items
+
+
+async def replay_dead_letters(r: aioredis.Redis, limit: int = DEAD_LETTER_REPLAY_LIMIT) -> int:
+    """Возвращает в очередь до limit самых старых записей DLQ; число перенесённых."""
+    return await r.eval(_REPLAY_DEAD_LETTERS_SCRIPT, 2, DEAD_LETTER_KEY, QUEUE_KEY, limit, time.time())  # type: ignore[misc]
+
+
+def _default_cancel(items: list[tuple[str, str]]) -> dict[str, str]:
     from app.infrastructure.connectors.ticket import TicketConnector
 
-    TicketConnector().cancel_ticket(ticket_uid, username)
+    return TicketConnector().cancel_tickets(items)
 
 
-def run_worker(
-    cancel_fn: Callable[[str, str], None] | None = None,
-    poll_interval: float = POLL_INTERVAL,
+async def run_worker(
+    worker_id: str,
+    cancel_fn: Callable[[list[tuple[str, str]]], dict[str, str]] | None = None,
 ) -> None:
     fn = cancel_fn or _default_cancel
+    r = get_redis()
+    breaker = CircuitBreaker.get("ticket")
+    last_recovery = 0.0
     while True:
         try:
-            while process_one(fn):
-                pass
-        except Exception:  # noqa: S110
-            pass
-        time.sleep(poll_interval)
+            await heartbeat(r, worker_id)
+            if time.monotonic() - last_recovery >= RECOVERY_INTERVAL_SEC:
+                recovered = await recover_orphans(r)
+                if recovered:
+                    persons_logger.info(f"Возвращено в очередь возвратов {recovered} зависших заданий")
+                last_recovery = time.monotonic()
+            # Пока Ticket service за открытым предохранителем, задания остаются в очереди
+            if not breaker.is_call_permitted():
+                await asyncio.sleep(BREAKER_PAUSE_SEC)
+                continue
+            next_retry_in = await promote_due_retries(r)
+            timeout = BLOCK_TIMEOUT_SEC if next_retry_in is None else min(BLOCK_TIMEOUT_SEC, next_retry_in)
+            await process_batch(r, worker_id, fn, timeout=max(timeout, 0.1))
+        except redis.RedisError:
+            await asyncio.sleep(REDIS_RETRY_INTERVAL)
+        except Exception as e:
+            persons_logger.warning(f"Ошибка воркера очереди возвратов {worker_id}: {e}")
+            await asyncio.sleep(REDIS_RETRY_INTERVAL)
+
+
+def start_workers(
+    count: int = WORKER_COUNT,
+    cancel_fn: Callable[[list[tuple[str, str]]], dict[str, str]] | None = None,
+) -> list[asyncio.Task]:
+    """Запускает воркеры задачами текущего event loop.
+
+    Идентификатор новый при каждом запуске: в контейнере PID и hostname после рестарта те же,
+    и со старым id воркер продлил бы свой heartbeat, а его незавершённые задания не вернулись бы в очередь.
+    """
+    prefix = f"{socket.gethostname()}:{uuid.uuid4().hex[:12]}"
+    return [
+        asyncio.create_task(run_worker(f"{prefix}:{index}", cancel_fn), name=f"refund-worker-{index}")
+        for index in range(count)
+    ]
@@ -0,0 +1,99 @@
+import os
+import time
+import threading
+
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+# Абсолютный путь: журнал не должен зависеть от рабочего каталога процесса.
+# В контейнере каталог — именованный том, иначе журнал пропадёт вместе с контейнером
+REFUND_SPOOL_DIR = os.getenv("REFUND_SPOOL_DIR", "/var/lib/gateway/spool")
+
+ACTIVE_FILE = "refunds.jsonl"
+REPLAY_PREFIX = "refunds.replay."
+
+
+class RefundSpool:
+    """Локальный append-only журнал возвратов на время недоступности Redis.
+
+    Одна строка — одно задание в том же JSON, что и в очереди. Запись
+    возвращается только после fsync, но fsync общий: пока один поток
+    синхронизирует файл, остальные дописывают строки и потом попадают
+    в один следующий fsync (group commit).
+    """
+
+    def __init__(self, directory: str = REFUND_SPOOL_DIR) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._file = None
+        self._written_seq = 0
+        self._synced_seq = 0
+
+    def append(self, payloads: list[str]) -> None:
+        if not payloads:
+            return
+        with self._lock:
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.directory / ACTIVE_FILE, "a", encoding="utf-8")  # noqa: SIM115
+            self._file.write("".join(payload + "\n" for payload in payloads))
+            self._written_seq += 1
+            seq = self._written_seq
+        self._sync(seq)
+
+    def has_pending(self) -> bool:
+        return any(path.stat().st_size > 0 for path in self._spool_files())
+
+    def rotate(self) -> None:
+        """Закрывает текущий файл и переименовывает его для replay; новые записи идут в свежий файл."""
+        with self._sync_lock, self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._synced_seq = self._written_seq
+            active = self.directory / ACTIVE_FILE
+            if active.exists():
+                active.rename(self.directory / f"{REPLAY_PREFIX}{time.time_ns()}")
+
+    def replay_files(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{REPLAY_PREFIX}*"))
+
+    @staticmethod
+    def read(path: Path) -> list[str]:
+        with open(path, encoding="utf-8") as file:
+            # Хвост без перевода строки — запись, прерванная падением процесса
+            return [line.rstrip("\n") for line in file if line.endswith("\n") and line.strip()]
+
+    def close(self) -> None:
+        with self._sync_lock, self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _spool_files(self) -> list[Path]:
+        active = self.directory / ACTIVE_FILE
+        return [*self.replay_files(), *([active] if active.exists() else [])]
+
+    def _sync(self, seq: int) -> None:
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return
+            with self._lock:
+                if self._file is None:
+                    return
+                self._file.flush()
+                target = self._written_seq
+                fileno = self._file.fileno()
+            os.fsync(fileno)
+            self._synced_seq = target
+
+
+refund_spool = RefundSpool()
@@ -4,7 +4,7 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
-from app.services.exceptions import FlightNotFoundError, AirportNotFoundError
+from app.services.exceptions import FlightNotFoundError, AirportNotFoundError, FlightNumberNotFoundError
 from app.infrastructure.circuit_breaker import CircuitOpenError
 
 
@@ -16,6 +16,10 @@ async def flight_not_found_error_handler(_: Request, exc: FlightNotFoundError) -
     return JSONResponse(status_code=404, content={"message": exc.message})
 
 
+async def flight_number_not_found_error_handler(_: Request, exc: FlightNumberNotFoundError) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"message": exc.message})
+
+
 async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
     errors = {}
     for err in exc.errors():
@@ -51,6 +55,7 @@ async def service_unavailable_handler(
 def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(AirportNotFoundError, airport_not_found_error_handler)  # type: ignore
     app.add_exception_handler(FlightNotFoundError, flight_not_found_error_handler)  # type: ignore
+    app.add_exception_handler(FlightNumberNotFoundError, flight_number_not_found_error_handler)  # type: ignore
     app.add_exception_handler(HTTPException, http_exception_handler)  # type: ignore
     app.add_exception_handler(RequestValidationError, validation_error_handler)  # type: ignore
     app.add_exception_handler(CircuitOpenError, service_unavailable_handler)  # type: ignore
@@ -1,11 +1,18 @@
-import threading
+import asyncio
+
+import httpx
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.logger import persons_logger
 from app.presentation.api import routers, handlers
-from app.infrastructure.refund_queue import run_worker
+from app.infrastructure.http_clients import init_clients, close_clients
+from app.infrastructure.refund_queue import close_redis, start_workers, run_spool_replayer
+from app.infrastructure.fallback_cache import STALE_HEADER, track_stale_reads
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.connectors.flight import FlightConnector
 
 load_dotenv(override=True)
 
@@ -22,10 +29,52 @@ routers.add_routers(app)
 handlers.add_exception_handlers(app)
 
 
+@app.middleware("http")
+async def mark_stale_responses(request: Request, call_next) -> Response:  # type: ignore
+    """Ответ, собранный из кэша последнего успешного ответа, помечается заголовками."""
+    stale_reads = track_stale_reads()
+    response = await call_next(request)
+    if stale_reads:
+        response.headers[STALE_HEADER] = "STALE"
+        response.headers["Age"] = str(int(max(stale_reads)))
+    return response
+
+
+@app.on_event("startup")
+def open_http_clients() -> None:
+    init_clients()
+
+
+@app.on_event("startup")
+def register_circuit_breakers() -> None:
+    CircuitBreaker.register_downstream()
+
+
+@app.on_event("startup")
+def warm_up_airport_cache() -> None:
+    try:
+        count = FlightConnector().warm_up_airports()
+        persons_logger.info("Кэш аэропортов прогрет: %s записей", count)
+    except httpx.HTTPError as e:
+        persons_logger.warning(f"Не удалось прогреть кэш аэропортов: {e}")
+
+
+@app.on_event("shutdown")
+def close_http_clients() -> None:
+    close_clients()
+
+
 @app.on_event("startup")
-def start_refund_queue_worker() -> None:
-    thread = threading.Thread(target=run_worker, daemon=True)
-    thread.start()
+async def start_refund_queue_workers() -> None:
+    app.state.refund_workers = start_workers()
+    app.state.refund_workers.append(asyncio.create_task(run_spool_replayer(), name="refund-spool-replayer"))
+
+
+@app.on_event("shutdown")
+async def stop_refund_queue_workers() -> None:
+    for task in getattr(app.state, "refund_workers", []):
+        task.cancel()
+    await close_redis()
 
 
 app.add_middleware(
@@ -1,8 +1,68 @@
-from fastapi import APIRouter
+import redis
 
-router = APIRouter(prefix="/manage/health")
+from fastapi import Query, APIRouter
+from fastapi.responses import JSONResponse
 
+from app.presentation.api.schemas import (
+    QueueStats,
+    BreakersResponse,
+    DeadLettersResponse,
+    DeadLetterReplayResponse,
+)
+from app.infrastructure.refund_queue import (
+    DEAD_LETTER_REPLAY_LIMIT,
+    get_redis,
+    queue_stats,
+    get_dead_letters,
+    replay_dead_letters,
+)
+from app.infrastructure.circuit_breaker import CircuitBreaker
 
-@router.get("", status_code=200)
+router = APIRouter(prefix="/manage")
+
+
+def _queue_unavailable() -> JSONResponse:
+    return JSONResponse(status_code=503, content={"message": "Refund queue unavailable"})
+
+
+@router.get("/health", status_code=200)
 def ping() -> None:
     return
+
+
+@router.get("/breakers")
+def get_breakers() -> BreakersResponse:
+    """Состояние и статистика предохранителей downstream-сервисов."""
+    return BreakersResponse(breakers=[breaker.stats() for breaker in CircuitBreaker.all()])
+
+
+@router.get("/queue", response_model=None)
+async def get_queue_stats() -> QueueStats | JSONResponse:
+    """Глубина очереди возвратов, возраст самого старого задания, повторы и DLQ."""
+    try:
+        return await queue_stats(get_redis())
+    except redis.RedisError:
+        return _queue_unavailable()
+
+
+@router.get("/queue/dead-letters", response_model=None)
+async def list_dead_letters(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> DeadLettersResponse | JSONResponse:
+    try:
+        total, items = await get_dead_letters(get_redis(), offset, limit)
+    except redis.RedisError:
+        return _queue_unavailable()
+    return DeadLettersResponse(total=total, items=items)
+
+
+@router.post("/queue/dead-letters/replay", response_model=None)
+async def replay_dead_letter_jobs(
+    limit: int = Query(DEAD_LETTER_REPLAY_LIMIT, ge=1, le=10000),
+) -> DeadLetterReplayResponse | JSONResponse:
+    """Возвращает в очередь самые старые задания из DLQ со сброшенным счётчиком попыток."""
+    try:
+        return DeadLetterReplayResponse(replayed=await replay_dead_letters(get_redis(), limit))
+    except redis.RedisError:
+        return _queue_unavailable()
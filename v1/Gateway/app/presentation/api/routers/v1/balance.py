@@ -2,7 +2,13 @@ from fastapi import Header, Depends, APIRouter
 
 from app.dependencies import get_bonus_service
 from app.services.bonus import BonusService
-from app.presentation.api.schemas import SetBalanceRequest, CreateHistoryRequest
+from app.presentation.api.schemas import (
+    MeResponse,
+    SetBalanceRequest,
+    CreateHistoryRequest,
+    BalanceOperationRequest,
+    BalanceOperationResponse,
+)
 
 router = APIRouter(prefix="/v1/balance")
 
@@ -23,3 +29,21 @@ def create_history_record(
     bonus_service: BonusService = Depends(get_bonus_service),
 ) -> None:
     bonus_service.create_history_record(username, body.ticketUid, body.balanceDiff, body.operationType)
+
+
+@router.post("/operations")
+def apply_balance_operation(
+    body: BalanceOperationRequest,
+    username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
+    bonus_service: BonusService = Depends(get_bonus_service),
+) -> BalanceOperationResponse:
+    return bonus_service.apply_balance_operation(username, body)
+
+
+@router.get("/history/{ticket_uid}")
+def get_ticket_history(
+    ticket_uid: str,
+    username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
+    bonus_service: BonusService = Depends(get_bonus_service),
+) -> MeResponse:
+    return bonus_service.get_ticket_history(username, ticket_uid)
@@ -5,7 +5,7 @@ from fastapi.responses import JSONResponse
 
 from app.dependencies import get_flight_service
 from app.services.flight import FlightService
-from app.presentation.api.schemas import PaginationResponse
+from app.presentation.api.schemas import FlightResponse, PaginationResponse
 from app.infrastructure.circuit_breaker import CircuitOpenError
 
 router = APIRouter(prefix="/v1/flights")
@@ -24,3 +24,17 @@ def get_all_flights(
             status_code=503,
             content={"message": "Flight service unavailable"},
         )
+
+
+@router.get("/{flight_number}", response_model=None)
+def get_flight_by_number(
+    flight_number: str,
+    flight_service: FlightService = Depends(get_flight_service),
+) -> FlightResponse | JSONResponse:
+    try:
+        return flight_service.get_by_number(flight_number)
+    except (CircuitOpenError, httpx.HTTPError, httpx.RequestError):
+        return JSONResponse(
+            status_code=503,
+            content={"message": "Flight service unavailable"},
+        )
@@ -19,13 +19,18 @@ def get_me(
     ticket_service: TicketService = Depends(get_ticket_service),
 ) -> UserInfoResponse | JSONResponse:
     try:
-        return ticket_service.get_user_info(username, bonus_service)
-    except (CircuitOpenError, httpx.HTTPError, httpx.RequestError):
-        tickets = ticket_service.get_user_tickets(username)
+        user_info = ticket_service.get_user_info(username, bonus_service)
+    except (CircuitOpenError, httpx.HTTPError, httpx.RequestError, TimeoutError):
+        return JSONResponse(
+            status_code=503,
+            content={"message": "Ticket service unavailable"},
+        )
+    if user_info.privilege is None:
         return JSONResponse(
             status_code=200,
             content={
-                "tickets": [t.model_dump() for t in tickets],
+                "tickets": [t.model_dump() for t in user_info.tickets],
                 "privilege": {},
             },
         )
+    return user_info
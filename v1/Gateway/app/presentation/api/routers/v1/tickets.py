@@ -2,6 +2,7 @@ import httpx
 
 from fastapi import Header, Depends, APIRouter, HTTPException
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 
 from app.dependencies import get_ticket_service
 from app.services.ticket import TicketService
@@ -10,6 +11,7 @@ from app.presentation.api.schemas import (
     TicketCreateRequest,
     TicketPurchaseResponse,
 )
+from app.infrastructure.refund_queue import enqueue_refund, canonical_refund_job
 from app.infrastructure.circuit_breaker import CircuitOpenError
 
 router = APIRouter(prefix="/v1/tickets")
@@ -65,20 +67,22 @@ def purchase_ticket(
 
 
 @router.delete("/{ticket_uid}", status_code=204)
-def cancel_ticket(
+async def cancel_ticket(
     ticket_uid: str,
     username: str = Header(..., description="Имя пользователя", alias="X-User-Name"),
     ticket_service: TicketService = Depends(get_ticket_service),
 ) -> None:
     try:
-        ticket_service.cancel_ticket(ticket_uid, username)
+        ticket_uid, username = canonical_refund_job(ticket_uid, username)
+    except ValueError as e:
+        # Такое задание Ticket service не примет никогда: в очередь его не ставим
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    # Вызов Ticket service синхронный — в пуле потоков; постановка в очередь — в event loop
+    try:
+        await run_in_threadpool(ticket_service.cancel_ticket, ticket_uid, username)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="Ticket not found") from e
-        from app.infrastructure.refund_queue import enqueue_refund
-
-        enqueue_refund(ticket_uid, username)
+        await enqueue_refund(ticket_uid, username)
     except (CircuitOpenError, httpx.HTTPError, httpx.RequestError):
-        from app.infrastructure.refund_queue import enqueue_refund
-
-        enqueue_refund(ticket_uid, username)
+        await enqueue_refund(ticket_uid, username)
@@ -29,6 +29,13 @@ class FlightMeta(BaseModel):
     price: int
 
 
+class FlightDetails(FlightMeta):
+    id: int
+    datetime: datetime
+    from_airport: AirportResponse
+    to_airport: AirportResponse
+
+
 class FlightResponse(BaseModel):
     flightNumber: str
     fromAirport: str
@@ -79,6 +86,19 @@ class CreateHistoryRequest(BaseModel):
     operationType: str
 
 
+class BalanceOperationRequest(BaseModel):
+    ticketUid: str
+    balanceDiff: int
+    operationType: str
+    idempotencyKey: str
+
+
+class BalanceOperationResponse(BaseModel):
+    balance: int
+    status: str
+    applied: bool
+
+
 class TicketCreateRequest(BaseModel):
     flightNumber: str
     price: int
@@ -115,7 +135,8 @@ class TicketPurchaseResponse(BaseModel):
 
 class UserInfoResponse(BaseModel):
     tickets: list[TicketResponse]
-    privilege: PrivilegeShortInfo
+    # None — Bonus не ответил, роутер отдаёт fallback "privilege": {}
+    privilege: PrivilegeShortInfo | None
     history: list[HistoryItem] = []
     # Топ-уровень для совместимости с Ticket service: get_user_balance() берёт response_json.get("balance", 0)
     balance: int = 0
@@ -130,3 +151,65 @@ class PrivilegeInfoResponse(BaseModel):
 
 class ErrorResponse(BaseModel):
     message: str
+
+
+class BreakerTransition(BaseModel):
+    from_state: str
+    to_state: str
+    at: datetime
+
+
+class BreakerStats(BaseModel):
+    name: str
+    state: str
+    window_type: str
+    window_size: int
+    window_calls: int
+    failure_rate: float
+    slow_call_rate: float
+    failure_rate_threshold: float
+    slow_call_rate_threshold: float
+    minimum_calls: int
+    # Ошибки подряд, открывающие цепь независимо от окна
+    failure_threshold: int
+    consecutive_failures: int
+    # Только для open: через сколько секунд будет пропущен пробный вызов
+    seconds_until_probe: float | None
+    total_calls: int
+    rejected_calls: int
+    # Верхняя граница корзины в мс -> число вызовов (не накопительно)
+    latency_histogram_ms: dict[str, int]
+    transitions: list[BreakerTransition]
+
+
+class BreakersResponse(BaseModel):
+    breakers: list[BreakerStats]
+
+
+class QueueStats(BaseModel):
+    depth: int
+    processing: int
+    delayed: int
+    dead_letters: int
+    workers: int
+    # Возраст самого старого задания в очереди; None для пустой очереди
+    oldest_job_age_sec: float | None
+    spool_pending: bool
+
+
+class DeadLetter(BaseModel):
+    ticket_uid: str | None
+    payload: str
+    reason: str
+    attempts: int
+    enqueued_at: datetime | None
+    failed_at: datetime
+
+
+class DeadLettersResponse(BaseModel):
+    total: int
+    items: list[DeadLetter]
+
+
+class DeadLetterReplayResponse(BaseModel):
+    replayed: int
@@ -1,6 +1,8 @@
 from app.presentation.api.schemas import (
     MeResponse,
     PrivilegeInfoResponse,
+    BalanceOperationRequest,
+    BalanceOperationResponse,
 )
 from app.infrastructure.connectors.bonus import BonusConnector
 
@@ -20,6 +22,9 @@ class BonusService:
             history=me_response.history,
         )
 
+    def get_ticket_history(self, username: str, ticket_uid: str) -> MeResponse:
+        return self._bonus_connector.get_ticket_history(username, ticket_uid)
+
     def get_user_balance(self, username: str) -> int:
         return self._bonus_connector.get_user_balance(username)
 
@@ -28,3 +33,6 @@ class BonusService:
 
     def create_history_record(self, username: str, ticket_uid: str, balance_diff: int, operation_type: str) -> None:
         self._bonus_connector.create_history_record(username, ticket_uid, balance_diff, operation_type)
+
+    def apply_balance_operation(self, username: str, operation: BalanceOperationRequest) -> BalanceOperationResponse:
+        return self._bonus_connector.apply_balance_operation(username, operation)
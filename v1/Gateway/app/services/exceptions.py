@@ -12,3 +12,11 @@ class FlightNotFoundError(Exception):
         super().__init__(message)
         self.id = id
         self.message = message
+
+
+class FlightNumberNotFoundError(Exception):
+    def __init__(self, flight_number: str):
+        message = f"Flight with number={flight_number} not found"
+        super().__init__(message)
+        self.flight_number = flight_number
+        self.message = message
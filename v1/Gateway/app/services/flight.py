@@ -1,4 +1,5 @@
-from app.presentation.api.schemas import AllFlightsResponse
+from app.services.exceptions import FlightNumberNotFoundError
+from app.presentation.api.schemas import FlightResponse, AllFlightsResponse
 from app.infrastructure.connectors.flight import FlightConnector
 
 
@@ -9,3 +10,9 @@ class FlightService:
     def get_all(self, page: int, size: int) -> AllFlightsResponse:
         flights = self._flight_connector.get_flights(page, size)
         return flights
+
+    def get_by_number(self, flight_number: str) -> FlightResponse:
+        flight = self._flight_connector.get_flight(flight_number)
+        if flight is None:
+            raise FlightNumberNotFoundError(flight_number)
+        return flight
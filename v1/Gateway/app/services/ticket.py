@@ -1,4 +1,7 @@
+import time
+
 from app.services.bonus import BonusService
+from app.infrastructure.fan_out import FAN_OUT_BRANCH_TIMEOUT_SEC, FanOut
 from app.presentation.api.schemas import (
     TicketResponse,
     UserInfoResponse,
@@ -27,8 +30,20 @@ class TicketService:
         return self._ticket_connector.cancel_ticket(ticket_uid, username)
 
     def get_user_info(self, username: str, bonus_service: BonusService) -> UserInfoResponse:
-        tickets = self.get_user_tickets(username)
-        me_response = bonus_service.get_me(username)
+        """Билеты и бонусы запрашиваются параллельно.
+
+        Ошибка ветки билетов пробрасывается; при ошибке или таймауте Bonus
+        возвращается ответ без привилегии (privilege=None).
+        """
+        fan_out = FanOut.get("me")
+        tickets_future = fan_out.submit(lambda: self.get_user_tickets(username))
+        me_future = fan_out.submit(lambda: bonus_service.get_me(username))
+        deadline = time.monotonic() + FAN_OUT_BRANCH_TIMEOUT_SEC
+
+        tickets = fan_out.wait(tickets_future, deadline)
+        me_response = fan_out.settle(me_future, deadline)
+        if isinstance(me_response, Exception):
+            return UserInfoResponse(tickets=tickets, privilege=None)
         return UserInfoResponse(
             tickets=tickets,
             privilege=PrivilegeShortInfo(balance=me_response.balance, status=me_response.status),
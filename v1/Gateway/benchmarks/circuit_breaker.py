@@ -0,0 +1,55 @@
+"""Накладные расходы CircuitBreaker.call на один вызов: без предохранителя, окна count и time, под конкуренцией.
+
+Запуск из каталога Gateway: ``python -m benchmarks.circuit_breaker [calls] [threads]``.
+"""
+
+import sys
+import time
+import threading
+
+from collections.abc import Callable
+
+from app.infrastructure.circuit_breaker import CircuitBreaker
+
+
+def _noop() -> None:
+    return None
+
+
+def _run(call: Callable[[], None], calls: int, threads: int) -> float:
+    """Среднее время вызова в наносекундах при threads параллельных потоках."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for _ in range(calls):
+            call()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - started) * 1e9 / (calls * threads)
+
+
+def main(calls: int = 200_000, threads: int = 8) -> None:
+    count_breaker = CircuitBreaker("bench-count", window_type="count", window_size=100)
+    time_breaker = CircuitBreaker("bench-time", window_type="time", window_size=60)
+
+    for concurrency in (1, threads):
+        direct = _run(_noop, calls, concurrency)
+        print(f"threads={concurrency:<3} direct call       {direct:8.0f}ns")
+        for label, breaker in (("count window", count_breaker), ("time window", time_breaker)):
+            through_breaker = _run(lambda b=breaker: b.call(_noop), calls, concurrency)
+            overhead = through_breaker - direct
+            print(f"threads={concurrency:<3} {label:<17} {through_breaker:8.0f}ns (+{overhead:.0f}ns)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
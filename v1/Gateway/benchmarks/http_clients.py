@@ -0,0 +1,69 @@
+"""Задержка одного запроса: новый httpx.Client на вызов против общего пула.
+
+Запуск из каталога Gateway: ``python -m benchmarks.http_clients [requests]``.
+"""
+
+import sys
+import time
+import threading
+import statistics
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections.abc import Callable
+
+import httpx
+
+from app.infrastructure.http_clients import get_client, close_clients
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b'{"id": 1, "name": "Pulkovo", "city": "Saint Petersburg", "country": "Russia"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+def _measure(call: Callable[[], httpx.Response], requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        call().raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<24} mean={statistics.mean(timings):.3f}ms p50={statistics.median(timings):.3f}ms p95={p95:.3f}ms")
+
+
+def _fresh_client_call(url: str) -> httpx.Response:
+    with httpx.Client(verify=False, timeout=10.0) as client:
+        return client.get(url)
+
+
+def main(requests: int = 1000) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/airports/1"
+
+    try:
+        _report("fresh client per call", _measure(lambda: _fresh_client_call(url), requests))
+        _report("pooled client", _measure(lambda: get_client("flight").get(url), requests))
+    finally:
+        close_clients()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
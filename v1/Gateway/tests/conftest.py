@@ -5,11 +5,22 @@ import pytest
 from app.services.bonus import BonusService
 from app.services.flight import FlightService
 from app.services.ticket import TicketService
+from app.infrastructure.fallback_cache import fallback_cache
+from app.infrastructure.circuit_breaker import CircuitBreaker
 from app.infrastructure.connectors.bonus import BonusConnector
 from app.infrastructure.connectors.flight import FlightConnector
 from app.infrastructure.connectors.ticket import TicketConnector
 
 
+@pytest.fixture(autouse=True)
+def isolate_downstream_state(monkeypatch):
+    """Общие по процессу предохранители и fallback-кэш не переносят состояние между тестами."""
+    monkeypatch.setattr(CircuitBreaker, "_instances", {})
+    fallback_cache.clear()
+    yield
+    fallback_cache.clear()
+
+
 @pytest.fixture
 def mock_flight_connector():
     return MagicMock(spec=FlightConnector)
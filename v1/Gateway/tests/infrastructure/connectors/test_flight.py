@@ -0,0 +1,106 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.infrastructure.airport_cache import airport_cache
+from app.infrastructure.connectors.flight import AIRPORT_IDS_MAX_COUNT, FlightConnector
+
+PULKOVO = {"id": 2, "name": "Пулково", "city": "Санкт-Петербург", "country": "Россия"}
+SHEREMETYEVO = {"id": 1, "name": "Шереметьево", "city": "Москва", "country": "Россия"}
+
+
+def make_flight(flight_number: str) -> dict:
+    return {
+        "id": 1,
+        "flight_number": flight_number,
+        "from_airport_id": 2,
+        "to_airport_id": 1,
+        "price": 1500,
+        "datetime": "2021-10-08T20:00:00Z",
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_airport_cache():
+    airport_cache.clear()
+    yield
+    airport_cache.clear()
+
+
+@pytest.fixture
+def flight_client(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr("app.infrastructure.connectors.flight.get_client", lambda name: client)
+    return client
+
+
+def respond(payloads: dict[str, dict]):
+    def get(url, params=None):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = next(body for path, body in payloads.items() if url.endswith(path))
+        return response
+
+    return get
+
+
+class TestFlightConnectorBatchAirports:
+    def test_get_flights_resolves_airports_in_one_call(self, flight_client):
+        flight_client.get.side_effect = respond({
+            "/v1/flights": {
+                "page": 1,
+                "pageSize": 10,
+                "totalElements": 3,
+                "items": [make_flight("AFL031"), make_flight("AFL032"), make_flight("AFL033")],
+            },
+            "/v1/airports": {"airports": [PULKOVO, SHEREMETYEVO]},
+        })
+
+        result = FlightConnector().get_flights(1, 10)
+
+        assert flight_client.get.call_count == 2
+        assert flight_client.get.call_args_list[1].kwargs["params"] == {"ids": "2,1"}
+        assert len(result.items) == 3
+        assert result.items[0].fromAirport == "Санкт-Петербург Пулково"
+        assert result.items[0].toAirport == "Москва Шереметьево"
+
+    def test_get_flights_uses_expanded_airports(self, flight_client):
+        expanded = {**make_flight("AFL031"), "from_airport": PULKOVO, "to_airport": SHEREMETYEVO}
+        flight_client.get.side_effect = respond({
+            "/v1/flights": {"page": 1, "pageSize": 10, "totalElements": 1, "items": [expanded]},
+        })
+
+        result = FlightConnector().get_flights(1, 10)
+
+        flight_client.get.assert_called_once()
+        assert flight_client.get.call_args.kwargs["params"]["expand"] == "airports"
+        assert result.items[0].fromAirport == "Санкт-Петербург Пулково"
+        assert result.items[0].toAirport == "Москва Шереметьево"
+
+    def test_get_airports_skips_cached_ids(self, flight_client):
+        connector = FlightConnector()
+        flight_client.get.side_effect = respond({"/v1/airports": {"airports": [PULKOVO, SHEREMETYEVO]}})
+        connector.get_airports([1, 2])
+
+        airports = connector.get_airports([2, 1, 2])
+
+        flight_client.get.assert_called_once()
+        assert set(airports) == {1, 2}
+
+    def test_get_airports_splits_ids_into_allowed_batches(self, flight_client):
+        airport_ids = list(range(1, AIRPORT_IDS_MAX_COUNT + 2))
+
+        def get(url, params=None):
+            response = MagicMock()
+            response.json.return_value = {
+                "airports": [{**PULKOVO, "id": int(airport_id)} for airport_id in params["ids"].split(",")]
+            }
+            return response
+
+        flight_client.get.side_effect = get
+
+        airports = FlightConnector().get_airports(airport_ids)
+
+        batches = [call.kwargs["params"]["ids"].split(",") for call in flight_client.get.call_args_list]
+        assert [len(batch) for batch in batches] == [AIRPORT_IDS_MAX_COUNT, 1]
+        assert set(airports) == set(airport_ids)
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.infrastructure.airport_cache import airport_cache
+from app.infrastructure.fallback_cache import fallback_cache
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.connectors.ticket import TicketConnector
+
+FLIGHT_DETAILS = {
+    "id": 1,
+    "flight_number": "AFL031",
+    "from_airport_id": 2,
+    "to_airport_id": 1,
+    "price": 1500,
+    "datetime": "2021-10-08T20:00:00Z",
+    "from_airport": {"id": 2, "name": "Пулково", "city": "Санкт-Петербург", "country": "Россия"},
+    "to_airport": {"id": 1, "name": "Шереметьево", "city": "Москва", "country": "Россия"},
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_airport_cache():
+    airport_cache.clear()
+    yield
+    airport_cache.clear()
+
+
+@pytest.fixture
+def flight_client(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr("app.infrastructure.connectors.flight.get_client", lambda name: client)
+    return client
+
+
+class TestTicketConnectorFlightInfo:
+    def test_get_flight_info_by_number(self, flight_client):
+        flight_client.get.return_value.status_code = 200
+        flight_client.get.return_value.json.return_value = FLIGHT_DETAILS
+
+        result = TicketConnector()._get_flight_info("AFL031")
+
+        flight_client.get.assert_called_once()
+        assert flight_client.get.call_args[0][0].endswith("/v1/flights/by-number/AFL031")
+        assert result == ("Санкт-Петербург Пулково", "Москва Шереметьево", "2021-10-08 20:00")
+        assert airport_cache.get(1) is not None
+
+    def test_get_flight_info_not_found(self, flight_client):
+        flight_client.get.return_value.status_code = 404
+
+        result = TicketConnector()._get_flight_info("UNKNOWN")
+
+        assert result == ("", "", "")
+
+
+class TestTicketConnectorUserTickets:
+    def test_flight_failure_falls_back_per_ticket(self, monkeypatch):
+        connector = TicketConnector()
+        ticket_client = MagicMock()
+        ticket_client.get.return_value.json.return_value = {
+            "items": [
+                {"ticket_uid": "uid-1", "flight_number": "AFL031", "price": 1500, "status": "PAID"},
+                {"ticket_uid": "uid-2", "flight_number": "AFL032", "price": 1500, "status": "PAID"},
+                {"ticket_uid": "uid-3", "flight_number": "AFL031", "price": 1500, "status": "PAID"},
+            ]
+        }
+        monkeypatch.setattr("app.infrastructure.connectors.ticket.get_client", lambda name: ticket_client)
+
+        def get_flight_info(flight_number):
+            if flight_number == "AFL032":
+                raise httpx.ConnectError("flight service down")
+            return ("Санкт-Петербург Пулково", "Москва Шереметьево", "2021-10-08 20:00")
+
+        monkeypatch.setattr(connector, "_get_flight_info", MagicMock(side_effect=get_flight_info))
+
+        tickets = connector._get_user_tickets_impl("test_user")
+
+        assert connector._get_flight_info.call_count == 2
+        assert tickets[0].fromAirport == "Санкт-Петербург Пулково"
+        assert tickets[1].fromAirport == ""
+        assert tickets[1].date == ""
+        assert tickets[2].toAirport == "Москва Шереметьево"
+
+
+class TestTicketConnectorCacheInvalidation:
+    def test_cancel_drops_cached_reads_of_the_user(self, monkeypatch):
+        connector = TicketConnector()
+        monkeypatch.setattr("app.infrastructure.connectors.ticket.get_client", lambda name: MagicMock())
+        for key in [("ticket", "uid-1"), ("user_tickets", "test_user"), ("me", "test_user")]:
+            fallback_cache.read(CircuitBreaker("warm"), key, lambda: "cached")
+
+        connector.cancel_ticket("uid-1", "test_user")
+
+        assert fallback_cache.stats()["size"] == 0
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.presentation.api.schemas import AirportResponse
+from app.infrastructure.airport_cache import AirportCache, airport_cache
+from app.infrastructure.connectors.flight import FlightConnector
+
+
+def make_airport(airport_id: int) -> AirportResponse:
+    return AirportResponse(id=airport_id, name="Пулково", city="Санкт-Петербург", country="Россия")
+
+
+@pytest.fixture(autouse=True)
+def reset_airport_cache():
+    airport_cache.clear()
+    yield
+    airport_cache.clear()
+
+
+class TestAirportCache:
+    def test_get_hit_and_miss(self):
+        cache = AirportCache(ttl_sec=60, max_size=10)
+        cache.put(make_airport(1))
+
+        assert cache.get(1).id == 1
+        assert cache.get(2) is None
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_expired_entry_is_miss(self):
+        cache = AirportCache(ttl_sec=0, max_size=10)
+        cache.put(make_airport(1))
+
+        assert cache.get(1) is None
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        cache = AirportCache(ttl_sec=60, max_size=2)
+        cache.put_many([make_airport(1), make_airport(2)])
+        cache.get(1)
+        cache.put(make_airport(3))
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.get(3) is not None
+
+
+class TestFlightConnectorAirportCache:
+    def test_get_airport_uses_cache(self, monkeypatch):
+        client = MagicMock()
+        client.get.return_value.json.return_value = make_airport(1).model_dump()
+        monkeypatch.setattr("app.infrastructure.connectors.flight.get_client", lambda name: client)
+        connector = FlightConnector()
+
+        first = connector.get_airport(1)
+        second = connector.get_airport(1)
+
+        assert first == second
+        client.get.assert_called_once()
+
+    def test_warm_up_airports(self, monkeypatch):
+        client = MagicMock()
+        client.get.return_value.json.return_value = {
+            "airports": [make_airport(1).model_dump(), make_airport(2).model_dump()]
+        }
+        monkeypatch.setattr("app.infrastructure.connectors.flight.get_client", lambda name: client)
+
+        count = FlightConnector().warm_up_airports()
+
+        assert count == 2
+        assert airport_cache.get(2) is not None
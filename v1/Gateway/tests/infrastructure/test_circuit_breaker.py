@@ -0,0 +1,192 @@
+import time
+import threading
+import contextlib
+
+import pytest
+
+from app.infrastructure.circuit_breaker import OPEN, CLOSED, HALF_OPEN, TimeWindow, CircuitBreaker, CircuitOpenError
+
+
+def fail() -> None:
+    raise RuntimeError("downstream error")
+
+
+def call_ignoring_errors(breaker: CircuitBreaker, func) -> None:
+    with contextlib.suppress(RuntimeError):
+        breaker.call(func)
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=10, minimum_calls=4, window_size=10, failure_rate_threshold=50
+        )
+
+        call_ignoring_errors(breaker, lambda: None)
+        call_ignoring_errors(breaker, lambda: None)
+        call_ignoring_errors(breaker, fail)
+        assert breaker.state == CLOSED
+
+        call_ignoring_errors(breaker, fail)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+
+    def test_count_window_forgets_old_failures(self):
+        breaker = CircuitBreaker("test", minimum_calls=3, window_size=3, failure_rate_threshold=50)
+
+        call_ignoring_errors(breaker, fail)
+        for _ in range(3):
+            breaker.call(lambda: None)
+        call_ignoring_errors(breaker, fail)
+
+        assert breaker.state == CLOSED
+
+    def test_opens_on_slow_call_rate(self):
+        breaker = CircuitBreaker(
+            "test",
+            minimum_calls=2,
+            window_size=10,
+            slow_call_rate_threshold=100,
+            slow_call_duration_sec=0.01,
+        )
+
+        breaker.call(lambda: time.sleep(0.02))
+        breaker.call(lambda: time.sleep(0.02))
+
+        assert breaker.state == OPEN
+
+    def test_half_open_limits_probes_and_closes(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, recovery_timeout_sec=0.0, window_size=5, half_open_max_calls=2
+        )
+        call_ignoring_errors(breaker, fail)
+        probe_started = threading.Event()
+        release_probe = threading.Event()
+
+        def slow_probe() -> None:
+            probe_started.set()
+            release_probe.wait(1)
+
+        worker = threading.Thread(target=breaker.call, args=(slow_probe,))
+        worker.start()
+        probe_started.wait(1)
+        assert breaker.state == HALF_OPEN
+
+        breaker.call(lambda: None)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+
+        release_probe.set()
+        worker.join()
+        assert breaker.state == CLOSED
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0.0, half_open_max_calls=1)
+        call_ignoring_errors(breaker, fail)
+
+        call_ignoring_errors(breaker, fail)
+
+        assert breaker.state == OPEN
+
+    def test_concurrent_calls_keep_consistent_counts(self):
+        breaker = CircuitBreaker("test", minimum_calls=10_000, window_size=10_000)
+        barrier = threading.Barrier(8)
+
+        def worker() -> None:
+            barrier.wait()
+            for _ in range(500):
+                breaker.call(lambda: None)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert breaker._window.totals(time.monotonic()) == (4000, 0, 0)
+
+    def test_consecutive_failures_open_after_healthy_window(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, minimum_calls=10, window_size=20)
+        for _ in range(17):
+            breaker.call(lambda: None)
+
+        call_ignoring_errors(breaker, fail)
+        call_ignoring_errors(breaker, fail)
+        assert breaker.state == CLOSED
+
+        call_ignoring_errors(breaker, fail)
+        assert breaker.state == OPEN
+
+    def test_success_breaks_failure_streak(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, minimum_calls=10, window_size=20)
+
+        call_ignoring_errors(breaker, fail)
+        breaker.call(lambda: None)
+        call_ignoring_errors(breaker, fail)
+
+        assert breaker.state == CLOSED
+
+    def test_unknown_window_type(self):
+        with pytest.raises(ValueError):
+            CircuitBreaker("test", window_type="sliding")
+
+
+class TestTimeWindow:
+    def test_expires_old_buckets(self):
+        window = TimeWindow(size=10)
+        window.record(True, False, now=100.0)
+        window.record(False, True, now=105.5)
+
+        assert window.totals(now=109.0) == (2, 1, 1)
+        assert window.totals(now=110.0) == (1, 0, 1)
+        assert window.totals(now=200.0) == (0, 0, 0)
+
+
+class TestCircuitBreakerStats:
+    def test_stats_report_window_rates_and_latency(self):
+        breaker = CircuitBreaker("test", minimum_calls=10, window_size=10)
+        breaker.call(lambda: None)
+        call_ignoring_errors(breaker, fail)
+
+        stats = breaker.stats()
+
+        assert stats.state == CLOSED
+        assert stats.window_calls == 2
+        assert stats.failure_rate == 50.0
+        assert stats.seconds_until_probe is None
+        assert stats.total_calls == 2
+        assert stats.latency_histogram_ms["5"] == 2
+        assert sum(stats.latency_histogram_ms.values()) == 2
+
+    def test_stats_report_transitions_and_probe_time(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=60)
+        call_ignoring_errors(breaker, fail)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+
+        stats = breaker.stats()
+
+        assert stats.state == OPEN
+        assert 0 < stats.seconds_until_probe <= 60
+        assert stats.rejected_calls == 1
+        assert [(t.from_state, t.to_state) for t in stats.transitions] == [(CLOSED, OPEN)]
+
+    def test_manage_breakers_lists_registered_breakers(self, monkeypatch):
+        from app.presentation.api.routers.manage import get_breakers
+
+        monkeypatch.setattr(CircuitBreaker, "_instances", {"flight": CircuitBreaker("flight")})
+
+        response = get_breakers()
+
+        assert [stats.name for stats in response.breakers] == ["flight"]
+
+    def test_downstream_breakers_are_listed_before_first_call(self):
+        from app.presentation.api.main import register_circuit_breakers
+        from app.presentation.api.routers.manage import get_breakers
+
+        register_circuit_breakers()
+        response = get_breakers()
+
+        assert sorted(stats.name for stats in response.breakers) == ["bonus", "flight", "ticket"]
+        assert all(stats.state == CLOSED and stats.total_calls == 0 for stats in response.breakers)
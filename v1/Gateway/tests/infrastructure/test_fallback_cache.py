@@ -0,0 +1,231 @@
+import time
+import threading
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_flight_service
+from app.presentation.api.main import app
+from app.presentation.api.schemas import AllFlightsResponse
+from app.infrastructure.fallback_cache import STALE_HEADER, FallbackCache, fallback_cache, track_stale_reads
+from app.infrastructure.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://ticket/api/v1/tickets")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+def raise_error(error: Exception):
+    def fetch():
+        raise error
+
+    return fetch
+
+
+def open_breaker(recovery_timeout_sec: float = 60) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=recovery_timeout_sec)
+    with pytest.raises(httpx.ConnectError):
+        breaker.call(raise_error(httpx.ConnectError("down")))
+    return breaker
+
+
+def wait_until(condition, timeout_sec: float = 1.0) -> None:
+    deadline = time.monotonic() + timeout_sec
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestFallbackCache:
+    def test_miss_fetches_and_stores(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test")
+
+        assert cache.read(breaker, "key", lambda: "fresh") == "fresh"
+        assert cache.stats() == {"size": 1, "stale_hits": 0}
+
+    def test_miss_without_cached_value_propagates_error(self):
+        cache = FallbackCache()
+        breaker = open_breaker()
+
+        with pytest.raises(CircuitOpenError):
+            cache.read(breaker, "key", lambda: "fresh")
+
+    def test_open_breaker_serves_stale_without_calling_downstream(self):
+        cache = FallbackCache()
+        cache.read(CircuitBreaker("warm"), "key", lambda: "old")
+        breaker = open_breaker()
+        fetch = MagicMock(return_value="new")
+        stale_reads = track_stale_reads()
+
+        assert cache.read(breaker, "key", fetch) == "old"
+
+        fetch.assert_not_called()
+        assert len(stale_reads) == 1
+
+    def test_probe_allowed_revalidates_in_background(self):
+        cache = FallbackCache()
+        cache.read(CircuitBreaker("warm"), "key", lambda: "old")
+        breaker = open_breaker(recovery_timeout_sec=0.0)
+
+        assert cache.read(breaker, "key", lambda: "new") == "old"
+
+        wait_until(lambda: cache._get("key")[1] == "new")
+        assert cache._get("key")[1] == "new"
+        assert breaker.state == "closed"
+
+    def test_slow_downstream_serves_stale_and_refreshes_later(self):
+        cache = FallbackCache(revalidate_wait_sec=0.01)
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "key", lambda: "old")
+        release = threading.Event()
+
+        def slow_fetch() -> str:
+            release.wait(1)
+            return "new"
+
+        assert cache.read(breaker, "key", slow_fetch) == "old"
+
+        release.set()
+        wait_until(lambda: cache._get("key")[1] == "new")
+        assert cache._get("key")[1] == "new"
+
+    def test_server_error_serves_stale(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test", failure_threshold=100)
+        cache.read(breaker, "key", lambda: "old")
+
+        assert cache.read(breaker, "key", raise_error(status_error(503))) == "old"
+
+    def test_client_error_is_not_masked(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test", failure_threshold=100)
+        cache.read(breaker, "key", lambda: "old")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            cache.read(breaker, "key", raise_error(status_error(404)))
+
+    def test_too_old_value_is_not_served(self):
+        cache = FallbackCache(max_staleness_sec=0.0)
+        cache.read(CircuitBreaker("warm"), "key", lambda: "old")
+        breaker = open_breaker()
+
+        with pytest.raises(CircuitOpenError):
+            cache.read(breaker, "key", lambda: "new")
+
+    def test_fresh_value_is_served_without_calling_downstream_when_opted_in(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "key", lambda: "old")
+        fetch = MagicMock(return_value="new")
+        stale_reads = track_stale_reads()
+
+        assert cache.read(breaker, "key", fetch, stale_after_sec=60) == "old"
+
+        fetch.assert_not_called()
+        assert stale_reads == []
+
+    def test_healthy_downstream_is_read_live_by_default(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "key", lambda: "old")
+
+        assert cache.read(breaker, "key", lambda: "new") == "new"
+
+    def test_concurrent_stale_reads_share_one_revalidation(self):
+        cache = FallbackCache(revalidate_wait_sec=0.01)
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "key", lambda: "old")
+        release = threading.Event()
+        fetch = MagicMock(side_effect=lambda: release.wait(1) and "new")
+
+        try:
+            assert cache.read(breaker, "key", fetch) == "old"
+            assert cache.read(breaker, "key", fetch) == "old"
+        finally:
+            release.set()
+
+        wait_until(lambda: cache._get("key")[1] == "new")
+        assert fetch.call_count == 1
+
+    def test_full_revalidation_queue_serves_stale_without_queueing(self):
+        cache = FallbackCache(revalidate_wait_sec=0.01, max_revalidations=1)
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "a", lambda: "old a")
+        cache.read(breaker, "b", lambda: "old b")
+        release = threading.Event()
+        fetch_b = MagicMock(return_value="new b")
+
+        try:
+            assert cache.read(breaker, "a", lambda: release.wait(1) and "new a") == "old a"
+            assert cache.read(breaker, "b", fetch_b) == "old b"
+        finally:
+            release.set()
+
+        fetch_b.assert_not_called()
+
+    def test_invalidated_key_is_fetched_again(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test")
+        cache.read(breaker, "key", lambda: "old")
+
+        cache.invalidate("key")
+
+        assert cache.read(breaker, "key", lambda: "new", stale_after_sec=60) == "new"
+
+    def test_fetch_started_before_invalidate_does_not_store_its_result(self):
+        cache = FallbackCache()
+        breaker = CircuitBreaker("test")
+        fetch_started = threading.Event()
+        release = threading.Event()
+
+        def pre_write_fetch() -> str:
+            fetch_started.set()
+            release.wait(1)
+            return "before write"
+
+        reader = threading.Thread(target=cache.read, args=(breaker, "key", pre_write_fetch))
+        reader.start()
+        fetch_started.wait(1)
+        cache.invalidate("key")
+        release.set()
+        reader.join(1)
+
+        assert cache._get("key") is None
+        assert cache.read(breaker, "key", lambda: "after write") == "after write"
+        assert cache._get("key")[1] == "after write"
+
+
+class TestStaleResponseHeaders:
+    def test_stale_response_is_marked(self):
+        flights = AllFlightsResponse(page=1, pageSize=10, totalElements=0, items=[])
+
+        def get_all(page: int, size: int) -> AllFlightsResponse:
+            return fallback_cache._serve_stale(time.monotonic() - 42, flights)
+
+        flight_service = MagicMock()
+        flight_service.get_all.side_effect = get_all
+        app.dependency_overrides[get_flight_service] = lambda: flight_service
+        try:
+            response = TestClient(app).get("/v1/flights")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.headers[STALE_HEADER] == "STALE"
+        assert int(response.headers["Age"]) >= 42
+
+    def test_fresh_response_is_not_marked(self):
+        flight_service = MagicMock()
+        flight_service.get_all.return_value = AllFlightsResponse(page=1, pageSize=10, totalElements=0, items=[])
+        app.dependency_overrides[get_flight_service] = lambda: flight_service
+        try:
+            response = TestClient(app).get("/v1/flights")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert STALE_HEADER not in response.headers
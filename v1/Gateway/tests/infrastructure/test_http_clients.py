@@ -0,0 +1,46 @@
+import pytest
+
+from app.infrastructure import http_clients
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    http_clients.close_clients()
+    yield
+    http_clients.close_clients()
+
+
+class TestHttpClients:
+    def test_get_client_reuses_instance(self):
+        first = http_clients.get_client("flight")
+        second = http_clients.get_client("flight")
+
+        assert first is second
+
+    def test_get_client_per_service(self):
+        flight_client = http_clients.get_client("flight")
+        ticket_client = http_clients.get_client("ticket")
+
+        assert flight_client is not ticket_client
+
+    def test_init_clients_creates_all_services(self):
+        http_clients.init_clients()
+
+        assert set(http_clients._clients) == set(http_clients.SERVICES)
+
+    def test_close_clients(self):
+        client = http_clients.get_client("bonus")
+
+        http_clients.close_clients()
+
+        assert client.is_closed
+        assert http_clients._clients == {}
+
+    def test_get_client_recreates_closed_client(self):
+        client = http_clients.get_client("bonus")
+        client.close()
+
+        new_client = http_clients.get_client("bonus")
+
+        assert new_client is not client
+        assert not new_client.is_closed
@@ -0,0 +1,375 @@
+import json
+import time
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_ticket_service
+from app.presentation.api.main import app
+from app.infrastructure.refund_queue import (
+    QUEUE_KEY,
+    DELAYED_KEY,
+    WORKERS_KEY,
+    DEAD_LETTER_KEY,
+    HEARTBEAT_KEY_PREFIX,
+    PROCESSING_KEY_PREFIX,
+    take_batch,
+    queue_stats,
+    retry_delay,
+    process_batch,
+    start_workers,
+    enqueue_refunds,
+    recover_orphans,
+    get_dead_letters,
+    promote_due_retries,
+    replay_dead_letters,
+)
+from app.infrastructure.circuit_breaker import CircuitOpenError
+
+UID_1 = "6d2b0a3e-5a51-4d1e-9f1e-1b0c3c2d7a01"
+UID_2 = "6d2b0a3e-5a51-4d1e-9f1e-1b0c3c2d7a02"
+JOB = json.dumps({"ticket_uid": UID_1, "username": "testuser"})
+PROCESSING_KEY = PROCESSING_KEY_PREFIX + "worker-1"
+
+
+def make_redis(batch: list[str | None] | None = None, blocking_job: str | None = None) -> MagicMock:
+    """Первый pipeline — пачка LMOVE, второй — подтверждения и повторы."""
+    r = MagicMock()
+    take_pipe = MagicMock()
+    take_pipe.execute = AsyncMock(return_value=batch if batch is not None else [JOB])
+    ack_pipe = MagicMock()
+    ack_pipe.execute = AsyncMock(return_value=[])
+    r.pipeline.side_effect = [take_pipe, ack_pipe]
+    r.blmove = AsyncMock(return_value=blocking_job)
+    r.take_pipe = take_pipe
+    r.ack_pipe = ack_pipe
+    return r
+
+
+def cancel_all(status: str = "CANCELED") -> MagicMock:
+    return MagicMock(side_effect=lambda items: {ticket_uid: status for ticket_uid, _ in items})
+
+
+def dead_letter(r: MagicMock) -> dict:
+    key, payload = r.ack_pipe.lpush.call_args.args
+    assert key == DEAD_LETTER_KEY
+    return json.loads(payload)
+
+
+def run_batch(r: MagicMock, cancel_fn: MagicMock) -> int:
+    return asyncio.run(process_batch(r, "worker-1", cancel_fn, batch_size=3, timeout=1))
+
+
+class TestTakeBatch:
+    def test_drains_up_to_batch_size_in_one_round_trip(self):
+        r = make_redis(batch=[JOB, JOB, None])
+
+        jobs = asyncio.run(take_batch(r, "worker-1", batch_size=3, timeout=1))
+
+        assert jobs == [JOB, JOB]
+        assert r.take_pipe.lmove.call_count == 3
+        r.take_pipe.lmove.assert_called_with(QUEUE_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+        r.take_pipe.execute.assert_awaited_once()
+        r.blmove.assert_not_awaited()
+
+    def test_empty_queue_blocks_for_one_job(self):
+        r = make_redis(batch=[None, None, None], blocking_job=JOB)
+
+        jobs = asyncio.run(take_batch(r, "worker-1", batch_size=3, timeout=1))
+
+        assert jobs == [JOB]
+        r.blmove.assert_awaited_once_with(QUEUE_KEY, PROCESSING_KEY, 1, "RIGHT", "LEFT")
+
+
+class TestProcessBatch:
+    def test_empty_queue_returns_zero(self):
+        r = make_redis(batch=[None, None, None])
+        cancel_fn = MagicMock()
+
+        assert run_batch(r, cancel_fn) == 0
+
+        cancel_fn.assert_not_called()
+
+    def test_success_cancels_batch_in_one_call_and_acks_in_one_transaction(self):
+        r = make_redis(batch=[JOB, JOB, None])
+        cancel_fn = cancel_all()
+
+        assert run_batch(r, cancel_fn) == 2
+
+        cancel_fn.assert_called_once_with([(UID_1, "testuser"), (UID_1, "testuser")])
+        assert r.ack_pipe.lrem.call_count == 2
+        r.ack_pipe.lrem.assert_called_with(PROCESSING_KEY, 1, JOB)
+        r.ack_pipe.zadd.assert_not_called()
+        r.ack_pipe.execute.assert_awaited_once()
+
+    def test_failed_item_is_retried_and_others_acked(self):
+        failed_job = json.dumps({"ticket_uid": UID_2, "username": "testuser"})
+        r = make_redis(batch=[JOB, failed_job])
+
+        run_batch(r, MagicMock(return_value={UID_1: "CANCELED", UID_2: "FAILED"}))
+
+        [payload] = r.ack_pipe.zadd.call_args.args[1]
+        assert json.loads(payload)["ticket_uid"] == UID_2
+        assert r.ack_pipe.lrem.call_count == 2
+
+    def test_not_found_item_goes_to_dead_letter(self):
+        r = make_redis()
+
+        run_batch(r, cancel_all("NOT_FOUND"))
+
+        r.ack_pipe.zadd.assert_not_called()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, JOB)
+        assert dead_letter(r)["reason"] == "ticket not found"
+
+    def test_failure_schedules_delayed_retry(self):
+        r = make_redis()
+
+        run_batch(r, MagicMock(side_effect=RuntimeError("down")))
+
+        assert r.ack_pipe.zadd.call_args.args[0] == DELAYED_KEY
+        [(payload, due)] = r.ack_pipe.zadd.call_args.args[1].items()
+        assert json.loads(payload)["attempts"] == 1
+        assert due > time.time()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, JOB)
+
+    def test_open_breaker_does_not_count_as_attempt(self):
+        r = make_redis()
+
+        run_batch(r, MagicMock(side_effect=CircuitOpenError("ticket")))
+
+        [payload] = r.ack_pipe.zadd.call_args.args[1]
+        assert json.loads(payload)["attempts"] == 0
+
+    def test_max_attempts_moves_job_to_dead_letter(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.refund_queue.MAX_ATTEMPTS", 3)
+        job = json.dumps({"ticket_uid": UID_1, "username": "testuser", "attempts": 2})
+        r = make_redis(batch=[job])
+
+        run_batch(r, MagicMock(side_effect=RuntimeError("down")))
+
+        r.ack_pipe.zadd.assert_not_called()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, job)
+        entry = dead_letter(r)
+        assert (entry["reason"], entry["attempts"]) == ("down", 3)
+
+    def test_client_error_goes_to_dead_letter(self):
+        r = make_redis()
+        request = httpx.Request("DELETE", f"http://ticket/api/v1/tickets/{UID_1}")
+        error = httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request))
+
+        run_batch(r, MagicMock(side_effect=error))
+
+        r.ack_pipe.zadd.assert_not_called()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, JOB)
+        assert dead_letter(r)["attempts"] == 1
+
+    def test_invalid_job_goes_to_dead_letter(self):
+        r = make_redis(batch=["not json"])
+        cancel_fn = MagicMock()
+
+        run_batch(r, cancel_fn)
+
+        cancel_fn.assert_not_called()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, "not json")
+        entry = dead_letter(r)
+        assert entry["payload"] == "not json"
+        assert entry["reason"].startswith("invalid job")
+
+    def test_invalid_items_are_dead_lettered_alone(self):
+        bad_uid = json.dumps({"ticket_uid": "not-a-uuid", "username": "testuser"})
+        long_username = json.dumps({"ticket_uid": UID_2, "username": "u" * 81})
+        r = make_redis(batch=[JOB, bad_uid, long_username])
+        cancel_fn = cancel_all()
+
+        run_batch(r, cancel_fn)
+
+        cancel_fn.assert_called_once_with([(UID_1, "testuser")])
+        dead = [json.loads(call.args[1]) for call in r.ack_pipe.lpush.call_args_list]
+        assert [entry["payload"] for entry in dead] == [bad_uid, long_username]
+        assert all(entry["reason"].startswith("invalid job") for entry in dead)
+        r.ack_pipe.zadd.assert_not_called()
+
+    def test_statuses_are_matched_by_canonical_uid(self):
+        job = json.dumps({"ticket_uid": UID_1.upper().replace("-", ""), "username": "testuser"})
+        r = make_redis(batch=[job])
+        cancel_fn = MagicMock(return_value={UID_1: "CANCELED"})
+
+        run_batch(r, cancel_fn)
+
+        cancel_fn.assert_called_once_with([(UID_1, "testuser")])
+        r.ack_pipe.zadd.assert_not_called()
+        r.ack_pipe.lpush.assert_not_called()
+        r.ack_pipe.lrem.assert_called_once_with(PROCESSING_KEY, 1, job)
+
+
+class TestEnqueue:
+    def test_enqueue_refunds_uses_single_lpush(self, monkeypatch):
+        r = MagicMock()
+        r.lpush = AsyncMock()
+        monkeypatch.setattr("app.infrastructure.refund_queue.get_redis", lambda: r)
+
+        asyncio.run(enqueue_refunds([(UID_1, "alice"), (UID_2, "bob")]))
+
+        key, *payloads = r.lpush.await_args.args
+        assert key == QUEUE_KEY
+        assert [json.loads(payload)["ticket_uid"] for payload in payloads] == [UID_1, UID_2]
+
+    def test_enqueue_canonicalizes_ticket_uid(self, monkeypatch):
+        r = MagicMock()
+        r.lpush = AsyncMock()
+        monkeypatch.setattr("app.infrastructure.refund_queue.get_redis", lambda: r)
+
+        asyncio.run(enqueue_refunds([(UID_1.upper(), "alice")]))
+
+        _, payload = r.lpush.await_args.args
+        assert json.loads(payload)["ticket_uid"] == UID_1
+
+    def test_enqueue_rejects_invalid_job(self, monkeypatch):
+        r = MagicMock()
+        r.lpush = AsyncMock()
+        monkeypatch.setattr("app.infrastructure.refund_queue.get_redis", lambda: r)
+
+        with pytest.raises(ValueError, match="ticket_uid"):
+            asyncio.run(enqueue_refunds([(UID_1, "alice"), ("not-a-uuid", "bob")]))
+
+        r.lpush.assert_not_awaited()
+
+    def test_cancel_route_rejects_invalid_ticket_uid_without_enqueueing(self, monkeypatch):
+        enqueue = AsyncMock()
+        ticket_service = MagicMock()
+        monkeypatch.setattr("app.presentation.api.routers.v1.tickets.enqueue_refund", enqueue)
+        app.dependency_overrides[get_ticket_service] = lambda: ticket_service
+        try:
+            response = TestClient(app).delete("/v1/tickets/not-a-uuid", headers={"X-User-Name": "testuser"})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 400
+        ticket_service.cancel_ticket.assert_not_called()
+        enqueue.assert_not_awaited()
+
+
+class TestRecoverOrphans:
+    def test_moves_jobs_of_dead_workers_back_to_queue(self):
+        r = MagicMock()
+        r.smembers = AsyncMock(return_value={"alive", "dead"})
+        r.exists = AsyncMock(side_effect=lambda key: key == HEARTBEAT_KEY_PREFIX + "alive")
+        r.lmove = AsyncMock(side_effect=[JOB, JOB, None])
+        r.srem = AsyncMock()
+
+        assert asyncio.run(recover_orphans(r)) == 2
+
+        r.lmove.assert_awaited_with(PROCESSING_KEY_PREFIX + "dead", QUEUE_KEY, "RIGHT", "RIGHT")
+        r.srem.assert_awaited_once_with(WORKERS_KEY, "dead")
+
+    def test_jobs_left_by_crashed_process_are_recovered_after_restart(self, monkeypatch):
+        """Тот же hostname и PID после рестарта не должны давать тот же id воркера."""
+        started: list[str] = []
+
+        async def fake_run_worker(worker_id, cancel_fn=None):
+            started.append(worker_id)
+
+        async def start_once():
+            await asyncio.gather(*start_workers(count=1))
+
+        monkeypatch.setattr("app.infrastructure.refund_queue.run_worker", fake_run_worker)
+        asyncio.run(start_once())
+        asyncio.run(start_once())
+        crashed_id, restarted_id = started
+        assert crashed_id != restarted_id
+
+        lists = {PROCESSING_KEY_PREFIX + crashed_id: [JOB], QUEUE_KEY: []}
+
+        async def lmove(source, destination, *_):
+            if not lists.get(source):
+                return None
+            raw = lists[source].pop()
+            lists[destination].append(raw)
+            return raw
+
+        r = MagicMock()
+        r.smembers = AsyncMock(return_value={crashed_id, restarted_id})
+        # Рестартовавший процесс уже шлёт heartbeat, у упавшего он истёк
+        r.exists = AsyncMock(side_effect=lambda key: key == HEARTBEAT_KEY_PREFIX + restarted_id)
+        r.lmove = AsyncMock(side_effect=lmove)
+        r.srem = AsyncMock()
+
+        assert asyncio.run(recover_orphans(r)) == 1
+        assert lists[QUEUE_KEY] == [JOB]
+        r.srem.assert_awaited_once_with(WORKERS_KEY, crashed_id)
+
+
+class TestDelayedRetries:
+    def test_retry_delay_grows_exponentially_with_jitter(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.refund_queue.RETRY_BASE_DELAY_SEC", 1.0)
+        monkeypatch.setattr("app.infrastructure.refund_queue.RETRY_MAX_DELAY_SEC", 8.0)
+
+        assert 0.5 <= retry_delay(1) <= 1.0
+        assert 2.0 <= retry_delay(3) <= 4.0
+        assert 4.0 <= retry_delay(10) <= 8.0
+
+    def test_promote_due_retries_returns_time_to_next(self):
+        r = MagicMock()
+        r.eval = AsyncMock(return_value=[2, str(time.time() + 30)])
+
+        next_retry_in = asyncio.run(promote_due_retries(r))
+
+        assert r.eval.await_args.args[2:4] == (DELAYED_KEY, QUEUE_KEY)
+        assert 29 < next_retry_in <= 30
+
+    def test_promote_due_retries_without_pending(self):
+        r = MagicMock()
+        r.eval = AsyncMock(return_value=[0])
+
+        assert asyncio.run(promote_due_retries(r)) is None
+
+
+class TestDeadLetters:
+    def test_queue_stats_reports_depth_and_oldest_age(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.refund_queue.refund_spool", MagicMock(has_pending=lambda: False))
+        oldest = json.dumps({"ticket_uid": UID_1, "username": "testuser", "enqueued_at": time.time() - 60})
+        r = MagicMock()
+        first, second = MagicMock(), MagicMock()
+        first.execute = AsyncMock(return_value=[7, oldest, 2, 3, {"worker-1", "worker-2"}])
+        second.execute = AsyncMock(return_value=[1, 4])
+        r.pipeline.side_effect = [first, second]
+
+        stats = asyncio.run(queue_stats(r))
+
+        assert (stats.depth, stats.processing, stats.delayed, stats.dead_letters, stats.workers) == (7, 5, 2, 3, 2)
+        assert 59 < stats.oldest_job_age_sec < 62
+        first.lindex.assert_called_once_with(QUEUE_KEY, -1)
+
+    def test_queue_stats_for_empty_queue(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.refund_queue.refund_spool", MagicMock(has_pending=lambda: True))
+        r = MagicMock()
+        r.pipeline.return_value.execute = AsyncMock(return_value=[0, None, 0, 0, set()])
+
+        stats = asyncio.run(queue_stats(r))
+
+        assert stats.oldest_job_age_sec is None
+        assert stats.spool_pending
+
+    def test_get_dead_letters_parses_entries(self):
+        entry = {"payload": JOB, "reason": "ticket not found", "attempts": 0, "enqueued_at": None, "failed_at": 1.0}
+        r = MagicMock()
+        r.pipeline.return_value.execute = AsyncMock(return_value=[5, [json.dumps(entry)]])
+
+        total, [item] = asyncio.run(get_dead_letters(r, offset=2, limit=1))
+
+        assert total == 5
+        assert item.ticket_uid == UID_1
+        r.pipeline.return_value.lrange.assert_called_once_with(DEAD_LETTER_KEY, 2, 2)
+
+    def test_replay_moves_oldest_entries_to_queue(self):
+        r = MagicMock()
+        r.eval = AsyncMock(return_value=3)
+
+        assert asyncio.run(replay_dead_letters(r, limit=10)) == 3
+
+        assert r.eval.await_args.args[2:5] == (DEAD_LETTER_KEY, QUEUE_KEY, 10)
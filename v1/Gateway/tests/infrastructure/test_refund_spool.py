@@ -0,0 +1,102 @@
+import json
+import asyncio
+import threading
+import contextlib
+
+from unittest.mock import AsyncMock, MagicMock
+
+import redis
+
+from app.infrastructure.refund_queue import QUEUE_KEY, replay_spool, enqueue_refunds
+from app.infrastructure.refund_spool import ACTIVE_FILE, RefundSpool
+
+UID_1 = "6d2b0a3e-5a51-4d1e-9f1e-1b0c3c2d7a01"
+JOB = json.dumps({"ticket_uid": UID_1, "username": "testuser"})
+
+
+class TestRefundSpool:
+    def test_append_writes_one_line_per_job(self, tmp_path):
+        spool = RefundSpool(str(tmp_path))
+
+        spool.append([JOB, JOB])
+        spool.append([JOB])
+
+        assert (tmp_path / ACTIVE_FILE).read_text().splitlines() == [JOB, JOB, JOB]
+        assert spool.has_pending()
+        spool.close()
+
+    def test_concurrent_appends_share_fsync(self, tmp_path, monkeypatch):
+        spool = RefundSpool(str(tmp_path))
+        fsync = MagicMock()
+        monkeypatch.setattr("app.infrastructure.refund_spool.os.fsync", fsync)
+
+        threads = [threading.Thread(target=spool.append, args=([JOB],)) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len((tmp_path / ACTIVE_FILE).read_text().splitlines()) == 50
+        assert 1 <= fsync.call_count <= 50
+        spool.close()
+
+    def test_read_skips_torn_tail(self, tmp_path):
+        path = tmp_path / "refunds.replay.1"
+        path.write_text(f"{JOB}\n{JOB[:10]}")
+
+        assert RefundSpool.read(path) == [JOB]
+
+    def test_rotate_moves_active_file_to_replay(self, tmp_path):
+        spool = RefundSpool(str(tmp_path))
+        spool.append([JOB])
+
+        spool.rotate()
+        spool.append([JOB])
+
+        [replay_file] = spool.replay_files()
+        assert RefundSpool.read(replay_file) == [JOB]
+        assert (tmp_path / ACTIVE_FILE).exists()
+        spool.close()
+
+
+class TestSpoolFallback:
+    def test_enqueue_spools_jobs_when_redis_is_down(self, tmp_path, monkeypatch):
+        spool = RefundSpool(str(tmp_path))
+        r = MagicMock()
+        r.lpush = AsyncMock(side_effect=redis.ConnectionError("down"))
+        monkeypatch.setattr("app.infrastructure.refund_queue.get_redis", lambda: r)
+        monkeypatch.setattr("app.infrastructure.refund_queue.refund_spool", spool)
+
+        asyncio.run(enqueue_refunds([(UID_1, "testuser")]))
+
+        [line] = (tmp_path / ACTIVE_FILE).read_text().splitlines()
+        assert json.loads(line)["ticket_uid"] == UID_1
+        spool.close()
+
+    def test_replay_pushes_spooled_jobs_in_chunks_and_removes_file(self, tmp_path, monkeypatch):
+        spool = RefundSpool(str(tmp_path))
+        spool.append([JOB] * 5)
+        monkeypatch.setattr("app.infrastructure.refund_queue.refund_spool", spool)
+        r = MagicMock()
+        pipe = r.pipeline.return_value
+        pipe.execute = AsyncMock(return_value=[])
+
+        assert asyncio.run(replay_spool(r, chunk_size=2)) == 5
+
+        assert [len(call.args) - 1 for call in pipe.lpush.call_args_list] == [2, 2, 1]
+        assert pipe.lpush.call_args.args[0] == QUEUE_KEY
+        pipe.execute.assert_awaited_once()
+        assert spool.replay_files() == []
+        assert not spool.has_pending()
+
+    def test_failed_replay_keeps_file(self, tmp_path, monkeypatch):
+        spool = RefundSpool(str(tmp_path))
+        spool.append([JOB])
+        monkeypatch.setattr("app.infrastructure.refund_queue.refund_spool", spool)
+        r = MagicMock()
+        r.pipeline.return_value.execute = AsyncMock(side_effect=redis.ConnectionError("down"))
+
+        with contextlib.suppress(redis.ConnectionError):
+            asyncio.run(replay_spool(r))
+
+        assert spool.has_pending()
@@ -1,6 +1,12 @@
 from datetime import datetime
 
-from app.presentation.api.schemas import MeResponse, HistoryItem, PrivilegeInfoResponse
+from app.presentation.api.schemas import (
+    MeResponse,
+    HistoryItem,
+    PrivilegeInfoResponse,
+    BalanceOperationRequest,
+    BalanceOperationResponse,
+)
 
 
 class TestBonusService:
@@ -91,3 +97,29 @@ class TestBonusService:
             username, ticket_uid, balance_diff, operation_type
         )
         assert result is None
+
+    def test_apply_balance_operation_success(self, bonus_service, mock_bonus_connector):
+        operation = BalanceOperationRequest(
+            ticketUid="123e4567-e89b-12d3-a456-426614174000",
+            balanceDiff=150,
+            operationType="FILL_IN_BALANCE",
+            idempotencyKey="123e4567-e89b-12d3-a456-426614174000:purchase",
+        )
+        expected = BalanceOperationResponse(balance=250, status="BRONZE", applied=True)
+        mock_bonus_connector.apply_balance_operation.return_value = expected
+
+        result = bonus_service.apply_balance_operation("test_user", operation)
+
+        mock_bonus_connector.apply_balance_operation.assert_called_once_with("test_user", operation)
+        assert result == expected
+
+    def test_get_ticket_history_success(self, bonus_service, mock_bonus_connector):
+        expected = MeResponse(balance=150, status="BRONZE", history=[])
+        mock_bonus_connector.get_ticket_history.return_value = expected
+
+        result = bonus_service.get_ticket_history("test_user", "123e4567-e89b-12d3-a456-426614174000")
+
+        mock_bonus_connector.get_ticket_history.assert_called_once_with(
+            "test_user", "123e4567-e89b-12d3-a456-426614174000"
+        )
+        assert result == expected
@@ -1,3 +1,6 @@
+import pytest
+
+from app.services.exceptions import FlightNumberNotFoundError
 from app.presentation.api.schemas import FlightResponse, AllFlightsResponse
 
 
@@ -52,3 +55,26 @@ class TestFlightService:
         assert isinstance(result, AllFlightsResponse)
         assert result.totalElements == 0
         assert len(result.items) == 0
+
+    def test_get_by_number_success(self, flight_service, mock_flight_connector):
+        expected_flight = FlightResponse(
+            flightNumber="AFL031",
+            fromAirport="Санкт-Петербург Пулково",
+            toAirport="Москва Шереметьево",
+            date="2021-10-08 20:00",
+            price=1500,
+        )
+        mock_flight_connector.get_flight.return_value = expected_flight
+
+        result = flight_service.get_by_number("AFL031")
+
+        mock_flight_connector.get_flight.assert_called_once_with("AFL031")
+        assert result == expected_flight
+
+    def test_get_by_number_not_found(self, flight_service, mock_flight_connector):
+        mock_flight_connector.get_flight.return_value = None
+
+        with pytest.raises(FlightNumberNotFoundError) as exc_info:
+            flight_service.get_by_number("INVALID")
+
+        assert exc_info.value.flight_number == "INVALID"
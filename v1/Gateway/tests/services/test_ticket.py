@@ -1,5 +1,9 @@
+import threading
+
 from datetime import datetime
 
+import pytest
+
 from app.presentation.api.schemas import (
     MeResponse,
     HistoryItem,
@@ -9,6 +13,7 @@ from app.presentation.api.schemas import (
     TicketCreateRequest,
     TicketPurchaseResponse,
 )
+from app.infrastructure.circuit_breaker import CircuitOpenError
 
 
 class TestTicketService:
@@ -138,3 +143,45 @@ class TestTicketService:
         assert len(result.tickets) == 1
         assert result.privilege.balance == 150
         assert result.privilege.status == "BRONZE"
+
+    def test_get_user_info_bonus_unavailable(
+        self, ticket_service, mock_ticket_connector, bonus_service, mock_bonus_connector
+    ):
+        username = "test_user"
+        mock_ticket_connector.get_user_tickets.return_value = []
+        mock_bonus_connector.get_me.side_effect = CircuitOpenError("bonus")
+
+        result = ticket_service.get_user_info(username, bonus_service)
+
+        assert result.tickets == []
+        assert result.privilege is None
+
+    def test_get_user_info_ticket_unavailable(
+        self, ticket_service, mock_ticket_connector, bonus_service, mock_bonus_connector
+    ):
+        username = "test_user"
+        mock_ticket_connector.get_user_tickets.side_effect = CircuitOpenError("ticket")
+        mock_bonus_connector.get_me.return_value = MeResponse(balance=0, status="BRONZE", history=[])
+
+        with pytest.raises(CircuitOpenError):
+            ticket_service.get_user_info(username, bonus_service)
+
+    def test_get_user_info_runs_branches_concurrently(
+        self, ticket_service, mock_ticket_connector, bonus_service, mock_bonus_connector
+    ):
+        barrier = threading.Barrier(2, timeout=1)
+
+        def get_user_tickets(username):
+            barrier.wait()
+            return []
+
+        def get_me(username):
+            barrier.wait()
+            return MeResponse(balance=150, status="BRONZE", history=[])
+
+        mock_ticket_connector.get_user_tickets.side_effect = get_user_tickets
+        mock_bonus_connector.get_me.side_effect = get_me
+
+        result = ticket_service.get_user_info("test_user", bonus_service)
+
+        assert result.privilege.balance == 150
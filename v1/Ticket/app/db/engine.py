@@ -1,5 +1,6 @@
 import os
 
+from typing import Any
 from functools import lru_cache
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
@@ -13,6 +14,16 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.logger import persons_logger
+from app.db.pool import (
+    DB_PGBOUNCER,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SEC,
+    InstrumentedPool,
+    db_admission,
+    pgbouncer_connect_args,
+)
+from app.db.query_stats import query_timings
 
 load_dotenv(override=True)
 
@@ -21,6 +32,8 @@ DB_USER = os.getenv("DB_USER")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
+# Логирование каждого SQL синхронно и дорого; время запросов собирает query_timings
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
 
 
 def get_database_url() -> str:
@@ -38,14 +51,20 @@ def get_database_url() -> str:
 @lru_cache(maxsize=1)
 def get_engine() -> AsyncEngine:
     database_url = get_database_url()
+    connect_args: dict[str, Any] = {"timeout": 5}
+    if DB_PGBOUNCER:
+        connect_args |= pgbouncer_connect_args()
     engine = create_async_engine(
         database_url,
-        echo=True,
+        echo=DB_ECHO,
+        poolclass=InstrumentedPool,
         pool_pre_ping=True,
-        pool_size=1000,
-        max_overflow=1000,
-        connect_args={"timeout": 5},
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SEC,
+        connect_args=connect_args,
     )
+    query_timings.install(engine.sync_engine)
     return engine
 
 
@@ -61,7 +80,7 @@ def get_sessionmaker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     engine = get_engine()
     sessionmaker = get_sessionmaker(engine)
-    async with sessionmaker() as session:
+    async with db_admission.admit(), sessionmaker() as session:
         yield session
 
 
@@ -69,18 +88,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 async def lazy_db_session() -> AsyncGenerator[AsyncSession, None]:
     engine = get_engine()
     sessionmaker = get_sessionmaker(engine)
-    async with sessionmaker() as session:
+    async with db_admission.admit(), sessionmaker() as session:
         yield session
 
 
 async def init_db() -> None:
-    import app.db.models  # noqa: F401
-
-    from app.db.base import Base
+    """Доводит схему до последней версии; уже применённые миграции не повторяются."""
+    from app.db.migrate import migrate
+    from app.db.migrations import MIGRATIONS
 
-    engine = get_engine()
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await migrate(get_engine(), MIGRATIONS)
 
 
 async def seed_database() -> None:
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
+
+from app.logger import persons_logger
+
+SCHEMA_VERSION_TABLE = "schema_version"
+# Ключ pg_advisory_lock: реплики, стартующие одновременно, мигрируют по очереди
+MIGRATION_LOCK_ID = 7_210_023
+
+
+@dataclass(frozen=True)
+class ConcurrentIndex:
+    """Индекс, который строится CONCURRENTLY — без блокировки записи в живую таблицу."""
+
+    name: str
+    table: str
+    columns: str
+    unique: bool = False
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Шаг схемы: upgrade и statements — одной транзакцией, затем indexes вне транзакции.
+
+    Шаги с indexes должны быть идемпотентны: сбой до записи версии повторит их целиком.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None] | None = None
+    statements: tuple[str, ...] = ()
+    indexes: tuple[ConcurrentIndex, ...] = ()
+
+
+async def migrate(engine: AsyncEngine, migrations: Sequence[Migration]) -> int:
+    """Применяет ещё не применённые миграции и возвращает итоговую версию схемы."""
+    async with engine.connect() as lock_conn:
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        await lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            await lock_conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+                    "version INTEGER PRIMARY KEY, "
+                    "description VARCHAR(200) NOT NULL, "
+                    "applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now())"
+                )
+            )
+            result = await lock_conn.execute(text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}"))
+            current = result.scalar() or 0
+
+            for migration in sorted(migrations, key=lambda m: m.version):
+                if migration.version <= current:
+                    continue
+                persons_logger.info(f"Миграция схемы {migration.version}: {migration.description}")
+                await _apply(engine, lock_conn, migration)
+                current = migration.version
+        finally:
+            await lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    persons_logger.info(f"Версия схемы БД: {current}")
+    return current
+
+
+async def _apply(engine: AsyncEngine, autocommit_conn: AsyncConnection, migration: Migration) -> None:
+    async with engine.begin() as conn:
+        if migration.upgrade is not None:
+            await conn.run_sync(migration.upgrade)
+        for statement in migration.statements:
+            await conn.execute(text(statement))
+        if not migration.indexes:
+            await _record_version(conn, migration)
+            return
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнить внутри транзакции
+    for index in migration.indexes:
+        await _create_index_concurrently(autocommit_conn, index)
+    async with engine.begin() as conn:
+        await _record_version(conn, migration)
+
+
+async def _create_index_concurrently(conn: AsyncConnection, index: ConcurrentIndex) -> None:
+    result = await conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND c.relkind = 'i'"
+        ),
+        {"name": index.name},
+    )
+    if result.scalar_one_or_none() is False:
+        # Прерванная сборка оставляет невалидный индекс, а IF NOT EXISTS его не перестроит
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+    unique = "UNIQUE " if index.unique else ""
+    await conn.execute(
+        text(f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {index.name} ON {index.table} ({index.columns})")
+    )
+
+
+async def _record_version(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(
+        text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (:version, :description)"),
+        {"version": migration.version, "description": migration.description},
+    )
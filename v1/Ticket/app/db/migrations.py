@@ -0,0 +1,21 @@
+from sqlalchemy import Connection
+
+from app.db.migrate import Migration, ConcurrentIndex
+
+
+def _create_tables(conn: Connection) -> None:
+    import app.db.models  # noqa: F401
+
+    from app.db.base import Base
+
+    Base.metadata.create_all(conn)
+
+
+MIGRATIONS = (
+    Migration(1, "Исходная схема", upgrade=_create_tables),
+    Migration(
+        2,
+        "Индекс билетов пользователя для фильтра и keyset-пагинации",
+        indexes=(ConcurrentIndex("ix_ticket_username_id", "ticket", "username, id"),),
+    ),
+)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, String, Integer, CheckConstraint
+from sqlalchemy import Index, Column, String, Integer, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.base import Base
@@ -8,7 +8,11 @@ from app.db.base import Base
 
 class TicketDB(Base):
     __tablename__ = "ticket"
-    __table_args__ = (CheckConstraint("status IN ('PAID', 'CANCELED')", name="check_status"),)
+    __table_args__ = (
+        CheckConstraint("status IN ('PAID', 'CANCELED')", name="check_status"),
+        # Билеты пользователя и keyset-пагинация по (username, id)
+        Index("ix_ticket_username_id", "username", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     ticket_uid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid.uuid4)
@@ -0,0 +1,145 @@
+import os
+import time
+import uuid
+import asyncio
+
+from typing import Any
+from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import ConnectionPoolEntry, AsyncAdaptedQueuePool
+
+from app.services.exceptions import DatabaseOverloadedError
+
+load_dotenv(override=True)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SEC = float(os.getenv("DB_POOL_TIMEOUT_SEC", "5"))
+# Сессий одновременно — не больше, чем соединений в пуле: остальные ждут в очереди допуска
+DB_ADMISSION_LIMIT = int(os.getenv("DB_ADMISSION_LIMIT", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+DB_ADMISSION_QUEUE_SIZE = int(os.getenv("DB_ADMISSION_QUEUE_SIZE", "100"))
+DB_ADMISSION_TIMEOUT_SEC = float(os.getenv("DB_ADMISSION_TIMEOUT_SEC", "2"))
+# PgBouncer в режиме transaction не сохраняет подготовленные выражения между транзакциями
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+
+def pgbouncer_connect_args() -> dict[str, Any]:
+    """Аргументы asyncpg без кэша подготовленных выражений и с уникальными именами выражений."""
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+class PoolMetrics:
+    """Ожидание соединения из пула: сколько раз, сколько в сумме и максимум, сколько таймаутов."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def observe_checkout(self, wait_sec: float) -> None:
+        self.checkouts += 1
+        self.wait_total_sec += wait_sec
+        self.wait_max_sec = max(self.wait_max_sec, wait_sec)
+
+    def observe_timeout(self) -> None:
+        self.timeouts += 1
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_sec = 0.0
+        self.wait_max_sec = 0.0
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, замеряющий ожидание свободного соединения."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.observe_timeout()
+            raise
+        pool_metrics.observe_checkout(time.perf_counter() - started)
+        return connection
+
+
+class AdmissionGate:
+    """Ограничивает число одновременных сессий БД; переполненная очередь сразу отказывает."""
+
+    def __init__(
+        self,
+        limit: int = DB_ADMISSION_LIMIT,
+        queue_size: int = DB_ADMISSION_QUEUE_SIZE,
+        timeout: float = DB_ADMISSION_TIMEOUT_SEC,
+    ):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncGenerator[None, None]:
+        if not self._semaphore.locked():
+            # Свободный слот берётся без переключения задач
+            await self._semaphore.acquire()
+        else:
+            await self._wait_for_slot()
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    async def _wait_for_slot(self) -> None:
+        if self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise DatabaseOverloadedError()
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except TimeoutError:
+            self.rejected += 1
+            raise DatabaseOverloadedError() from None
+        finally:
+            self.waiting -= 1
+
+
+db_admission = AdmissionGate()
+
+
+def pool_stats(pool: Any) -> dict[str, Any]:
+    """Снимок пула и очереди допуска; схему ответа строит роутер."""
+    checkouts = pool_metrics.checkouts
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # У QueuePool overflow отрицателен, пока не открыты все pool_size соединений
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "checkout_timeouts": pool_metrics.timeouts,
+        "checkout_wait_mean_ms": round(pool_metrics.wait_total_sec / checkouts * 1000, 3) if checkouts else 0.0,
+        "checkout_wait_max_ms": round(pool_metrics.wait_max_sec * 1000, 3),
+        "admission_limit": db_admission.limit,
+        "admission_active": db_admission.active,
+        "admission_waiting": db_admission.waiting,
+        "admission_queue_size": db_admission.queue_size,
+        "admission_rejected": db_admission.rejected,
+        "pgbouncer": DB_PGBOUNCER,
+    }
@@ -1,3 +1,6 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.services import TicketService
 from app.db.engine import get_db
 from app.infrastructure.repositories import TicketRepository
@@ -5,10 +8,10 @@ from app.infrastructure.connectors.bonus import BonusConnector
 from app.infrastructure.connectors.gateway import GatewayConnector
 
 
-async def get_ticket_service() -> TicketService:  # type: ignore
-    async for session in get_db():
-        ticket_repository = TicketRepository(session)
-        gateway_connector = GatewayConnector()
-        bonus_connector = BonusConnector()
+# Сессия — зависимость запроса: слот допуска к БД и сессия держатся до конца обработки
+async def get_ticket_service(session: AsyncSession = Depends(get_db)) -> TicketService:
+    ticket_repository = TicketRepository(session)
+    gateway_connector = GatewayConnector()
+    bonus_connector = BonusConnector()
 
-        return TicketService(ticket_repository, gateway_connector, bonus_connector)
+    return TicketService(ticket_repository, gateway_connector, bonus_connector)
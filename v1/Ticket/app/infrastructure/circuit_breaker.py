@@ -0,0 +1,237 @@
+import os
+import time
+import asyncio
+
+from typing import TypeVar
+from collections import deque
+from collections.abc import Callable, Awaitable
+
+import httpx
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+T = TypeVar("T")
+
+# Те же настройки и значения по умолчанию, что у предохранителя Gateway.
+# Столько ошибок подряд открывают цепь сразу, каким бы ни было окно
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "3"))
+# Минимум вызовов в окне, после которого оцениваются доли ошибок и медленных вызовов
+MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+RECOVERY_TIMEOUT_SEC = float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", "5"))
+WINDOW_TYPE = os.getenv("CIRCUIT_BREAKER_WINDOW_TYPE", "count")
+WINDOW_SIZE = int(os.getenv("CIRCUIT_BREAKER_WINDOW_SIZE", "20"))
+FAILURE_RATE_THRESHOLD = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD", "50"))
+SLOW_CALL_RATE_THRESHOLD = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE_THRESHOLD", "100"))
+SLOW_CALL_DURATION_SEC = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_DURATION", "3"))
+HALF_OPEN_MAX_CALLS = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, service_name: str) -> None:
+        self.service_name = service_name
+        super().__init__(f"Circuit open for service: {service_name}")
+
+
+def is_failure(error: Exception) -> bool:
+    """Сбой сервиса — сетевая ошибка или 5xx; ответ 4xx означает, что сервис жив."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class CountWindow:
+    """Последние size вызовов; агрегаты обновляются за O(1)."""
+
+    def __init__(self, size: int) -> None:
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=size)
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        if len(self._outcomes) == self._outcomes.maxlen:
+            old_failed, old_slow = self._outcomes[0]
+            self.calls -= 1
+            self.failures -= old_failed
+            self.slow_calls -= old_slow
+        self._outcomes.append((failed, slow))
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+    def totals(self, now: float) -> tuple[int, int, int]:
+        return self.calls, self.failures, self.slow_calls
+
+
+class TimeWindow:
+    """Вызовы за последние size секунд в посекундных корзинах."""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._buckets = [[0, 0, 0, 0] for _ in range(size)]  # секунда, вызовы, ошибки, медленные
+        self._head = 0
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    def _advance(self, now: float) -> list[int]:
+        second = int(now)
+        if second - self._head >= self._size:
+            for bucket in self._buckets:
+                bucket[:] = [0, 0, 0, 0]
+            self.calls = self.failures = self.slow_calls = 0
+            self._head = second - self._size
+        for expired in range(self._head + 1, second + 1):
+            bucket = self._buckets[expired % self._size]
+            self.calls -= bucket[1]
+            self.failures -= bucket[2]
+            self.slow_calls -= bucket[3]
+            bucket[:] = [expired, 0, 0, 0]
+        self._head = max(self._head, second)
+        return self._buckets[second % self._size]
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        bucket = self._advance(now)
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+    def totals(self, now: float) -> tuple[int, int, int]:
+        self._advance(now)
+        return self.calls, self.failures, self.slow_calls
+
+
+class CircuitBreaker:
+    """Предохранитель для async-вызовов: failure_threshold ошибок подряд или доли ошибок и медленных в окне.
+
+    Семантика как у предохранителя Gateway, но состояние меняется только из event loop,
+    поэтому блокировки не нужны. Ошибкой считается только сбой сервиса (см. is_failure),
+    отменённый вызов не учитывается вовсе.
+    """
+
+    _instances: dict[str, "CircuitBreaker"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_timeout_sec: float = RECOVERY_TIMEOUT_SEC,
+        window_type: str = WINDOW_TYPE,
+        window_size: int = WINDOW_SIZE,
+        minimum_calls: int = MIN_CALLS,
+        failure_rate_threshold: float = FAILURE_RATE_THRESHOLD,
+        slow_call_rate_threshold: float = SLOW_CALL_RATE_THRESHOLD,
+        slow_call_duration_sec: float = SLOW_CALL_DURATION_SEC,
+        half_open_max_calls: int = HALF_OPEN_MAX_CALLS,
+    ) -> None:
+        if window_type not in ("count", "time"):
+            raise ValueError(f"Unknown circuit breaker window type: {window_type}")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_sec = recovery_timeout_sec
+        self.window_type = window_type
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration_sec = slow_call_duration_sec
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._generation = 0
+        self._opened_at = 0.0
+        self._window = self._new_window()
+        self._consecutive_failures = 0
+        self._probes_started = 0
+        self._probe_window = CountWindow(half_open_max_calls)
+
+    @classmethod
+    def get(cls, name: str) -> "CircuitBreaker":
+        if name not in cls._instances:
+            cls._instances[name] = cls(name)
+        return cls._instances[name]
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        generation = self._acquire(started)
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._release_probe(generation)
+            raise
+        except Exception as e:
+            self._record(generation, is_failure(e), started, time.monotonic())
+            raise
+        self._record(generation, False, started, time.monotonic())
+        return result
+
+    def _new_window(self) -> CountWindow | TimeWindow:
+        if self.window_type == "time":
+            return TimeWindow(self.window_size)
+        return CountWindow(self.window_size)
+
+    def _acquire(self, now: float) -> int:
+        if self.state == OPEN:
+            if now - self._opened_at < self.recovery_timeout_sec:
+                raise CircuitOpenError(self.name)
+            self._transition(HALF_OPEN, now)
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.half_open_max_calls:
+                raise CircuitOpenError(self.name)
+            self._probes_started += 1
+        return self._generation
+
+    def _release_probe(self, generation: int) -> None:
+        # Иначе отменённая проба навсегда занимает слот и цепь застревает в half-open
+        if generation == self._generation and self.state == HALF_OPEN:
+            self._probes_started -= 1
+
+    def _record(self, generation: int, failed: bool, started: float, now: float) -> None:
+        # Вызов, начатый до смены состояния, не влияет на новое окно
+        if generation != self._generation:
+            return
+        slow = now - started >= self.slow_call_duration_sec
+        if self.state == HALF_OPEN:
+            self._probe_window.record(failed, slow, now)
+            if self._probe_window.calls >= self.half_open_max_calls:
+                self._transition(OPEN if self._exceeds_thresholds(self._probe_window, now) else CLOSED, now)
+            return
+        self._window.record(failed, slow, now)
+        self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+        if self._consecutive_failures >= self.failure_threshold:
+            self._transition(OPEN, now)
+            return
+        # Быстрый успешный вызов не повышает доли, пока окно уже набрало минимум вызовов
+        if not (failed or slow or self._window.calls == self.minimum_calls):
+            return
+        if self._window.calls >= self.minimum_calls and self._exceeds_thresholds(self._window, now):
+            self._transition(OPEN, now)
+
+    def _exceeds_thresholds(self, window: CountWindow | TimeWindow, now: float) -> bool:
+        calls, failures, slow_calls = window.totals(now)
+        if calls == 0:
+            return False
+        return (
+            failures * 100 / calls >= self.failure_rate_threshold
+            or slow_calls * 100 / calls >= self.slow_call_rate_threshold
+        )
+
+    def _transition(self, state: str, now: float) -> None:
+        self.state = state
+        self._generation += 1
+        self._consecutive_failures = 0
+        if state == OPEN:
+            self._opened_at = now
+        elif state == HALF_OPEN:
+            self._probes_started = 0
+            self._probe_window = CountWindow(self.half_open_max_calls)
+        else:
+            self._window = self._new_window()
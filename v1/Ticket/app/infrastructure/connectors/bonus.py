@@ -8,29 +8,38 @@ import httpx
 
 from dotenv import load_dotenv
 
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.circuit_breaker import CircuitBreaker
+
 load_dotenv(override=True)
 gateway_service_url = os.getenv("GATEWAY_SERVICE_URL", "")
+# Bonus service отвечает по тем же путям /api/v1/..., что и Gateway; пустое значение — ходить через Gateway
+bonus_service_url = os.getenv("BONUS_SERVICE_URL", "") or gateway_service_url
 
 
 class BonusConnector:
-    async def get_user_balance(self, username: str) -> int:
-        async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-            response = await client.get(
-                urljoin(gateway_service_url, "/api/v1/me"),
+    """Запросы к Bonus service: напрямую при заданном BONUS_SERVICE_URL, иначе через Gateway."""
+
+    @staticmethod
+    async def _request(method: str, path: str, username: str, **kwargs: Any) -> httpx.Response:
+        async def send() -> httpx.Response:
+            response = await get_client("bonus").request(
+                method,
+                urljoin(bonus_service_url, path),
                 headers={"X-User-Name": username},
+                **kwargs,
             )
             response.raise_for_status()
-            response_json = response.json()
-            return response_json.get("balance", 0) or 0
+            return response
+
+        return await CircuitBreaker.get("bonus").call(send)
+
+    async def get_user_balance(self, username: str) -> int:
+        response = await self._request("GET", "/api/v1/me", username)
+        return response.json().get("balance", 0) or 0
 
     async def change_user_balance(self, username: str, balance_diff: int) -> None:
-        async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-            response = await client.put(
-                urljoin(gateway_service_url, "/api/v1/balance"),
-                headers={"X-User-Name": username},
-                json={"balance": balance_diff},
-            )
-            response.raise_for_status()
+        await self._request("PUT", "/api/v1/balance", username, json={"balance": balance_diff})
 
     async def create_history_record(
         self,
@@ -39,24 +48,39 @@ class BonusConnector:
         balance_diff: int,
         operation_type: str,
     ) -> None:
-        async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-            response = await client.post(
-                urljoin(gateway_service_url, "/api/v1/balance/history"),
-                headers={"X-User-Name": username},
-                json={
-                    "ticketUid": str(ticket_uid),
-                    "balanceDiff": balance_diff,
-                    "operationType": operation_type,
-                },
-            )
-            response.raise_for_status()
+        await self._request(
+            "POST",
+            "/api/v1/balance/history",
+            username,
+            json={
+                "ticketUid": str(ticket_uid),
+                "balanceDiff": balance_diff,
+                "operationType": operation_type,
+            },
+        )
 
-    async def get_user_history(self, username: str) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-            response = await client.get(
-                urljoin(gateway_service_url, "/api/v1/me"),
-                headers={"X-User-Name": username},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-            return response_json.get("history", [])  # type: ignore
+    async def apply_balance_operation(
+        self,
+        username: str,
+        ticket_uid: UUID,
+        balance_diff: int,
+        operation_type: str,
+        idempotency_key: str,
+    ) -> None:
+        """Изменение баланса и запись истории одним запросом и одной транзакцией Bonus service."""
+        await self._request(
+            "POST",
+            "/api/v1/balance/operations",
+            username,
+            json={
+                "ticketUid": str(ticket_uid),
+                "balanceDiff": balance_diff,
+                "operationType": operation_type,
+                "idempotencyKey": idempotency_key,
+            },
+        )
+
+    async def get_ticket_history(self, username: str, ticket_uid: UUID) -> dict[str, Any]:
+        """Текущий баланс и бонусные операции только по одному билету (от новых к старым)."""
+        response = await self._request("GET", f"/api/v1/balance/history/{ticket_uid}", username)
+        return response.json()  # type: ignore
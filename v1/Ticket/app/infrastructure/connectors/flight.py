@@ -0,0 +1,58 @@
+import os
+
+from datetime import datetime
+from urllib.parse import urljoin
+
+from dotenv import load_dotenv
+
+from app.presentation.api.schemas import GatewayFlightResponse, GatewayAllFlightsResponse
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.circuit_breaker import CircuitBreaker
+
+load_dotenv(override=True)
+flight_service_url = os.getenv("FLIGHT_SERVICE_URL", "")
+
+
+def _to_gateway_flight(item: dict) -> GatewayFlightResponse:
+    """Рейс Flight service с вложенными аэропортами в том виде, в каком его отдаёт Gateway."""
+    flight_datetime = datetime.fromisoformat(item["datetime"].replace("Z", "+00:00"))
+    return GatewayFlightResponse(
+        flightNumber=item["flight_number"],
+        fromAirport=f"{item['from_airport']['city']} {item['from_airport']['name']}",
+        toAirport=f"{item['to_airport']['city']} {item['to_airport']['name']}",
+        date=flight_datetime.strftime("%Y-%m-%d %H:%M"),
+        price=item["price"],
+    )
+
+
+class FlightConnector:
+    """Прямые запросы к Flight service, минуя Gateway."""
+
+    async def get_flights(self, page: int = 1, size: int = 10, cursor: str | None = None) -> GatewayAllFlightsResponse:
+        """Cursor — nextCursor предыдущего ответа: keyset-страница без OFFSET и без подсчёта total."""
+        return await CircuitBreaker.get("flight").call(lambda: self._get_flights_impl(page, size, cursor))
+
+    async def _get_flights_impl(self, page: int, size: int, cursor: str | None) -> GatewayAllFlightsResponse:
+        params: dict[str, str | int] = {"page": page, "size": size, "expand": "airports"}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await get_client("flight").get(urljoin(flight_service_url, "/v1/flights"), params=params)
+        response.raise_for_status()
+        response_json = response.json()
+        return GatewayAllFlightsResponse(
+            page=response_json.get("page", page),
+            pageSize=response_json.get("pageSize", size),
+            totalElements=response_json.get("totalElements"),
+            items=[_to_gateway_flight(item) for item in response_json.get("items", [])],
+            nextCursor=response_json.get("nextCursor"),
+        )
+
+    async def get_flight_by_number(self, flight_number: str) -> GatewayFlightResponse | None:
+        return await CircuitBreaker.get("flight").call(lambda: self._get_flight_by_number_impl(flight_number))
+
+    async def _get_flight_by_number_impl(self, flight_number: str) -> GatewayFlightResponse | None:
+        response = await get_client("flight").get(urljoin(flight_service_url, f"/v1/flights/by-number/{flight_number}"))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return _to_gateway_flight(response.json())
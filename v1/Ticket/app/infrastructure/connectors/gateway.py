@@ -2,8 +2,6 @@ import os
 
 from urllib.parse import urljoin
 
-import httpx
-
 from dotenv import load_dotenv
 
 from app.services.exceptions import FlightNotFoundError
@@ -11,31 +9,79 @@ from app.presentation.api.schemas import (
     GatewayFlightResponse,
     GatewayAllFlightsResponse,
 )
+from app.infrastructure.http_clients import get_client
+from app.infrastructure.flight_catalog import FLIGHT_CATALOG_PAGE_SIZE, flight_catalog
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.connectors.flight import FlightConnector, flight_service_url
 
 load_dotenv(override=True)
 gateway_service_url = os.getenv("GATEWAY_SERVICE_URL", "")
 
 
 class GatewayConnector:
-    async def get_flights(self, page: int = 1, size: int = 10) -> GatewayAllFlightsResponse:
-        async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-            response = await client.get(
-                urljoin(gateway_service_url, "/api/v1/flights"),
-                params={"page": page, "size": size},
-            )
-            response.raise_for_status()
-            response_json = response.json()
-            return GatewayAllFlightsResponse.model_validate(response_json)
+    """Рейсы через Gateway; при заданном FLIGHT_SERVICE_URL — напрямую из Flight service."""
+
+    def __init__(self, flight_connector: FlightConnector | None = None) -> None:
+        if flight_connector is None and flight_service_url:
+            flight_connector = FlightConnector()
+        self._flight_connector = flight_connector
+
+    async def get_flights(self, page: int = 1, size: int = 10, cursor: str | None = None) -> GatewayAllFlightsResponse:
+        """Cursor понимает только Flight service; Gateway листает по page."""
+        if self._flight_connector is not None:
+            return await self._flight_connector.get_flights(page, size, cursor)
+        return await CircuitBreaker.get("gateway").call(lambda: self._get_flights_impl(page, size))
+
+    async def _get_flights_impl(self, page: int, size: int) -> GatewayAllFlightsResponse:
+        response = await get_client("gateway").get(
+            urljoin(gateway_service_url, "/api/v1/flights"),
+            params={"page": page, "size": size},
+        )
+        response.raise_for_status()
+        return GatewayAllFlightsResponse.model_validate(response.json())
+
+    async def get_flight_by_number(self, flight_number: str) -> GatewayFlightResponse | None:
+        if self._flight_connector is not None:
+            return await self._flight_connector.get_flight_by_number(flight_number)
+        return await CircuitBreaker.get("gateway").call(lambda: self._get_flight_by_number_impl(flight_number))
+
+    async def _get_flight_by_number_impl(self, flight_number: str) -> GatewayFlightResponse | None:
+        response = await get_client("gateway").get(urljoin(gateway_service_url, f"/api/v1/flights/{flight_number}"))
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return GatewayFlightResponse.model_validate(response.json())
 
     async def find_flight_by_number(self, flight_number: str) -> GatewayFlightResponse:
+        flight = flight_catalog.get(flight_number)
+        if flight is not None:
+            return flight
+
+        flight = await self.get_flight_by_number(flight_number)
+        if flight is None:
+            raise FlightNotFoundError(flight_number)
+        flight_catalog.put(flight)
+        return flight
+
+    async def refresh_flight_catalog(self) -> int:
+        """Загружает все рейсы и атомарно подменяет ими локальный каталог."""
+        flights = []
         page = 1
-        size = 100
+        cursor = None
         while True:
-            flights_response = await self.get_flights(page, size)
-            for flight in flights_response.items:
-                if flight.flightNumber == flight_number:
-                    return flight
-            if page * size >= flights_response.totalElements:
+            flights_response = await self.get_flights(page, FLIGHT_CATALOG_PAGE_SIZE, cursor)
+            flights.extend(flights_response.items)
+            if not flights_response.items:
+                break
+            if flights_response.nextCursor is not None:
+                # Flight отдаёт курсор: дальше по ключу, без OFFSET и подсчёта total
+                cursor = flights_response.nextCursor
+                continue
+            if (
+                flights_response.totalElements is None
+                or page * FLIGHT_CATALOG_PAGE_SIZE >= flights_response.totalElements
+            ):
                 break
             page += 1
-        raise FlightNotFoundError(flight_number)
+        flight_catalog.replace(flights)
+        return len(flights)
@@ -0,0 +1,51 @@
+import os
+import time
+
+from collections.abc import Iterable
+
+from dotenv import load_dotenv
+
+from app.presentation.api.schemas import GatewayFlightResponse
+
+load_dotenv(override=True)
+
+FLIGHT_CATALOG_REFRESH_INTERVAL_SEC = float(os.getenv("FLIGHT_CATALOG_REFRESH_INTERVAL", "60"))
+FLIGHT_CATALOG_MAX_AGE_SEC = float(os.getenv("FLIGHT_CATALOG_MAX_AGE", "300"))
+FLIGHT_CATALOG_PAGE_SIZE = int(os.getenv("FLIGHT_CATALOG_PAGE_SIZE", "100"))
+
+
+class FlightCatalog:
+    """Локальный каталог рейсов по номеру; периодически перезагружается целиком.
+
+    Запись старше max_age считается промахом, чтобы при недоступном Gateway
+    не продавать билеты по давно устаревшей цене.
+    """
+
+    def __init__(self, max_age_sec: float = FLIGHT_CATALOG_MAX_AGE_SEC) -> None:
+        self.max_age_sec = max_age_sec
+        self.refreshed_at: float | None = None
+        self._flights: dict[str, tuple[float, GatewayFlightResponse]] = {}
+
+    def get(self, flight_number: str) -> GatewayFlightResponse | None:
+        item = self._flights.get(flight_number)
+        if item is None or item[0] <= time.monotonic():
+            return None
+        return item[1]
+
+    def put(self, flight: GatewayFlightResponse) -> None:
+        self._flights[flight.flightNumber] = (time.monotonic() + self.max_age_sec, flight)
+
+    def replace(self, flights: Iterable[GatewayFlightResponse]) -> None:
+        expires_at = time.monotonic() + self.max_age_sec
+        self._flights = {flight.flightNumber: (expires_at, flight) for flight in flights}
+        self.refreshed_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._flights = {}
+        self.refreshed_at = None
+
+    def size(self) -> int:
+        return len(self._flights)
+
+
+flight_catalog = FlightCatalog()
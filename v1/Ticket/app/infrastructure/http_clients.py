@@ -0,0 +1,39 @@
+import os
+
+import httpx
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+HTTP_TIMEOUT_SEC = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SEC = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30"))
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SEC,
+    )
+    return httpx.AsyncClient(verify=False, timeout=HTTP_TIMEOUT_SEC, limits=limits)
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Пул соединений к downstream-сервису; один клиент на сервис на процесс (event loop однопоточный)."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _build_client()
+        _clients[name] = client
+    return client
+
+
+async def close_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
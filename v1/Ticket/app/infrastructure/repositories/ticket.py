@@ -2,7 +2,7 @@ import uuid
 
 from typing import cast
 
-from sqlalchemy import Column, func, select
+from sqlalchemy import Column, ColumnElement, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.ticket import TicketDB
@@ -12,13 +12,14 @@ class TicketRepository:
     def __init__(self, db: AsyncSession):
         self._db = db
 
-    async def get_all(self, page: int = 1, size: int = 10) -> tuple[list[TicketDB], int]:
-        count_query = select(func.count()).select_from(TicketDB)
-        count_result = await self._db.execute(count_query)
-        total_elements = count_result.scalar() or 0
+    async def get_all(
+        self, page: int = 1, size: int = 10, after_id: int | None = None, with_total: bool = True
+    ) -> tuple[list[TicketDB], int | None]:
+        """after_id — keyset-страница после этого id без OFFSET; иначе страница page по смещению."""
+        total_elements = await self._count() if with_total else None
 
-        offset = (page - 1) * size
-        query = select(TicketDB).offset(offset).limit(size)
+        query = select(TicketDB).order_by(TicketDB.id).limit(size)
+        query = query.where(TicketDB.id > after_id) if after_id is not None else query.offset((page - 1) * size)
         result = await self._db.execute(query)
         tickets = result.scalars().all()
         return list(tickets), total_elements
@@ -31,17 +32,28 @@ class TicketRepository:
 
         return ticket
 
-    async def get_by_username(self, username: str, page: int = 1, size: int = 10) -> tuple[list[TicketDB], int]:
-        count_query = select(func.count()).select_from(TicketDB).where(TicketDB.username == username)
-        count_result = await self._db.execute(count_query)
-        total_elements = count_result.scalar() or 0
+    async def get_by_username(
+        self,
+        username: str,
+        page: int = 1,
+        size: int = 10,
+        after_id: int | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[TicketDB], int | None]:
+        """Билеты пользователя по ключу (username, id); after_id — как в get_all."""
+        total_elements = await self._count(TicketDB.username == username) if with_total else None
 
-        offset = (page - 1) * size
-        query = select(TicketDB).where(TicketDB.username == username).offset(offset).limit(size)
+        query = select(TicketDB).where(TicketDB.username == username).order_by(TicketDB.id).limit(size)
+        query = query.where(TicketDB.id > after_id) if after_id is not None else query.offset((page - 1) * size)
         result = await self._db.execute(query)
         tickets = result.scalars().all()
         return list(tickets), total_elements
 
+    async def _count(self, *criteria: ColumnElement[bool]) -> int:
+        count_query = select(func.count()).select_from(TicketDB).where(*criteria)
+        count_result = await self._db.execute(count_query)
+        return count_result.scalar() or 0
+
     async def save_new_ticket(self, ticket: TicketDB) -> str:
         self._db.add(ticket)
         await self._db.flush()
@@ -56,3 +68,18 @@ class TicketRepository:
         ticket_db.status = cast(Column[str], "CANCELED")
         await self._db.commit()
         await self._db.refresh(ticket_db)
+
+    async def get_by_ticket_uids(self, ticket_uids: list[str]) -> list[TicketDB]:
+        ticket_uuids = [uuid.UUID(ticket_uid) for ticket_uid in ticket_uids]
+        query = select(TicketDB).where(TicketDB.ticket_uid.in_(ticket_uuids))
+        result = await self._db.execute(query)
+        return list(result.scalars().all())
+
+    async def cancel_tickets(self, ticket_uids: list[str]) -> None:
+        """Отменяет все билеты одним UPDATE в одной транзакции."""
+        if not ticket_uids:
+            return
+        ticket_uuids = [uuid.UUID(ticket_uid) for ticket_uid in ticket_uids]
+        query = update(TicketDB).where(TicketDB.ticket_uid.in_(ticket_uuids)).values(status="CANCELED")
+        await self._db.execute(query)
+        await self._db.commit()
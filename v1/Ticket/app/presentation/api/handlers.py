@@ -3,11 +3,14 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.services.exceptions import (
+    InvalidCursorError,
     FlightNotFoundError,
     TicketNotFoundError,
     BonusUnavailableError,
+    DatabaseOverloadedError,
     InsufficientBalanceError,
 )
+from app.infrastructure.circuit_breaker import CircuitOpenError
 
 
 async def ticket_not_found_error_handler(_: Request, exc: TicketNotFoundError) -> JSONResponse:
@@ -26,6 +29,19 @@ async def bonus_unavailable_error_handler(_: Request, exc: BonusUnavailableError
     return JSONResponse(status_code=503, content={"message": exc.message})
 
 
+async def circuit_open_error_handler(_: Request, exc: CircuitOpenError) -> JSONResponse:
+    # Предохранитель к Bonus или Flight открыт: запрос туда даже не отправлялся
+    return JSONResponse(status_code=503, content={"message": f"{exc.service_name.capitalize()} service unavailable"})
+
+
+async def invalid_cursor_error_handler(_: Request, exc: InvalidCursorError) -> JSONResponse:
+    return JSONResponse(status_code=400, content={"message": exc.message})
+
+
+async def database_overloaded_error_handler(_: Request, exc: DatabaseOverloadedError) -> JSONResponse:
+    return JSONResponse(status_code=503, content={"message": exc.message})
+
+
 async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
     errors = {}
     for err in exc.errors():
@@ -46,4 +62,7 @@ def add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(FlightNotFoundError, flight_not_found_error_handler)  # type: ignore
     app.add_exception_handler(InsufficientBalanceError, insufficient_balance_error_handler)  # type: ignore
     app.add_exception_handler(BonusUnavailableError, bonus_unavailable_error_handler)  # type: ignore
+    app.add_exception_handler(CircuitOpenError, circuit_open_error_handler)  # type: ignore
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_error_handler)  # type: ignore
+    app.add_exception_handler(DatabaseOverloadedError, database_overloaded_error_handler)  # type: ignore
     app.add_exception_handler(RequestValidationError, validation_error_handler)  # type: ignore
@@ -1,3 +1,5 @@
+import asyncio
+
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -6,6 +8,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.logger import persons_logger
 from app.db.engine import init_db
 from app.presentation.api import routers, handlers
+from app.infrastructure.http_clients import close_clients
+from app.infrastructure.flight_catalog import FLIGHT_CATALOG_REFRESH_INTERVAL_SEC
+from app.infrastructure.connectors.gateway import GatewayConnector
+
+
+async def refresh_flight_catalog_periodically() -> None:
+    """Фоновое обновление каталога рейсов; ошибка Gateway не роняет задачу."""
+    connector = GatewayConnector()
+    while True:
+        try:
+            count = await connector.refresh_flight_catalog()
+            persons_logger.info(f"Каталог рейсов обновлён: {count} рейсов")
+        except Exception as e:
+            persons_logger.warning(f"Не удалось обновить каталог рейсов: {e}")
+        await asyncio.sleep(FLIGHT_CATALOG_REFRESH_INTERVAL_SEC)
 
 
 @asynccontextmanager
@@ -20,8 +37,11 @@ async def lifespan(app: FastAPI):  # type: ignore
     except Exception as e:
         persons_logger.error(f"Ошибка при инициализации БД: {e}", exc_info=True)
         raise
+    catalog_task = asyncio.create_task(refresh_flight_catalog_periodically())
     yield
     persons_logger.info("Остановка приложения...")
+    catalog_task.cancel()
+    await close_clients()
 
 
 app = FastAPI(
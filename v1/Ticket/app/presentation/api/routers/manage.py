@@ -1,8 +1,25 @@
-from fastapi import APIRouter
+from fastapi import Query, APIRouter
 
-router = APIRouter(prefix="/manage/health")
+from app.db.pool import pool_stats
+from app.db.engine import get_engine
+from app.db.query_stats import query_timings
+from app.presentation.api.schemas import PoolStats, DbStatsResponse
 
+router = APIRouter(prefix="/manage")
 
-@router.get("", status_code=200)
+
+@router.get("/health", status_code=200)
 def ping() -> None:
     return
+
+
+@router.get("/db")
+def get_db_stats(limit: int = Query(50, ge=1, le=1000)) -> DbStatsResponse:
+    """Время запросов к БД по нормализованному SQL, самые дорогие первыми."""
+    return query_timings.stats(limit)
+
+
+@router.get("/db/pool")
+def get_db_pool_stats() -> PoolStats:
+    """Соединения пула, ожидание выдачи соединения и очередь допуска к БД."""
+    return PoolStats(**pool_stats(get_engine().pool))
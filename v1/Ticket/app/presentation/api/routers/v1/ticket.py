@@ -1,14 +1,17 @@
 from uuid import UUID
 
-from fastapi import Header, Depends, Response, APIRouter
+from fastapi import Query, Header, Depends, Response, APIRouter
 
 from app.dependencies import get_ticket_service
 from app.services.ticket import TicketService
 from app.presentation.api.schemas import (
     TicketResponse,
     AllTicketsResponse,
+    TicketCancelResult,
     TicketCreateRequest,
     TicketPurchaseResponse,
+    TicketCancelBatchRequest,
+    TicketCancelBatchResponse,
 )
 
 router = APIRouter(prefix="/v1/tickets")
@@ -18,10 +21,15 @@ router = APIRouter(prefix="/v1/tickets")
 async def get_all_tickets(
     page: int = 1,
     size: int = 10,
+    cursor: str | None = Query(None, description="Токен nextCursor предыдущей страницы; page тогда не учитывается"),
+    count: bool | None = Query(None, description="Считать totalElements; по умолчанию — только без cursor"),
     ticket_service: TicketService = Depends(get_ticket_service),
 ) -> AllTicketsResponse:
-    tickets, total_elements = await ticket_service.get_all(page, size)
-    return AllTicketsResponse(page=page, pageSize=size, totalElements=total_elements, items=tickets)
+    with_total = count if count is not None else cursor is None
+    tickets, total_elements, next_cursor = await ticket_service.get_all(page, size, cursor, with_total)
+    return AllTicketsResponse(
+        page=page, pageSize=size, totalElements=total_elements, items=tickets, nextCursor=next_cursor
+    )
 
 
 @router.post("", status_code=201)
@@ -36,6 +44,17 @@ async def purchase_ticket(
     return result
 
 
+@router.post("/cancel-batch")
+async def cancel_tickets_batch(
+    body: TicketCancelBatchRequest,
+    ticket_service: TicketService = Depends(get_ticket_service),
+) -> TicketCancelBatchResponse:
+    results = await ticket_service.cancel_batch([(str(item.ticketUid), item.username) for item in body.items])
+    return TicketCancelBatchResponse(
+        items=[TicketCancelResult(ticketUid=UUID(ticket_uid), status=status) for ticket_uid, status in results]
+    )
+
+
 @router.get("/{ticket_uid}")
 async def get_ticket_by_uid(
     ticket_uid: UUID,
@@ -49,10 +68,17 @@ async def get_tickets_by_username(
     username: str,
     page: int = 1,
     size: int = 10,
+    cursor: str | None = Query(None, description="Токен nextCursor предыдущей страницы; page тогда не учитывается"),
+    count: bool | None = Query(None, description="Считать totalElements; по умолчанию — только без cursor"),
     ticket_service: TicketService = Depends(get_ticket_service),
 ) -> AllTicketsResponse:
-    tickets, total_elements = await ticket_service.get_by_username(username, page, size)
-    return AllTicketsResponse(page=page, pageSize=size, totalElements=total_elements, items=tickets)
+    with_total = count if count is not None else cursor is None
+    tickets, total_elements, next_cursor = await ticket_service.get_by_username(
+        username, page, size, cursor, with_total
+    )
+    return AllTicketsResponse(
+        page=page, pageSize=size, totalElements=total_elements, items=tickets, nextCursor=next_cursor
+    )
 
 
 @router.delete("/{ticket_uid}", status_code=204)
@@ -3,7 +3,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, constr
 
-from app.services.enums import TicketStatus
+from app.services.enums import TicketStatus, TicketCancelStatus
 
 
 class TicketCreateRequest(BaseModel):
@@ -39,8 +39,27 @@ class TicketResponse(TicketMeta):
 class AllTicketsResponse(BaseModel):
     page: int
     pageSize: int
-    totalElements: int
+    totalElements: int | None
     items: list[TicketResponse]
+    nextCursor: str | None = None
+
+
+class TicketCancelItem(BaseModel):
+    ticketUid: UUID
+    username: constr(min_length=1, max_length=80)  # type: ignore
+
+
+class TicketCancelBatchRequest(BaseModel):
+    items: list[TicketCancelItem]
+
+
+class TicketCancelResult(BaseModel):
+    ticketUid: UUID
+    status: TicketCancelStatus
+
+
+class TicketCancelBatchResponse(BaseModel):
+    items: list[TicketCancelResult]
 
 
 class FlightMeta(BaseModel):
@@ -68,8 +87,9 @@ class GatewayFlightResponse(BaseModel):
 class GatewayAllFlightsResponse(BaseModel):
     page: int
     pageSize: int
-    totalElements: int
+    totalElements: int | None
     items: list[GatewayFlightResponse]
+    nextCursor: str | None = None
 
 
 class AllFlightsResponse(BaseModel):
@@ -77,3 +97,45 @@ class AllFlightsResponse(BaseModel):
     pageSize: int
     totalElements: int
     items: list[FlightResponse]
+
+
+class StatementStats(BaseModel):
+    # SQL с литералами и параметрами, заменёнными на ?
+    statement: str
+    calls: int
+    slow_calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    # Квантили — верхние границы корзин гистограммы
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    buckets: dict[str, int]
+    # Последний EXPLAIN (ANALYZE, BUFFERS) медленного вызова, если он включён
+    plan: str | None
+
+
+class DbStatsResponse(BaseModel):
+    slow_query_ms: float
+    explain_enabled: bool
+    statements: list[StatementStats]
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    in_use: int
+    idle: int
+    overflow: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_mean_ms: float
+    checkout_wait_max_ms: float
+    admission_limit: int
+    admission_active: int
+    admission_waiting: int
+    admission_queue_size: int
+    admission_rejected: int
+    # Кэш подготовленных выражений asyncpg выключен для PgBouncer
+    pgbouncer: bool
@@ -4,3 +4,11 @@ from enum import Enum as StrEnum
 class TicketStatus(StrEnum):
     PAID = "PAID"
     CANCELED = "CANCELED"
+
+
+class TicketCancelStatus(StrEnum):
+    CANCELED = "CANCELED"
+    ALREADY_CANCELED = "ALREADY_CANCELED"
+    NOT_FOUND = "NOT_FOUND"
+    # Не удалось вернуть бонусы; билет остаётся оплаченным, отмену можно повторить
+    FAILED = "FAILED"
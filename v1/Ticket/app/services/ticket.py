@@ -2,9 +2,11 @@ import uuid
 
 from datetime import UTC, datetime
 
-from app.services.enums import TicketStatus
+from app.logger import persons_logger
+from app.services.enums import TicketStatus, TicketCancelStatus
 from app.db.models.ticket import TicketDB
-from app.services.exceptions import TicketNotFoundError, BonusUnavailableError, InsufficientBalanceError
+from app.services.exceptions import TicketNotFoundError, InsufficientBalanceError
+from app.services.pagination import decode_cursor, encode_cursor
 from app.presentation.api.schemas import (
     TicketResponse,
     TicketCreateRequest,
@@ -16,6 +18,16 @@ from app.infrastructure.connectors.gateway import GatewayConnector
 from app.infrastructure.repositories.ticket import TicketRepository
 
 
+def purchase_operation_key(ticket_uid: uuid.UUID) -> str:
+    """Ключ идемпотентности бонусной операции покупки: одна на билет."""
+    return f"{ticket_uid}:purchase"
+
+
+def cancel_operation_key(ticket_uid: uuid.UUID) -> str:
+    """Ключ идемпотентности возврата бонусов: повтор отмены не вернёт их второй раз."""
+    return f"{ticket_uid}:cancel"
+
+
 class TicketService:
     def __init__(
         self,
@@ -34,15 +46,30 @@ class TicketService:
         ticket = TicketResponse.model_validate(ticket_db)
         return ticket
 
-    async def get_all(self, page: int = 1, size: int = 10) -> tuple[list[TicketResponse], int]:
-        tickets_db, total_elements = await self._ticket_repository.get_all(page, size)
-        tickets = [TicketResponse.model_validate(ticket) for ticket in tickets_db]
-        return tickets, total_elements
+    async def get_all(
+        self, page: int = 1, size: int = 10, cursor: str | None = None, with_total: bool = True
+    ) -> tuple[list[TicketResponse], int | None, str | None]:
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        tickets_db, total_elements = await self._ticket_repository.get_all(page, size, after_id, with_total)
+        return self._to_page(tickets_db, size, total_elements)
+
+    async def get_by_username(
+        self, username: str, page: int = 1, size: int = 10, cursor: str | None = None, with_total: bool = True
+    ) -> tuple[list[TicketResponse], int | None, str | None]:
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        tickets_db, total_elements = await self._ticket_repository.get_by_username(
+            username, page, size, after_id, with_total
+        )
+        return self._to_page(tickets_db, size, total_elements)
 
-    async def get_by_username(self, username: str, page: int = 1, size: int = 10) -> tuple[list[TicketResponse], int]:
-        tickets_db, total_elements = await self._ticket_repository.get_by_username(username, page, size)
+    @staticmethod
+    def _to_page(
+        tickets_db: list[TicketDB], size: int, total_elements: int | None
+    ) -> tuple[list[TicketResponse], int | None, str | None]:
+        """Неполная страница — последняя, курсора продолжения у неё нет."""
         tickets = [TicketResponse.model_validate(ticket) for ticket in tickets_db]
-        return tickets, total_elements
+        next_cursor = encode_cursor(int(tickets_db[-1].id)) if tickets_db and len(tickets_db) == size else None
+        return tickets, total_elements, next_cursor
 
     async def purchase_ticket(self, ticket: TicketCreateRequest, username: str) -> TicketPurchaseResponse:
         flight = await self._gateway_connector.find_flight_by_number(ticket.flightNumber)
@@ -65,15 +92,15 @@ class TicketService:
             paid_by_bonuses = ticket.price
             paid_by_money = 0
 
-            await self._bonus_connector.change_user_balance(username, -paid_by_bonuses)
-            await self._bonus_connector.create_history_record(
-                username, ticket_uid, -paid_by_bonuses, "DEBIT_THE_ACCOUNT"
+            await self._bonus_connector.apply_balance_operation(
+                username, ticket_uid, -paid_by_bonuses, "DEBIT_THE_ACCOUNT", purchase_operation_key(ticket_uid)
             )
         else:
             bonus_amount = int(ticket.price * 0.1)
             if bonus_amount > 0:
-                await self._bonus_connector.change_user_balance(username, bonus_amount)
-                await self._bonus_connector.create_history_record(username, ticket_uid, bonus_amount, "FILL_IN_BALANCE")
+                await self._bonus_connector.apply_balance_operation(
+                    username, ticket_uid, bonus_amount, "FILL_IN_BALANCE", purchase_operation_key(ticket_uid)
+                )
 
         ticket_data = {
             "username": username,
@@ -106,39 +133,74 @@ class TicketService:
         if ticket_db.status == TicketStatus.CANCELED.value:
             return
 
-        history = await self._bonus_connector.get_user_history(username)
-
-        if not history:
-            raise BonusUnavailableError()
+        await self._refund_bonuses(ticket_uid, username)
+        await self._ticket_repository.cancel_ticket(ticket_uid)
 
+    async def cancel_batch(self, items: list[tuple[str, str]]) -> list[tuple[str, TicketCancelStatus]]:
+        """Отменяет пары (ticket_uid, username); статусы билетов меняются одной транзакцией.
+
+        Бонусы возвращаются по каждому билету отдельно; билет, по которому это не
+        удалось, не отменяется и получает FAILED. Если не удалось обновить статусы,
+        FAILED получают все билеты, по которым бонусы уже вернули.
+        """
+        tickets = await self._ticket_repository.get_by_ticket_uids([ticket_uid for ticket_uid, _ in items])
+        tickets_by_uid = {str(ticket.ticket_uid): ticket for ticket in tickets}
+        to_cancel: list[str] = []
+        results = []
+        for ticket_uid, username in items:
+            ticket_db = tickets_by_uid.get(ticket_uid)
+            if ticket_db is None or ticket_db.username != username:
+                results.append((ticket_uid, TicketCancelStatus.NOT_FOUND))
+                continue
+            if ticket_db.status == TicketStatus.CANCELED.value or ticket_uid in to_cancel:
+                results.append((ticket_uid, TicketCancelStatus.ALREADY_CANCELED))
+                continue
+            try:
+                await self._refund_bonuses(ticket_uid, username)
+            except Exception as e:
+                persons_logger.warning(f"Не удалось вернуть бонусы по билету {ticket_uid}: {e}")
+                results.append((ticket_uid, TicketCancelStatus.FAILED))
+                continue
+            to_cancel.append(ticket_uid)
+            results.append((ticket_uid, TicketCancelStatus.CANCELED))
+
+        try:
+            await self._ticket_repository.cancel_tickets(to_cancel)
+        except Exception as e:
+            # Бонусы уже возвращены, но повтор безопасен: операции отмены идемпотентны по ключу
+            persons_logger.warning(f"Не удалось отменить билеты {to_cancel}: {e}")
+            failed = set(to_cancel)
+            results = [
+                (ticket_uid, TicketCancelStatus.FAILED)
+                if ticket_uid in failed and status != TicketCancelStatus.NOT_FOUND
+                else (ticket_uid, status)
+                for ticket_uid, status in results
+            ]
+        return results
+
+    async def _refund_bonuses(self, ticket_uid: str, username: str) -> None:
+        """Отменяет бонусную операцию покупки билета; повтор безопасен благодаря ключу идемпотентности."""
         ticket_uuid = uuid.UUID(ticket_uid)
-        ticket_history = None
-        for record in history:
-            record_ticket_uid = record.get("ticketUid")
-            if str(record_ticket_uid) == str(ticket_uuid) or str(record_ticket_uid) == ticket_uid:
-                ticket_history = record
-                break
-
-        if ticket_history:
-            operation_type = ticket_history.get("operationType")
-            balance_diff = ticket_history.get("balanceDiff", 0)
-
-            if operation_type == "FILL_IN_BALANCE":
-                user_balance = await self._bonus_connector.get_user_balance(username)
-                amount_to_debit = min(balance_diff, user_balance)
-                if amount_to_debit > 0:
-                    await self._bonus_connector.change_user_balance(username, -amount_to_debit)
-                    await self._bonus_connector.create_history_record(
-                        username, ticket_uuid, -amount_to_debit, "DEBIT_THE_ACCOUNT"
-                    )
-            elif operation_type == "DEBIT_THE_ACCOUNT":
-                amount_to_return = abs(balance_diff)
-                await self._bonus_connector.change_user_balance(username, amount_to_return)
-                await self._bonus_connector.create_history_record(
-                    username, ticket_uuid, amount_to_return, "FILL_IN_BALANCE"
-                )
+        ticket_history = await self._bonus_connector.get_ticket_history(username, ticket_uuid)
+        records = ticket_history.get("history", [])
+        if not records:
+            return
 
-        await self._ticket_repository.cancel_ticket(ticket_uid)
+        # Операции идут от новых к старым: покупка — самая ранняя
+        purchase = records[-1]
+        operation_type = purchase.get("operationType")
+        balance_diff = purchase.get("balanceDiff", 0)
+
+        if operation_type == "FILL_IN_BALANCE":
+            amount_to_debit = min(balance_diff, ticket_history.get("balance", 0) or 0)
+            if amount_to_debit > 0:
+                await self._bonus_connector.apply_balance_operation(
+                    username, ticket_uuid, -amount_to_debit, "DEBIT_THE_ACCOUNT", cancel_operation_key(ticket_uuid)
+                )
+        elif operation_type == "DEBIT_THE_ACCOUNT":
+            await self._bonus_connector.apply_balance_operation(
+                username, ticket_uuid, abs(balance_diff), "FILL_IN_BALANCE", cancel_operation_key(ticket_uuid)
+            )
 
     async def get_flights(self, page: int = 1, size: int = 10) -> GatewayAllFlightsResponse:
         return await self._gateway_connector.get_flights(page, size)
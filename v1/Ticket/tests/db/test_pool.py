@@ -0,0 +1,188 @@
+import json
+import uuid
+import asyncio
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from fastapi.testclient import TestClient
+
+from app.db.pool import AdmissionGate, InstrumentedPool, pool_stats, pool_metrics, pgbouncer_connect_args
+from app.db.engine import get_db
+from app.services.exceptions import DatabaseOverloadedError
+from app.presentation.api.main import app
+from app.presentation.api.handlers import database_overloaded_error_handler
+
+WAIT_TIMEOUT_SEC = 1.0
+
+
+async def wait_until(predicate, timeout=WAIT_TIMEOUT_SEC):
+    """Ждёт условия с таймаутом: регрессия должна ронять тест, а не подвешивать набор."""
+
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.fixture(autouse=True)
+def reset_pool_metrics():
+    pool_metrics.reset()
+    yield
+    pool_metrics.reset()
+
+
+class TestAdmissionGate:
+    def test_admits_up_to_limit_and_queues_the_rest(self):
+        gate = AdmissionGate(limit=1, queue_size=1, timeout=1)
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def hold():
+                async with gate.admit():
+                    await release.wait()
+
+            holder = asyncio.create_task(hold())
+            await wait_until(lambda: gate.active == 1)
+            waiter = asyncio.create_task(hold())
+            try:
+                await wait_until(lambda: gate.waiting == 1)
+            finally:
+                release.set()
+            await asyncio.wait_for(asyncio.gather(holder, waiter), WAIT_TIMEOUT_SEC)
+
+        asyncio.run(scenario())
+
+        assert (gate.active, gate.waiting, gate.rejected) == (0, 0, 0)
+
+    def test_full_queue_fails_fast(self):
+        gate = AdmissionGate(limit=1, queue_size=0, timeout=1)
+
+        async def scenario():
+            async with gate.admit():
+                with pytest.raises(DatabaseOverloadedError):
+                    async with gate.admit():
+                        pass
+
+        asyncio.run(scenario())
+
+        assert gate.rejected == 1
+
+    def test_wait_timeout_rejects(self):
+        gate = AdmissionGate(limit=1, queue_size=10, timeout=0.01)
+
+        async def scenario():
+            async with gate.admit():
+                with pytest.raises(DatabaseOverloadedError):
+                    async with gate.admit():
+                        pass
+
+        asyncio.run(scenario())
+
+        assert (gate.rejected, gate.waiting, gate.active) == (1, 0, 0)
+
+
+class TestGetDbAdmission:
+    def test_saturated_gate_rejects_session(self, monkeypatch):
+        gate = AdmissionGate(limit=1, queue_size=0, timeout=1)
+        sessionmaker = MagicMock()
+        monkeypatch.setattr("app.db.engine.db_admission", gate)
+        monkeypatch.setattr("app.db.engine.get_engine", MagicMock())
+        monkeypatch.setattr("app.db.engine.get_sessionmaker", lambda _: sessionmaker)
+
+        async def scenario():
+            async with gate.admit():
+                with pytest.raises(DatabaseOverloadedError):
+                    await asyncio.wait_for(anext(get_db()), WAIT_TIMEOUT_SEC)
+
+        asyncio.run(scenario())
+
+        sessionmaker.assert_not_called()
+        assert gate.rejected == 1
+
+    def test_overloaded_error_maps_to_503(self):
+        response = asyncio.run(database_overloaded_error_handler(MagicMock(), DatabaseOverloadedError()))
+
+        assert response.status_code == 503
+        assert json.loads(response.body) == {"message": "Database is overloaded"}
+
+
+class TestPoolTelemetry:
+    def test_checkout_wait_is_measured(self, monkeypatch):
+        monkeypatch.setattr(AsyncAdaptedQueuePool, "_do_get", lambda self: "connection")
+        pool = InstrumentedPool(MagicMock(), pool_size=2, max_overflow=1)
+
+        assert pool._do_get() == "connection"
+        assert pool_metrics.checkouts == 1
+        assert pool_metrics.wait_max_sec >= 0
+
+    def test_checkout_timeout_is_counted(self, monkeypatch):
+        def timeout(self):
+            raise PoolTimeoutError("pool exhausted")
+
+        monkeypatch.setattr(AsyncAdaptedQueuePool, "_do_get", timeout)
+        pool = InstrumentedPool(MagicMock(), pool_size=2, max_overflow=1)
+
+        with pytest.raises(PoolTimeoutError):
+            pool._do_get()
+
+        assert pool_metrics.timeouts == 1
+        assert pool_metrics.checkouts == 0
+
+    def test_pool_stats(self):
+        pool = MagicMock()
+        pool.size.return_value = 20
+        pool.checkedout.return_value = 3
+        pool.checkedin.return_value = 17
+        pool.overflow.return_value = -17
+        pool_metrics.observe_checkout(0.002)
+        pool_metrics.observe_checkout(0.004)
+
+        stats = pool_stats(pool)
+
+        assert (stats["pool_size"], stats["in_use"], stats["idle"], stats["overflow"]) == (20, 3, 17, 0)
+        assert stats["checkouts"] == 2
+        assert stats["checkout_wait_mean_ms"] == 3.0
+        assert stats["checkout_wait_max_ms"] == 4.0
+
+    def test_pgbouncer_mode_disables_statement_cache(self):
+        connect_args = pgbouncer_connect_args()
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+
+class TestRequestHoldsAdmission:
+    def test_handler_queries_inside_admission_slot_and_open_session(self, monkeypatch):
+        gate = AdmissionGate(limit=2, queue_size=0, timeout=1)
+        session_open = []
+        sessionmaker = MagicMock()
+        sessionmaker.return_value.__aenter__.side_effect = lambda *_: session_open.append(True)
+        sessionmaker.return_value.__aexit__.side_effect = lambda *_: session_open.append(False)
+        monkeypatch.setattr("app.db.engine.db_admission", gate)
+        monkeypatch.setattr("app.db.engine.get_engine", MagicMock())
+        monkeypatch.setattr("app.db.engine.get_sessionmaker", lambda _: sessionmaker)
+        seen = []
+
+        async def query(*args, **kwargs):
+            # Настоящий запрос уступает event loop, пока ждёт ответа БД
+            for _ in range(3):
+                await asyncio.sleep(0)
+            seen.append((gate.active, session_open[-1]))
+            return None
+
+        monkeypatch.setattr("app.infrastructure.repositories.ticket.TicketRepository.get_by_ticket_uid", query)
+        client = TestClient(app)
+
+        response = client.get(f"/v1/tickets/{uuid.uuid4()}")
+
+        assert response.status_code == 404
+        assert seen == [(1, True)]
+        assert gate.active == 0
+        assert session_open == [True, False]
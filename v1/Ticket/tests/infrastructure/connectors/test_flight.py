@@ -0,0 +1,80 @@
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from app.infrastructure.circuit_breaker import CircuitBreaker
+from app.infrastructure.connectors.flight import FlightConnector
+from app.infrastructure.connectors.gateway import GatewayConnector
+
+FLIGHT = {
+    "id": 1,
+    "flight_number": "AFL031",
+    "datetime": "2021-10-08T20:00:00",
+    "from_airport_id": 2,
+    "to_airport_id": 1,
+    "price": 1500,
+    "from_airport": {"id": 2, "name": "Пулково", "city": "Санкт-Петербург", "country": "Россия"},
+    "to_airport": {"id": 1, "name": "Шереметьево", "city": "Москва", "country": "Россия"},
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    CircuitBreaker._instances.clear()
+    yield
+    CircuitBreaker._instances.clear()
+
+
+@pytest.fixture
+def flight_client(monkeypatch):
+    client = MagicMock()
+    client.get = AsyncMock()
+    monkeypatch.setattr("app.infrastructure.connectors.flight.get_client", lambda name: client)
+    return client
+
+
+def json_response(status_code: int, payload: dict | None = None) -> httpx.Response:
+    return httpx.Response(status_code, json=payload, request=httpx.Request("GET", "http://flight"))
+
+
+class TestFlightConnector:
+    def test_get_flight_by_number_maps_nested_airports(self, flight_client):
+        flight_client.get.return_value = json_response(200, FLIGHT)
+
+        flight = asyncio.run(FlightConnector().get_flight_by_number("AFL031"))
+
+        assert flight.flightNumber == "AFL031"
+        assert flight.fromAirport == "Санкт-Петербург Пулково"
+        assert flight.toAirport == "Москва Шереметьево"
+        assert flight.date == "2021-10-08 20:00"
+        assert flight_client.get.await_args.args[0].endswith("/v1/flights/by-number/AFL031")
+
+    def test_get_flight_by_number_not_found(self, flight_client):
+        flight_client.get.return_value = json_response(404, {"message": "not found"})
+
+        assert asyncio.run(FlightConnector().get_flight_by_number("AFL999")) is None
+
+    def test_get_flights_requests_expanded_airports(self, flight_client):
+        flight_client.get.return_value = json_response(
+            200, {"page": 1, "pageSize": 10, "totalElements": 1, "items": [FLIGHT]}
+        )
+
+        flights = asyncio.run(FlightConnector().get_flights(1, 10))
+
+        assert flights.totalElements == 1
+        assert flights.items[0].price == 1500
+        assert flight_client.get.await_args.kwargs["params"]["expand"] == "airports"
+
+
+class TestGatewayConnectorDirectFlights:
+    def test_delegates_to_direct_flight_connector(self):
+        flight_connector = MagicMock()
+        flight_connector.get_flight_by_number = AsyncMock(return_value=None)
+
+        result = asyncio.run(GatewayConnector(flight_connector).get_flight_by_number("AFL031"))
+
+        assert result is None
+        flight_connector.get_flight_by_number.assert_awaited_once_with("AFL031")
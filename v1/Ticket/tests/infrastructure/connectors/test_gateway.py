@@ -0,0 +1,108 @@
+import asyncio
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.exceptions import FlightNotFoundError
+from app.presentation.api.schemas import GatewayFlightResponse, GatewayAllFlightsResponse
+from app.infrastructure.flight_catalog import flight_catalog
+from app.infrastructure.connectors.gateway import GatewayConnector
+
+
+def make_flight(flight_number: str, price: int = 1500) -> GatewayFlightResponse:
+    return GatewayFlightResponse(
+        flightNumber=flight_number,
+        fromAirport="Санкт-Петербург Пулково",
+        toAirport="Москва Шереметьево",
+        date="2021-10-08 20:00",
+        price=price,
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_flight_catalog():
+    flight_catalog.clear()
+    yield
+    flight_catalog.clear()
+
+
+@pytest.fixture
+def gateway_connector():
+    connector = GatewayConnector()
+    connector.get_flights = AsyncMock()  # type: ignore[method-assign]
+    connector.get_flight_by_number = AsyncMock()  # type: ignore[method-assign]
+    return connector
+
+
+class TestGatewayConnectorFlightCatalog:
+    def test_find_flight_hits_catalog(self, gateway_connector):
+        flight_catalog.replace([make_flight("AFL031")])
+
+        result = asyncio.run(gateway_connector.find_flight_by_number("AFL031"))
+
+        assert result.flightNumber == "AFL031"
+        gateway_connector.get_flight_by_number.assert_not_awaited()
+        gateway_connector.get_flights.assert_not_awaited()
+
+    def test_find_flight_miss_uses_direct_lookup(self, gateway_connector):
+        gateway_connector.get_flight_by_number.return_value = make_flight("AFL032")
+
+        result = asyncio.run(gateway_connector.find_flight_by_number("AFL032"))
+
+        gateway_connector.get_flight_by_number.assert_awaited_once_with("AFL032")
+        gateway_connector.get_flights.assert_not_awaited()
+        assert result.flightNumber == "AFL032"
+        assert flight_catalog.get("AFL032") == result
+
+    def test_find_flight_not_found(self, gateway_connector):
+        gateway_connector.get_flight_by_number.return_value = None
+
+        with pytest.raises(FlightNotFoundError):
+            asyncio.run(gateway_connector.find_flight_by_number("INVALID"))
+
+        assert flight_catalog.get("INVALID") is None
+
+    def test_expired_entry_is_a_miss(self, gateway_connector, monkeypatch):
+        monkeypatch.setattr(flight_catalog, "max_age_sec", 0.0)
+        flight_catalog.replace([make_flight("AFL031", price=1000)])
+        gateway_connector.get_flight_by_number.return_value = make_flight("AFL031", price=1500)
+
+        result = asyncio.run(gateway_connector.find_flight_by_number("AFL031"))
+
+        assert result.price == 1500
+
+    def test_refresh_loads_all_pages(self, gateway_connector, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.connectors.gateway.FLIGHT_CATALOG_PAGE_SIZE", 2)
+        flight_catalog.put(make_flight("OLD001"))
+        gateway_connector.get_flights.side_effect = [
+            GatewayAllFlightsResponse(
+                page=1, pageSize=2, totalElements=3, items=[make_flight("AFL031"), make_flight("AFL032")]
+            ),
+            GatewayAllFlightsResponse(page=2, pageSize=2, totalElements=3, items=[make_flight("AFL033")]),
+        ]
+
+        count = asyncio.run(gateway_connector.refresh_flight_catalog())
+
+        assert count == 3
+        assert gateway_connector.get_flights.await_count == 2
+        assert flight_catalog.size() == 3
+        assert flight_catalog.get("OLD001") is None
+
+    def test_refresh_follows_cursor(self, gateway_connector, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.connectors.gateway.FLIGHT_CATALOG_PAGE_SIZE", 2)
+        gateway_connector.get_flights.side_effect = [
+            GatewayAllFlightsResponse(
+                page=1,
+                pageSize=2,
+                totalElements=None,
+                items=[make_flight("AFL031"), make_flight("AFL032")],
+                nextCursor="c1",
+            ),
+            GatewayAllFlightsResponse(page=1, pageSize=2, totalElements=None, items=[make_flight("AFL033")]),
+        ]
+
+        count = asyncio.run(gateway_connector.refresh_flight_catalog())
+
+        assert count == 3
+        assert gateway_connector.get_flights.await_args_list[1].args == (1, 2, "c1")
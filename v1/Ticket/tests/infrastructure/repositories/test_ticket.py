@@ -3,6 +3,8 @@ import asyncio
 
 from unittest.mock import MagicMock
 
+from sqlalchemy.dialects import postgresql
+
 from app.services.enums import TicketStatus
 
 
@@ -65,6 +67,25 @@ class TestTicketRepository:
         assert total == 1
         assert tickets[0] == sample_ticket
 
+    def test_get_by_username_keyset_without_total(self, ticket_repository, mock_db_session, sample_ticket):
+        mock_tickets_result = MagicMock()
+        mock_tickets_result.scalars.return_value.all.return_value = [sample_ticket]
+        mock_db_session.execute.return_value = mock_tickets_result
+
+        tickets, total = asyncio.run(
+            ticket_repository.get_by_username("testuser", size=10, after_id=7, with_total=False)
+        )
+
+        query = mock_db_session.execute.call_args[0][0]
+        sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        assert mock_db_session.execute.await_count == 1
+        assert "ticket.username = 'testuser'" in sql
+        assert "ticket.id > 7" in sql
+        assert "ORDER BY ticket.id" in sql
+        assert "OFFSET" not in sql
+        assert tickets == [sample_ticket]
+        assert total is None
+
     def test_save_new_ticket(self, ticket_repository, mock_db_session):
         from app.db.models.ticket import TicketDB
 
@@ -100,3 +121,29 @@ class TestTicketRepository:
         assert sample_ticket.status == "CANCELED"
         mock_db_session.commit.assert_awaited_once()
         mock_db_session.refresh.assert_awaited_once_with(sample_ticket)
+
+    def test_get_by_ticket_uids(self, ticket_repository, mock_db_session, sample_ticket):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [sample_ticket]
+        mock_db_session.execute.return_value = mock_result
+
+        result = asyncio.run(ticket_repository.get_by_ticket_uids([str(sample_ticket.ticket_uid)]))
+
+        assert result == [sample_ticket]
+        mock_db_session.execute.assert_awaited_once()
+
+    def test_cancel_tickets_single_update(self, ticket_repository, mock_db_session):
+        ticket_uids = [str(uuid.uuid4()), str(uuid.uuid4())]
+
+        asyncio.run(ticket_repository.cancel_tickets(ticket_uids))
+
+        query = str(mock_db_session.execute.call_args[0][0])
+        assert query.startswith("UPDATE ticket SET status")
+        mock_db_session.execute.assert_awaited_once()
+        mock_db_session.commit.assert_awaited_once()
+
+    def test_cancel_tickets_empty(self, ticket_repository, mock_db_session):
+        asyncio.run(ticket_repository.cancel_tickets([]))
+
+        mock_db_session.execute.assert_not_awaited()
+        mock_db_session.commit.assert_not_awaited()
@@ -0,0 +1,141 @@
+import asyncio
+
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.infrastructure.circuit_breaker import OPEN, CLOSED, HALF_OPEN, CircuitBreaker, CircuitOpenError
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://bonus/api/v1/me")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+def fail_once(breaker: CircuitBreaker, error: Exception | None = None) -> None:
+    error = error or httpx.ConnectError("down")
+    with pytest.raises(type(error)):
+        asyncio.run(breaker.call(AsyncMock(side_effect=error)))
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker(
+            "test", failure_threshold=10, minimum_calls=4, window_size=10, failure_rate_threshold=50
+        )
+
+        asyncio.run(breaker.call(AsyncMock()))
+        asyncio.run(breaker.call(AsyncMock()))
+        fail_once(breaker)
+        assert breaker.state == CLOSED
+
+        fail_once(breaker, status_error(503))
+        func = AsyncMock()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(func))
+        func.assert_not_awaited()
+
+    def test_count_window_forgets_old_failures(self):
+        breaker = CircuitBreaker("test", minimum_calls=3, window_size=3, failure_rate_threshold=50)
+
+        fail_once(breaker)
+        for _ in range(3):
+            asyncio.run(breaker.call(AsyncMock()))
+        fail_once(breaker)
+
+        assert breaker.state == CLOSED
+
+    def test_consecutive_failures_open_after_healthy_window(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, minimum_calls=10, window_size=20)
+        for _ in range(17):
+            asyncio.run(breaker.call(AsyncMock()))
+
+        fail_once(breaker)
+        fail_once(breaker)
+        assert breaker.state == CLOSED
+
+        fail_once(breaker)
+        assert breaker.state == OPEN
+
+    def test_client_errors_are_not_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, minimum_calls=2, window_size=5, failure_rate_threshold=50)
+
+        for _ in range(5):
+            fail_once(breaker, status_error(404))
+        fail_once(breaker, ValueError("bad payload"))
+
+        assert breaker.state == CLOSED
+
+    def test_opens_on_slow_call_rate(self):
+        breaker = CircuitBreaker(
+            "test", minimum_calls=2, window_size=10, slow_call_rate_threshold=100, slow_call_duration_sec=0.01
+        )
+
+        asyncio.run(breaker.call(lambda: asyncio.sleep(0.02)))
+        asyncio.run(breaker.call(lambda: asyncio.sleep(0.02)))
+
+        assert breaker.state == OPEN
+
+    def test_half_open_probe_success_closes(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0)
+        fail_once(breaker)
+
+        assert asyncio.run(breaker.call(AsyncMock(return_value="ok"))) == "ok"
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0)
+        fail_once(breaker)
+
+        fail_once(breaker)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_limits_probes(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0, half_open_max_calls=1)
+        fail_once(breaker)
+
+        async def scenario() -> None:
+            release = asyncio.Event()
+            probe = asyncio.create_task(breaker.call(release.wait))
+            await asyncio.sleep(0)
+            assert breaker.state == HALF_OPEN
+            with pytest.raises(CircuitOpenError):
+                await breaker.call(AsyncMock())
+            release.set()
+            await asyncio.wait_for(probe, timeout=1)
+
+        asyncio.run(scenario())
+        assert breaker.state == CLOSED
+
+    def test_cancelled_probe_is_not_counted_and_frees_its_slot(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout_sec=0, half_open_max_calls=1)
+        fail_once(breaker)
+
+        async def scenario() -> None:
+            probe = asyncio.create_task(breaker.call(asyncio.Event().wait))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            assert breaker.state == HALF_OPEN
+            assert await breaker.call(AsyncMock(return_value="ok")) == "ok"
+
+        asyncio.run(scenario())
+        assert breaker.state == CLOSED
+
+    def test_cancelled_call_is_not_a_failure(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, window_size=5)
+
+        async def scenario() -> None:
+            call = asyncio.create_task(breaker.call(asyncio.Event().wait))
+            await asyncio.sleep(0)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+
+        asyncio.run(scenario())
+        assert breaker.state == CLOSED
@@ -8,8 +8,9 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from app.dependencies import get_ticket_service
-from app.services.enums import TicketStatus
+from app.services.enums import TicketStatus, TicketCancelStatus
 from app.services.exceptions import (
+    InvalidCursorError,
     TicketNotFoundError,
     InsufficientBalanceError,
 )
@@ -18,6 +19,7 @@ from app.presentation.api.schemas import (
     TicketResponse,
     TicketPurchaseResponse,
 )
+from app.infrastructure.circuit_breaker import CircuitOpenError
 
 
 @pytest.fixture
@@ -49,7 +51,7 @@ class TestTicketEndpoints:
                 status=TicketStatus.PAID,
             )
         ]
-        mock_ticket_service.get_all.return_value = (expected_tickets, 1)
+        mock_ticket_service.get_all.return_value = (expected_tickets, 1, None)
 
         response = client.get("/v1/tickets", params={"page": 1, "size": 10})
 
@@ -60,6 +62,23 @@ class TestTicketEndpoints:
         assert data["totalElements"] == 1
         assert len(data["items"]) == 1
 
+    def test_get_all_tickets_by_cursor_skips_total(self, client, mock_ticket_service):
+        mock_ticket_service.get_all.return_value = ([], None, None)
+
+        response = client.get("/v1/tickets", params={"size": 10, "cursor": "eyJpZCI6IDV9"})
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_ticket_service.get_all.assert_awaited_once_with(1, 10, "eyJpZCI6IDV9", False)
+        assert response.json()["totalElements"] is None
+        assert response.json()["nextCursor"] is None
+
+    def test_get_all_tickets_invalid_cursor(self, client, mock_ticket_service):
+        mock_ticket_service.get_all.side_effect = InvalidCursorError("bad")
+
+        response = client.get("/v1/tickets", params={"cursor": "bad"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_purchase_ticket_success(self, client, mock_ticket_service):
         from datetime import UTC, datetime
 
@@ -100,6 +119,18 @@ class TestTicketEndpoints:
 
         assert response.status_code == status.HTTP_402_PAYMENT_REQUIRED
 
+    def test_purchase_ticket_open_breaker_is_503(self, client, mock_ticket_service):
+        mock_ticket_service.purchase_ticket.side_effect = CircuitOpenError("bonus")
+
+        response = client.post(
+            "/v1/tickets",
+            json={"flightNumber": "AFL031", "price": 1500, "paidFromBalance": True},
+            headers={"X-User-Name": "testuser"},
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == {"message": "Bonus service unavailable"}
+
     def test_purchase_ticket_missing_header(self, client, mock_ticket_service):
         response = client.post(
             "/v1/tickets",
@@ -148,7 +179,7 @@ class TestTicketEndpoints:
                 status=TicketStatus.PAID,
             )
         ]
-        mock_ticket_service.get_by_username.return_value = (expected_tickets, 1)
+        mock_ticket_service.get_by_username.return_value = (expected_tickets, 1, None)
 
         response = client.get(f"/v1/tickets/user/{username}", params={"page": 1, "size": 10})
 
@@ -187,3 +218,31 @@ class TestTicketEndpoints:
         response = client.delete(f"/v1/tickets/{ticket_uid}")
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cancel_batch_returns_per_item_results(self, client, mock_ticket_service):
+        canceled_uid = uuid.uuid4()
+        missing_uid = uuid.uuid4()
+        mock_ticket_service.cancel_batch.return_value = [
+            (str(canceled_uid), TicketCancelStatus.CANCELED),
+            (str(missing_uid), TicketCancelStatus.NOT_FOUND),
+        ]
+
+        response = client.post(
+            "/v1/tickets/cancel-batch",
+            json={
+                "items": [
+                    {"ticketUid": str(canceled_uid), "username": "testuser"},
+                    {"ticketUid": str(missing_uid), "username": "testuser"},
+                ]
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_ticket_service.cancel_batch.assert_awaited_once_with([
+            (str(canceled_uid), "testuser"),
+            (str(missing_uid), "testuser"),
+        ])
+        assert response.json()["items"] == [
+            {"ticketUid": str(canceled_uid), "status": "CANCELED"},
+            {"ticketUid": str(missing_uid), "status": "NOT_FOUND"},
+        ]
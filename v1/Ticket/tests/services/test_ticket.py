@@ -3,18 +3,23 @@ import asyncio
 
 import pytest
 
-from app.services.enums import TicketStatus
+from sqlalchemy.exc import OperationalError
+
+from app.services.enums import TicketStatus, TicketCancelStatus
+from app.db.models.ticket import TicketDB
 from app.services.exceptions import (
+    InvalidCursorError,
     FlightNotFoundError,
     TicketNotFoundError,
-    BonusUnavailableError,
     InsufficientBalanceError,
 )
+from app.services.pagination import decode_cursor, encode_cursor
 from app.presentation.api.schemas import (
     TicketResponse,
     TicketCreateRequest,
     TicketPurchaseResponse,
 )
+from app.infrastructure.circuit_breaker import CircuitOpenError
 
 
 class TestTicketService:
@@ -41,20 +46,38 @@ class TestTicketService:
     def test_get_all_success(self, ticket_service, mock_ticket_repository, sample_ticket):
         mock_ticket_repository.get_all.return_value = ([sample_ticket], 1)
 
-        tickets, total = asyncio.run(ticket_service.get_all(page=1, size=10))
+        tickets, total, next_cursor = asyncio.run(ticket_service.get_all(page=1, size=10))
 
-        mock_ticket_repository.get_all.assert_awaited_once_with(1, 10)
+        mock_ticket_repository.get_all.assert_awaited_once_with(1, 10, None, True)
         assert len(tickets) == 1
         assert total == 1
         assert isinstance(tickets[0], TicketResponse)
+        assert next_cursor is None
+
+    def test_get_all_by_cursor(self, ticket_service, mock_ticket_repository, sample_ticket):
+        mock_ticket_repository.get_all.return_value = ([sample_ticket], None)
+
+        tickets, total, next_cursor = asyncio.run(
+            ticket_service.get_all(size=1, cursor=encode_cursor(5), with_total=False)
+        )
+
+        mock_ticket_repository.get_all.assert_awaited_once_with(1, 1, 5, False)
+        assert total is None
+        assert decode_cursor(next_cursor) == sample_ticket.id
+
+    def test_get_all_invalid_cursor(self, ticket_service, mock_ticket_repository):
+        with pytest.raises(InvalidCursorError):
+            asyncio.run(ticket_service.get_all(cursor="bm90LWpzb24"))
+
+        mock_ticket_repository.get_all.assert_not_awaited()
 
     def test_get_by_username_success(self, ticket_service, mock_ticket_repository, sample_ticket):
         username = "testuser"
         mock_ticket_repository.get_by_username.return_value = ([sample_ticket], 1)
 
-        tickets, total = asyncio.run(ticket_service.get_by_username(username, page=1, size=10))
+        tickets, total, _ = asyncio.run(ticket_service.get_by_username(username, page=1, size=10))
 
-        mock_ticket_repository.get_by_username.assert_awaited_once_with(username, 1, 10)
+        mock_ticket_repository.get_by_username.assert_awaited_once_with(username, 1, 10, None, True)
         assert len(tickets) == 1
         assert total == 1
 
@@ -79,8 +102,10 @@ class TestTicketService:
         assert result.paidByMoney == 1500
         assert result.paidByBonuses == 0
         assert result.status == TicketStatus.PAID
-        mock_bonus_connector.change_user_balance.assert_awaited_once_with(username, 150)
-        mock_bonus_connector.create_history_record.assert_awaited_once()
+        mock_bonus_connector.apply_balance_operation.assert_awaited_once_with(
+            username, result.ticketUid, 150, "FILL_IN_BALANCE", f"{result.ticketUid}:purchase"
+        )
+        mock_bonus_connector.change_user_balance.assert_not_awaited()
 
     def test_purchase_ticket_with_bonus_sufficient_balance(
         self,
@@ -101,8 +126,9 @@ class TestTicketService:
         assert isinstance(result, TicketPurchaseResponse)
         assert result.paidByMoney == 0
         assert result.paidByBonuses == 1500
-        mock_bonus_connector.change_user_balance.assert_awaited_once_with(username, -1500)
-        mock_bonus_connector.create_history_record.assert_awaited_once()
+        mock_bonus_connector.apply_balance_operation.assert_awaited_once_with(
+            username, result.ticketUid, -1500, "DEBIT_THE_ACCOUNT", f"{result.ticketUid}:purchase"
+        )
 
     def test_purchase_ticket_with_bonus_insufficient_balance(
         self,
@@ -163,17 +189,17 @@ class TestTicketService:
         ticket_uid = str(sample_ticket.ticket_uid)
         username = "testuser"
         mock_ticket_repository.get_by_ticket_uid.return_value = sample_ticket
-        # Непустая история, но без записи по этому билету — отмена без списания бонусов
-        mock_bonus_connector.get_user_history.return_value = [
-            {"ticketUid": str(uuid.uuid4()), "balanceDiff": 100, "operationType": "FILL_IN_BALANCE"}
-        ]
+        # Бонусных операций по билету нет — отмена без списания бонусов
+        mock_bonus_connector.get_ticket_history.return_value = {"balance": 100, "status": "BRONZE", "history": []}
 
         asyncio.run(ticket_service.cancel_ticket(ticket_uid, username))
 
         mock_ticket_repository.get_by_ticket_uid.assert_awaited_once_with(ticket_uid)
+        mock_bonus_connector.get_ticket_history.assert_awaited_once_with(username, sample_ticket.ticket_uid)
+        mock_bonus_connector.apply_balance_operation.assert_not_awaited()
         mock_ticket_repository.cancel_ticket.assert_awaited_once_with(ticket_uid)
 
-    def test_cancel_ticket_empty_history_raises_bonus_unavailable(
+    def test_cancel_ticket_bonus_unavailable_keeps_ticket(
         self,
         ticket_service,
         mock_ticket_repository,
@@ -183,9 +209,9 @@ class TestTicketService:
         ticket_uid = str(sample_ticket.ticket_uid)
         username = "testuser"
         mock_ticket_repository.get_by_ticket_uid.return_value = sample_ticket
-        mock_bonus_connector.get_user_history.return_value = []
+        mock_bonus_connector.get_ticket_history.side_effect = CircuitOpenError("bonus")
 
-        with pytest.raises(BonusUnavailableError):
+        with pytest.raises(CircuitOpenError):
             asyncio.run(ticket_service.cancel_ticket(ticket_uid, username))
 
         mock_ticket_repository.cancel_ticket.assert_not_awaited()
@@ -236,19 +262,37 @@ class TestTicketService:
         ticket_uid = str(sample_ticket.ticket_uid)
         username = "testuser"
         mock_ticket_repository.get_by_ticket_uid.return_value = sample_ticket
-        mock_bonus_connector.get_user_balance.return_value = 200
-        mock_bonus_connector.get_user_history.return_value = [
-            {
-                "ticketUid": ticket_uid,
-                "balanceDiff": 150,
-                "operationType": "FILL_IN_BALANCE",
-            }
-        ]
+        mock_bonus_connector.get_ticket_history.return_value = {
+            "balance": 200,
+            "status": "BRONZE",
+            "history": [{"ticketUid": ticket_uid, "balanceDiff": 150, "operationType": "FILL_IN_BALANCE"}],
+        }
 
         asyncio.run(ticket_service.cancel_ticket(ticket_uid, username))
 
-        mock_bonus_connector.change_user_balance.assert_awaited_once_with(username, -150)
-        mock_bonus_connector.create_history_record.assert_awaited_once()
+        mock_bonus_connector.apply_balance_operation.assert_awaited_once_with(
+            username, sample_ticket.ticket_uid, -150, "DEBIT_THE_ACCOUNT", f"{ticket_uid}:cancel"
+        )
+        mock_bonus_connector.get_user_balance.assert_not_awaited()
+
+    def test_cancel_ticket_debits_no_more_than_balance(
+        self,
+        ticket_service,
+        mock_ticket_repository,
+        mock_bonus_connector,
+        sample_ticket,
+    ):
+        ticket_uid = str(sample_ticket.ticket_uid)
+        mock_ticket_repository.get_by_ticket_uid.return_value = sample_ticket
+        mock_bonus_connector.get_ticket_history.return_value = {
+            "balance": 40,
+            "status": "BRONZE",
+            "history": [{"ticketUid": ticket_uid, "balanceDiff": 150, "operationType": "FILL_IN_BALANCE"}],
+        }
+
+        asyncio.run(ticket_service.cancel_ticket(ticket_uid, "testuser"))
+
+        assert mock_bonus_connector.apply_balance_operation.await_args.args[2] == -40
 
     def test_cancel_ticket_with_debit_history(
         self,
@@ -260,15 +304,105 @@ class TestTicketService:
         ticket_uid = str(sample_ticket.ticket_uid)
         username = "testuser"
         mock_ticket_repository.get_by_ticket_uid.return_value = sample_ticket
-        mock_bonus_connector.get_user_history.return_value = [
-            {
-                "ticketUid": ticket_uid,
-                "balanceDiff": -1500,
-                "operationType": "DEBIT_THE_ACCOUNT",
-            }
-        ]
+        # Повторная отмена после сбоя: запись возврата уже есть, берётся самая ранняя — покупка
+        mock_bonus_connector.get_ticket_history.return_value = {
+            "balance": 1500,
+            "status": "BRONZE",
+            "history": [
+                {"ticketUid": ticket_uid, "balanceDiff": 1500, "operationType": "FILL_IN_BALANCE"},
+                {"ticketUid": ticket_uid, "balanceDiff": -1500, "operationType": "DEBIT_THE_ACCOUNT"},
+            ],
+        }
 
         asyncio.run(ticket_service.cancel_ticket(ticket_uid, username))
 
-        mock_bonus_connector.change_user_balance.assert_awaited_once_with(username, 1500)
-        mock_bonus_connector.create_history_record.assert_awaited_once()
+        mock_bonus_connector.apply_balance_operation.assert_awaited_once_with(
+            username, sample_ticket.ticket_uid, 1500, "FILL_IN_BALANCE", f"{ticket_uid}:cancel"
+        )
+
+    def test_cancel_batch_per_item_results(
+        self,
+        ticket_service,
+        mock_ticket_repository,
+        mock_bonus_connector,
+        sample_ticket,
+    ):
+        canceled_ticket = TicketDB(
+            username="testuser",
+            flight_number="AFL031",
+            price=1500,
+            status=TicketStatus.CANCELED.value,
+            ticket_uid=uuid.uuid4(),
+        )
+        paid_uid = str(sample_ticket.ticket_uid)
+        canceled_uid = str(canceled_ticket.ticket_uid)
+        missing_uid = str(uuid.uuid4())
+        mock_ticket_repository.get_by_ticket_uids.return_value = [sample_ticket, canceled_ticket]
+        mock_bonus_connector.get_ticket_history.return_value = {
+            "balance": 0,
+            "status": "BRONZE",
+            "history": [{"ticketUid": paid_uid, "balanceDiff": -1500, "operationType": "DEBIT_THE_ACCOUNT"}],
+        }
+
+        results = asyncio.run(
+            ticket_service.cancel_batch([
+                (paid_uid, "testuser"),
+                (canceled_uid, "testuser"),
+                (missing_uid, "testuser"),
+                (paid_uid, "wronguser"),
+            ])
+        )
+
+        assert results == [
+            (paid_uid, TicketCancelStatus.CANCELED),
+            (canceled_uid, TicketCancelStatus.ALREADY_CANCELED),
+            (missing_uid, TicketCancelStatus.NOT_FOUND),
+            (paid_uid, TicketCancelStatus.NOT_FOUND),
+        ]
+        mock_ticket_repository.get_by_ticket_uids.assert_awaited_once()
+        mock_ticket_repository.cancel_tickets.assert_awaited_once_with([paid_uid])
+        mock_bonus_connector.apply_balance_operation.assert_awaited_once()
+
+    def test_cancel_batch_bonus_failure_keeps_ticket_paid(
+        self,
+        ticket_service,
+        mock_ticket_repository,
+        mock_bonus_connector,
+        sample_ticket,
+    ):
+        ticket_uid = str(sample_ticket.ticket_uid)
+        mock_ticket_repository.get_by_ticket_uids.return_value = [sample_ticket]
+        mock_bonus_connector.get_ticket_history.side_effect = CircuitOpenError("bonus")
+
+        results = asyncio.run(ticket_service.cancel_batch([(ticket_uid, "testuser")]))
+
+        assert results == [(ticket_uid, TicketCancelStatus.FAILED)]
+        mock_ticket_repository.cancel_tickets.assert_awaited_once_with([])
+
+    def test_cancel_batch_update_failure_marks_refunded_tickets_failed(
+        self,
+        ticket_service,
+        mock_ticket_repository,
+        mock_bonus_connector,
+        sample_ticket,
+    ):
+        ticket_uid = str(sample_ticket.ticket_uid)
+        missing_uid = str(uuid.uuid4())
+        mock_ticket_repository.get_by_ticket_uids.return_value = [sample_ticket]
+        mock_ticket_repository.cancel_tickets.side_effect = OperationalError("UPDATE ticket", {}, Exception("down"))
+        mock_bonus_connector.get_ticket_history.return_value = {
+            "balance": 0,
+            "status": "BRONZE",
+            "history": [{"ticketUid": ticket_uid, "balanceDiff": -1500, "operationType": "DEBIT_THE_ACCOUNT"}],
+        }
+
+        results = asyncio.run(
+            ticket_service.cancel_batch([(ticket_uid, "testuser"), (ticket_uid, "testuser"), (missing_uid, "testuser")])
+        )
+
+        assert results == [
+            (ticket_uid, TicketCancelStatus.FAILED),
+            (ticket_uid, TicketCancelStatus.FAILED),
+            (missing_uid, TicketCancelStatus.NOT_FOUND),
+        ]
+        mock_ticket_repository.cancel_tickets.assert_awaited_once_with([ticket_uid])